@@ -2,9 +2,11 @@
 
 Provides both live trading (Hyperliquid) and backtesting (CCXT) data fetchers.
 Both return standardized DataFrames compatible with trading strategies.
+
+CCXTFetcher is imported lazily (PEP 562): importing ccxt registers every
+exchange adapter, which live trading on Hyperliquid never needs.
 """
 
-from .ccxt_fetcher import CCXTFetcher
 from .fetcher import BaseFetcher, fetch_ohlcv
 from .hyperliquid_fetcher import HyperliquidFetcher
 
@@ -14,3 +16,12 @@ __all__ = [
     "HyperliquidFetcher",
     "CCXTFetcher",
 ]
+
+
+def __getattr__(name: str):
+    """Import CCXTFetcher (and ccxt) on first access."""
+    if name == "CCXTFetcher":
+        from .ccxt_fetcher import CCXTFetcher
+
+        return CCXTFetcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
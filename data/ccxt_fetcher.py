@@ -1,9 +1,12 @@
 """CCXT data fetcher for multi-exchange support."""
 
 import logging
+import numbers
 import time
+from datetime import datetime
 
 import ccxt
+import numpy as np
 import pandas as pd
 from tenacity import (
     before_sleep_log,
@@ -204,23 +207,20 @@ class CCXTFetcher(BaseFetcher):
         logger.info(f"Pagination complete: {len(all_candles)} total candles")
         return all_candles
 
-    def _parse_since(self, since: str) -> int:
+    def _parse_since(self, since: str | int | datetime) -> int:
         """Parse 'since' parameter to Unix timestamp (ms)."""
-        try:
-            # Try ISO date
-            dt = pd.to_datetime(since)
-            return int(dt.timestamp() * 1000)
-        except:
-            pass
-
-        try:
-            # Try Unix timestamp
+        # Unix timestamps (number or digit string) never need the pandas parser
+        if isinstance(since, numbers.Real) or (isinstance(since, str) and since.strip().isdigit()):
             ts = int(since)
             if ts < 10000000000:  # Assume seconds
                 ts *= 1000
             return ts
-        except:
-            raise ValueError(f"Invalid 'since' format: {since}")
+
+        # Otherwise treat as ISO date
+        try:
+            return int(pd.Timestamp(since).timestamp() * 1000)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid 'since' format: {since}") from None
 
     def _ohlcv_to_dataframe(self, ohlcv: list) -> pd.DataFrame:
         """
@@ -235,17 +235,25 @@ class CCXTFetcher(BaseFetcher):
         if not ohlcv:
             return self._empty_dataframe()
 
-        df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        # One float64 array for the whole response; columns are sliced from it
+        # so there is no per-column dtype inference or timestamp re-parsing
+        arr = np.asarray(ohlcv, dtype=np.float64)
+        ts = arr[:, 0].astype(np.int64)
 
-        # Convert timestamp to datetime index
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        df.set_index("timestamp", inplace=True)
+        df = pd.DataFrame(
+            arr[:, 1:],
+            index=pd.DatetimeIndex(ts * 1_000_000, tz="UTC", name="timestamp"),
+            columns=["open", "high", "low", "close", "volume"],
+            copy=False,
+        )
 
-        # Sort by time
-        df.sort_index(inplace=True)
+        # Sort by time (paginated batches are normally already in order)
+        if not np.all(np.diff(ts) >= 0):
+            df.sort_index(inplace=True)
 
         # Remove duplicates (can happen with pagination)
-        df = df[~df.index.duplicated(keep="first")]
+        if df.index.has_duplicates:
+            df = df[~df.index.duplicated(keep="first")]
 
         return df
 
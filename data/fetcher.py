@@ -1,7 +1,9 @@
 """Data fetching base interface."""
 
+import functools
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 
 
@@ -70,6 +72,46 @@ class BaseFetcher(ABC):
 
         return True
 
+    def _validate_ohlcv_fast(self, df: pd.DataFrame) -> bool:
+        """
+        Validate a freshly parsed OHLCV DataFrame on the fetch hot path.
+
+        Columns and index are guaranteed by the fetcher's own parser, so this
+        only checks emptiness and price sanity, using whole-array NumPy
+        reductions over the OHLC block.
+
+        Args:
+            df: DataFrame built by the fetcher
+
+        Returns:
+            True if valid
+
+        Raises:
+            ValueError: If empty, non-finite, or high/low don't bound open/close
+        """
+        if df.empty:
+            raise ValueError("DataFrame is empty")
+
+        prices = df[["open", "high", "low", "close"]].to_numpy(dtype=np.float64, copy=False)
+        if not np.isfinite(prices).all():
+            raise ValueError("OHLC prices contain NaN or infinite values")
+
+        open_, high, low, close = prices.T
+        body_top = np.maximum(open_, close)
+        body_bottom = np.minimum(open_, close)
+        if not ((high >= body_top).all() and (low <= body_bottom).all()):
+            raise ValueError("OHLC prices inconsistent: high/low must bound open/close")
+
+        return True
+
+
+@functools.lru_cache(maxsize=8)
+def _get_ccxt_fetcher(exchange_id: str):
+    """Return a shared CCXTFetcher per exchange (construction is expensive)."""
+    from data.ccxt_fetcher import CCXTFetcher
+
+    return CCXTFetcher(exchange_id)
+
 
 # Keep the old function for backward compatibility
 def fetch_ohlcv(
@@ -80,7 +122,4 @@ def fetch_ohlcv(
 
     Use CCXTFetcher class instead.
     """
-    from data.ccxt_fetcher import CCXTFetcher
-
-    fetcher = CCXTFetcher(exchange_id)
-    return fetcher.fetch_ohlcv(symbol, timeframe, limit)
+    return _get_ccxt_fetcher(exchange_id).fetch_ohlcv(symbol, timeframe, limit)
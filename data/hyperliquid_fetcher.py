@@ -1,13 +1,18 @@
 """Hyperliquid data fetcher using native SDK."""
 
 import logging
+import numbers
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 from ratelimit import limits, sleep_and_retry
+from requests.adapters import HTTPAdapter
 from tenacity import (
     before_sleep_log,
     retry,
@@ -18,8 +23,39 @@ from tenacity import (
 
 from data.fetcher import BaseFetcher
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to requests' stdlib json decoding
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Timeframe -> candle interval in milliseconds
+_TF_TO_MS = {
+    "1m": 60 * 1000,
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+}
+
+# Standard column name -> Hyperliquid candle field
+_CANDLE_FIELDS = {"open": "o", "high": "h", "low": "l", "close": "c", "volume": "v"}
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """
+    Decode response bodies with orjson instead of stdlib json.
+
+    Installed as a requests session hook, so the SDK's `response.json()`
+    calls (e.g. ~500 KB candle snapshots) parse in orjson's C decoder.
+    orjson.JSONDecodeError subclasses ValueError, which the SDK already
+    handles for unparseable bodies.
+    """
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
 
 class HyperliquidFetcher(BaseFetcher):
     """
@@ -50,6 +86,13 @@ class HyperliquidFetcher(BaseFetcher):
 
     MAX_CANDLES = 5000  # Hyperliquid API limit
 
+    # Cache lifetimes (seconds) for snapshot endpoints shared by all symbols
+    MIDS_CACHE_TTL = 1.0
+    META_CACHE_TTL = 60.0
+    SYMBOLS_CACHE_TTL = 3600.0
+
+    HTTP_POOL_SIZE = 16  # Keep-alive connections reused across requests
+
     def __init__(self, network: Literal["mainnet", "testnet"] = "mainnet", timeout: int = 30):
         """
         Initialize Hyperliquid fetcher.
@@ -61,8 +104,22 @@ class HyperliquidFetcher(BaseFetcher):
         self.network = network
         api_url = self.MAINNET_URL if network == "mainnet" else self.TESTNET_URL
 
-        self.info = Info(api_url, skip_ws=True)  # No WebSocket for now
         self.timeout = timeout
+        self.info = Info(api_url, skip_ws=True, timeout=timeout)  # No WebSocket for now
+
+        # Info keeps one requests.Session (keep-alive, TLS reuse), and its
+        # constructor already warms the connection via meta/spotMeta. Size
+        # the pool so concurrent fetch_ohlcv_batch() workers each keep a
+        # live connection instead of reconnecting.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.HTTP_POOL_SIZE)
+        self.info.session.mount("https://", adapter)
+        if orjson is not None:
+            self.info.session.hooks["response"].append(_orjson_response_hook)
+
+        # (fetched_at, payload) pairs, refreshed by _get_mids() / _get_meta()
+        self._mids_cache: tuple[float, dict | None] = (0.0, None)
+        self._meta_cache: tuple[float, dict | None] = (0.0, None)
+        self._symbols_cache: tuple[float, tuple[str, ...] | None] = (0.0, None)
 
         logger.info(f"HyperliquidFetcher initialized ({network})")
 
@@ -137,12 +194,56 @@ class HyperliquidFetcher(BaseFetcher):
         if limit and len(df) > limit:
             df = df.tail(limit)
 
-        # Validate format
-        self.validate_dataframe(df)
+        # Validate prices (format is guaranteed by _candles_to_dataframe)
+        self._validate_ohlcv_fast(df)
 
         logger.info(f"Fetched {len(df)} candles for {symbol} {timeframe}")
         return df
 
+    def fetch_ohlcv_batch(
+        self,
+        symbols: list[str],
+        timeframe: str = "1h",
+        limit: int | None = None,
+        since: str | None = None,
+        max_workers: int = 8,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for several symbols concurrently.
+
+        Requests are independent and network-bound, so they are issued from a
+        thread pool; total latency is roughly one round-trip instead of one per
+        symbol. Rate limiting and retries still apply per request.
+
+        Args:
+            symbols: Coin names (e.g., ['BTC', 'ETH'])
+            timeframe: Candle timeframe ('1m', '5m', '15m', '1h', '4h', '1d')
+            limit: Number of candles per symbol (max 5000, default 1000)
+            since: Start timestamp (ISO format or Unix timestamp)
+            max_workers: Maximum concurrent requests
+
+        Returns:
+            Dict of symbol -> DataFrame with standard format
+
+        Raises:
+            ValueError: Invalid timeframe
+            ConnectionError: API request failed for any symbol
+
+        Example:
+            >>> fetcher = HyperliquidFetcher()
+            >>> data = fetcher.fetch_ohlcv_batch(['BTC', 'ETH'], '1h', limit=100)
+            >>> data['ETH'].tail(1)
+        """
+        if not symbols:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            futures = {
+                symbol: pool.submit(self.fetch_ohlcv, symbol, timeframe, limit, since)
+                for symbol in symbols
+            }
+            return {symbol: future.result() for symbol, future in futures.items()}
+
     @sleep_and_retry
     @limits(calls=10, period=1)  # 10 calls per second max
     @retry(
@@ -180,35 +281,35 @@ class HyperliquidFetcher(BaseFetcher):
             logger.warning(f"API request failed: {e}")
             raise ConnectionError(f"Hyperliquid API error: {e}")
 
-    def _parse_since(self, since: str) -> int:
+    def _parse_since(self, since: str | int | datetime) -> int:
         """
         Parse 'since' parameter to Unix timestamp (ms).
 
         Args:
-            since: ISO date string or Unix timestamp
+            since: ISO date string, datetime/Timestamp, or Unix timestamp (seconds or ms)
 
         Returns:
             Unix timestamp in milliseconds
         """
-        # Try parsing as ISO date
-        try:
-            dt = pd.to_datetime(since)
-            return int(dt.timestamp() * 1000)
-        except:
-            pass
-
-        # Try as Unix timestamp (seconds)
-        try:
+        # Unix timestamps (int or digit string) never need the pandas parser.
+        # Anything before year 2000 is not a plausible start time; such digit
+        # strings are compact dates ("20240101") and go to the date parser.
+        is_number = isinstance(since, numbers.Real)
+        if is_number or (isinstance(since, str) and since.strip().isdigit()):
             ts = int(since)
-            # If less than year 2000, assume it's in seconds
-            if ts < 946684800:
-                raise ValueError("Timestamp too old")
-            # If less than typical ms timestamp, convert to ms
-            if ts < 10000000000:
-                ts *= 1000
-            return ts
-        except:
-            raise ValueError(f"Invalid 'since' format: {since}")
+            if ts >= 946684800:
+                # If less than typical ms timestamp, it's in seconds - convert to ms
+                if ts < 10000000000:
+                    ts *= 1000
+                return ts
+            if is_number:
+                raise ValueError(f"Invalid 'since' format: {since}")
+
+        # Otherwise treat as ISO date
+        try:
+            return int(pd.Timestamp(since).timestamp() * 1000)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid 'since' format: {since}") from None
 
     def _calculate_start_time(self, end_time: int, timeframe: str, limit: int) -> int:
         """
@@ -222,20 +323,7 @@ class HyperliquidFetcher(BaseFetcher):
         Returns:
             Start timestamp (ms)
         """
-        # Timeframe to milliseconds
-        tf_to_ms = {
-            "1m": 60 * 1000,
-            "5m": 5 * 60 * 1000,
-            "15m": 15 * 60 * 1000,
-            "1h": 60 * 60 * 1000,
-            "4h": 4 * 60 * 60 * 1000,
-            "1d": 24 * 60 * 60 * 1000,
-        }
-
-        interval_ms = tf_to_ms[timeframe]
-        start_time = end_time - (limit * interval_ms)
-
-        return start_time
+        return end_time - limit * _TF_TO_MS[timeframe]
 
     def _candles_to_dataframe(self, candles: list) -> pd.DataFrame:
         """
@@ -265,27 +353,31 @@ class HyperliquidFetcher(BaseFetcher):
         #   ...
         # ]
 
-        data = []
-        for candle in candles:
-            data.append(
-                {
-                    "timestamp": candle["t"],
-                    "open": float(candle["o"]),
-                    "high": float(candle["h"]),
-                    "low": float(candle["l"]),
-                    "close": float(candle["c"]),
-                    "volume": float(candle["v"]),
-                }
-            )
-
-        df = pd.DataFrame(data)
-
-        # Convert timestamp to datetime index
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        df.set_index("timestamp", inplace=True)
+        # Epoch-ms UTC timestamps become the index directly (ms -> ns), which
+        # skips pd.to_datetime's unit conversion and separate tz handling
+        n = len(candles)
+        ts = np.fromiter((c["t"] for c in candles), dtype=np.int64, count=n)
+
+        # Prices arrive as decimal strings; assigning a whole column at once lets
+        # NumPy parse them in C instead of calling float() once per value.
+        # Rows of one preallocated (5, n) block hold the columns, so each column
+        # is contiguous and no temporaries are stacked. The DataFrame wraps the
+        # block without copying, and downstream `df[col].values` / `.to_numpy()`
+        # calls (core detectors) return views rather than fresh arrays.
+        prices = np.empty((len(_CANDLE_FIELDS), n), dtype=np.float64)
+        for row, key in enumerate(_CANDLE_FIELDS.values()):
+            prices[row] = [c[key] for c in candles]
+
+        df = pd.DataFrame(
+            prices.T,
+            index=pd.DatetimeIndex(ts * 1_000_000, tz="UTC", name="timestamp"),
+            columns=list(_CANDLE_FIELDS),
+            copy=False,
+        )
 
-        # Sort by time
-        df.sort_index(inplace=True)
+        # API returns candles in time order; only sort if that ever changes
+        if not np.all(np.diff(ts) >= 0):
+            df.sort_index(inplace=True)
 
         return df
 
@@ -295,25 +387,79 @@ class HyperliquidFetcher(BaseFetcher):
         df.index = pd.DatetimeIndex([], name="timestamp")
         return df
 
+    def _get_mids(self) -> dict:
+        """
+        Get mid prices for all symbols, cached for MIDS_CACHE_TTL seconds.
+
+        One allMids request covers every symbol, so callers pricing several
+        symbols in a row share a single round-trip.
+
+        Returns:
+            Dict of coin name -> mid price (as returned by the API)
+        """
+        now = time.monotonic()
+        fetched_at, mids = self._mids_cache
+        if mids is not None and now - fetched_at < self.MIDS_CACHE_TTL:
+            return mids
+
+        mids = self._fetch_mids()
+        self._mids_cache = (now, mids)
+        return mids
+
+    @sleep_and_retry
+    @limits(calls=10, period=1)  # 10 calls per second max
+    def _fetch_mids(self) -> dict:
+        """Fetch mid prices from the API, rate limited (cache hits skip this)."""
+        return self.info.all_mids()
+
+    def _get_meta(self) -> dict:
+        """
+        Get exchange metadata, cached for META_CACHE_TTL seconds.
+
+        Returns:
+            Meta dict as returned by the API
+        """
+        now = time.monotonic()
+        fetched_at, meta = self._meta_cache
+        if meta is not None and now - fetched_at < self.META_CACHE_TTL:
+            return meta
+
+        meta = self._fetch_meta()
+        self._meta_cache = (now, meta)
+        return meta
+
     @sleep_and_retry
     @limits(calls=5, period=1)  # 5 calls per second (less frequent)
-    def get_available_symbols(self) -> list[str]:
+    def _fetch_meta(self) -> dict:
+        """Fetch exchange metadata from the API, rate limited (cache hits skip this)."""
+        return self.info.meta()
+
+    def get_available_symbols(self) -> tuple[str, ...]:
         """
-        Get list of available trading symbols on Hyperliquid.
+        Get available trading symbols on Hyperliquid.
+
+        The coin universe changes rarely, so the result is cached for
+        SYMBOLS_CACHE_TTL seconds and returned as an immutable tuple that
+        callers can share without copying.
 
         Returns:
-            List of coin names (e.g., ['BTC', 'ETH', 'SOL'])
+            Tuple of coin names (e.g., ('BTC', 'ETH', 'SOL')), empty on error
         """
+        now = time.monotonic()
+        fetched_at, symbols = self._symbols_cache
+        if symbols is not None and now - fetched_at < self.SYMBOLS_CACHE_TTL:
+            return symbols
+
         try:
-            meta = self.info.meta()
-            universe = meta.get("universe", [])
-            return [coin["name"] for coin in universe]
+            meta = self._get_meta()
         except Exception as e:
             logger.error(f"Failed to fetch symbols: {e}")
-            return []
+            return ()
+
+        symbols = tuple(coin["name"] for coin in meta.get("universe", ()))
+        self._symbols_cache = (now, symbols)
+        return symbols
 
-    @sleep_and_retry
-    @limits(calls=10, period=1)  # 10 calls per second max
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -335,8 +481,35 @@ class HyperliquidFetcher(BaseFetcher):
             ConnectionError: After 3 failed attempts
         """
         try:
-            all_mids = self.info.all_mids()
+            all_mids = self._get_mids()
             return float(all_mids.get(symbol, 0))
         except Exception as e:
             logger.warning(f"Failed to fetch price for {symbol}: {e}")
             raise ConnectionError(f"Price fetch error: {e}")
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((ConnectionError, TimeoutError)),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    def get_current_prices(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Get current prices for several symbols from a single API call.
+
+        Args:
+            symbols: Coin names (e.g., ['BTC', 'ETH'])
+
+        Returns:
+            Dict of symbol -> price (0.0 for unknown symbols)
+
+        Raises:
+            ConnectionError: After 3 failed attempts
+        """
+        try:
+            all_mids = self._get_mids()
+            return {symbol: float(all_mids.get(symbol, 0)) for symbol in symbols}
+        except Exception as e:
+            logger.warning(f"Failed to fetch prices for {symbols}: {e}")
+            raise ConnectionError(f"Price fetch error: {e}")
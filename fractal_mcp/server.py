@@ -31,6 +31,24 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# JSON encoding for tool results (orjson is optional, ~3-10x faster)
+try:
+    import orjson
+
+    # Non-str keys (e.g. int) are stringified, as json.dumps does
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a tool result to indented JSON."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=str).decode()
+
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a tool result to indented JSON."""
+        return json.dumps(obj, indent=2, default=str)
+
 
 # Initialize MCP server
 app = Server(SERVER_NAME)
@@ -154,18 +172,14 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             raise ValueError(f"Unknown tool: {name}")
 
         # Format result as JSON string
-        import json
-
-        result_text = json.dumps(result, indent=2)
+        result_text = _dumps(result)
 
         return [TextContent(type="text", text=result_text)]
 
     except Exception as e:
         logger.error(f"Error executing tool {name}: {e}")
         error_result = {"error": str(e), "tool": name}
-        import json
-
-        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+        return [TextContent(type="text", text=_dumps(error_result))]
 
 
 async def main() -> None:
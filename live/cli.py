@@ -14,22 +14,18 @@ Usage:
 """
 
 import argparse
+import importlib
 import logging
 import os
 import signal
 import sys
+import threading
+from dataclasses import replace
 from pathlib import Path
 
-from live.hl_integration.config import HyperliquidConfig
-from live.hl_integration.testnet import HyperliquidTestnetTrader
 from live.logging_config import setup_logging
 from live.reporting import PerformanceReporter
 from live.state_manager import StateManager
-from strategies.bos_orderblock import BOSOrderBlockStrategy
-from strategies.fvg_fill import FVGFillStrategy
-
-# Import strategies
-from strategies.liquidity_sweep import LiquiditySweepStrategy
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +34,25 @@ logger = logging.getLogger(__name__)
 PID_FILE = Path(".trading_bot.pid")
 STATE_FILE = Path(".testnet_state.json")
 
+# Strategies as "module:Class" paths; only imported by `start`, so status/stop/report
+# don't pay for pandas/numpy and the strategy modules
+_STRATEGY_REGISTRY = {
+    "liquidity_sweep": "strategies.liquidity_sweep:LiquiditySweepStrategy",
+    "fvg_fill": "strategies.fvg_fill:FVGFillStrategy",
+    "bos_orderblock": "strategies.bos_orderblock:BOSOrderBlockStrategy",
+}
+
+
+# Set by SIGINT/SIGTERM; the trading loop checks it between iterations, so a
+# signal never interrupts a state write half-way
+_STOP = threading.Event()
+
+
+def _handle_shutdown_signal(signum, frame):
+    """Request a graceful shutdown of the running bot."""
+    print("\n⚠️  Received shutdown signal")
+    _STOP.set()
+
 
 def get_strategy(strategy_name: str):
     """
@@ -52,18 +67,13 @@ def get_strategy(strategy_name: str):
     Raises:
         ValueError: If strategy not found
     """
-    strategies = {
-        "liquidity_sweep": LiquiditySweepStrategy,
-        "fvg_fill": FVGFillStrategy,
-        "bos_orderblock": BOSOrderBlockStrategy,
-    }
-
-    if strategy_name not in strategies:
+    if strategy_name not in _STRATEGY_REGISTRY:
         raise ValueError(
-            f"Unknown strategy: {strategy_name}. " f"Available: {list(strategies.keys())}"
+            f"Unknown strategy: {strategy_name}. " f"Available: {list(_STRATEGY_REGISTRY.keys())}"
         )
 
-    return strategies[strategy_name]()
+    module_name, class_name = _STRATEGY_REGISTRY[strategy_name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)()
 
 
 def cmd_start(args: argparse.Namespace) -> int:
@@ -92,9 +102,12 @@ def cmd_start(args: argparse.Namespace) -> int:
     print(f"Duration: {args.duration}s" if args.duration else "Duration: unlimited")
 
     try:
+        # Trading stack is only needed here; keep other commands light
+        from live.hl_integration.config import HyperliquidConfig
+        from live.hl_integration.testnet import HyperliquidTestnetTrader
+
         # Load config
-        config = HyperliquidConfig.from_env(network="testnet")
-        config.log_level = args.log_level
+        config = replace(HyperliquidConfig.from_env(network="testnet"), log_level=args.log_level)
 
         # Get strategy
         strategy = get_strategy(args.strategy)
@@ -104,25 +117,22 @@ def cmd_start(args: argparse.Namespace) -> int:
             config=config, strategy=strategy, state_file=str(STATE_FILE)
         )
 
-        # Write PID file (actual process ID for signal handling)
-        PID_FILE.write_text(str(os.getpid()))
+        # Write PID file atomically (actual process ID for signal handling)
+        tmp_pid_file = PID_FILE.with_suffix(".tmp")
+        tmp_pid_file.write_text(str(os.getpid()))
+        os.replace(tmp_pid_file, PID_FILE)
 
-        # Setup signal handlers for graceful shutdown
-        def signal_handler(signum, frame):
-            print("\n⚠️  Received shutdown signal")
-            trader.stop()
-            PID_FILE.unlink(missing_ok=True)
-            sys.exit(0)
-
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        # Setup signal handlers for graceful shutdown at the next iteration boundary
+        _STOP.clear()
+        signal.signal(signal.SIGINT, _handle_shutdown_signal)
+        signal.signal(signal.SIGTERM, _handle_shutdown_signal)
 
         # Start trading
         print("✅ Bot started successfully")
         print("Press Ctrl+C to stop")
         print("-" * 60)
 
-        trader.run(duration_seconds=args.duration)
+        trader.run(duration_seconds=args.duration, stop_event=_STOP)
 
         # Cleanup
         PID_FILE.unlink(missing_ok=True)
@@ -161,9 +171,8 @@ def cmd_stop(args: argparse.Namespace) -> int:
         # Read PID and send SIGTERM for graceful shutdown
         pid = int(PID_FILE.read_text().strip())
 
-        # Check if process exists
         try:
-            os.kill(pid, 0)  # Check if process exists (signal 0)
+            os.kill(pid, signal.SIGTERM)
         except ProcessLookupError:
             print(f"⚠️  Process {pid} not found (may have already stopped)")
             PID_FILE.unlink(missing_ok=True)
@@ -172,8 +181,6 @@ def cmd_stop(args: argparse.Namespace) -> int:
             print(f"⚠️  Cannot access process {pid} (permission denied)")
             return 1
 
-        # Send SIGTERM for graceful shutdown
-        os.kill(pid, signal.SIGTERM)
         print(f"✅ Stop signal (SIGTERM) sent to process {pid}")
         print("Note: Bot will stop after current iteration completes")
 
@@ -232,8 +239,8 @@ def cmd_status(args: argparse.Namespace) -> int:
         print("\n📊 Trades:")
         print(f"  Total: {stats['total_trades']}")
 
-        # Show open positions
-        positions = state_manager.load_positions()
+        # Show open positions (read-only, so no defensive copy needed)
+        positions = state_manager.state.open_positions
         if positions:
             print("\n🔓 Open Positions:")
             for symbol, pos in positions.items():
@@ -275,10 +282,7 @@ def cmd_report(args: argparse.Namespace) -> int:
         session_start = state_manager.state.session_start
 
         # Calculate current balance (simplified - just starting + PnL from trades)
-        current_balance = starting_balance
-        for trade in trade_history:
-            pnl = trade.get("pnl", 0)
-            current_balance += pnl
+        current_balance = starting_balance + sum(trade.get("pnl", 0) for trade in trade_history)
 
         # Generate report
         reporter = PerformanceReporter(
@@ -286,6 +290,7 @@ def cmd_report(args: argparse.Namespace) -> int:
             open_positions=positions,
             trade_history=trade_history,
             session_start=session_start,
+            max_concurrent_positions=state_manager.get_metadata("max_concurrent_positions", 0),
         )
 
         metrics = reporter.calculate_metrics(current_balance)
@@ -346,7 +351,7 @@ Examples:
         "--strategy",
         type=str,
         default="liquidity_sweep",
-        choices=["liquidity_sweep", "fvg_fill", "bos_orderblock"],
+        choices=tuple(_STRATEGY_REGISTRY),
         help="Trading strategy to use (default: liquidity_sweep)",
     )
     start_parser.add_argument(
@@ -4,16 +4,32 @@ Minimalist public dashboard for FractalTrader bot monitoring.
 Exposes live status on port 8080 for public viewing.
 """
 
-import html
-import json
+import gzip
+import hashlib
 import logging
+import os
+import re
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, Response, request
+from jinja2 import Environment, select_autoescape
+from markupsafe import Markup, escape
+
+from live.state_manager import trades_file_for
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # Optional: stdlib json is slower but equivalent
+    from json import loads as _loads
 
 app = Flask(__name__)
+# Static assets are versioned by content hash (see _static_url), so they never go stale
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
 
 # Logger configuration inherited from root logger (configured in cli.py)
 logger = logging.getLogger(__name__)
@@ -21,6 +37,57 @@ logger = logging.getLogger(__name__)
 STATE_FILE = Path("/app/.testnet_state.json")
 LOG_FILE = Path("/tmp/bot_v2.log")
 
+# Initial bytes-per-line guess for the log tail and the cap on the read window
+_TAIL_LINE_BYTES = 200
+_TAIL_MAX_BYTES = 1 << 20
+
+# Parsed state summary, keyed by (path, mtime_ns, size) of the state file
+_STATE_CACHE = {"key": None, "value": None}
+
+# Parsed session start, keyed by the raw ISO string from the state file
+_PARSED_START = {"raw": None, "dt": None}
+
+# Pages are rendered by a background refresher at most once per interval and
+# served from the latest snapshot; a snapshot older than _SNAPSHOT_MAX_AGE
+# (refresher not running) is re-rendered inline by the request
+REFRESH_INTERVAL = 1.0
+_SNAPSHOT_MAX_AGE = 2 * REFRESH_INTERVAL
+
+# The refresher only re-renders when the state file, trade log or bot log
+# changed (inode, mtime or size), or every IDLE_RENDER_INTERVAL seconds so the
+# uptime keeps moving while the bot is quiet
+IDLE_RENDER_INTERVAL = 60.0
+_REFRESH_STATE = {"fingerprint": None, "rendered": 0.0}
+_SNAPSHOT = None
+_SNAPSHOT_LOCK = threading.Lock()
+_READ_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-read")
+
+# Notified whenever a newly rendered snapshot is published (drives /events)
+_SNAPSHOT_CHANGED = threading.Condition()
+
+# Server-Sent Events: keepalive period, and how long one stream is held before the
+# browser is asked to reconnect (each open stream occupies a server thread)
+SSE_KEEPALIVE = 15.0
+SSE_MAX_STREAM_SECONDS = 300.0
+
+# Cap on concurrent /events streams, leaving server threads free for page and API
+# requests; viewers turned away fall back to reloading the page
+SSE_MAX_STREAMS = 24
+_STREAM_SLOTS = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+
+def _static_url(filename):
+    """URL for a static asset with a content hash, so browsers can cache it indefinitely."""
+    digest = hashlib.blake2b(Path(app.static_folder, filename).read_bytes(), digest_size=8)
+    return f"/static/{filename}?v={digest.hexdigest()}"
+
+
+_CSS_URL = _static_url("dash.css")
+_JS_URL = _static_url("dash.js")
+
+# Running trade count for the append-only trade log, keyed by (path, inode)
+_TRADES_CACHE = {"key": None, "offset": 0, "count": 0}
+
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
@@ -28,140 +95,114 @@ HTML_TEMPLATE = """
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
     <title>FractalTrader Monitor</title>
-    <meta http-equiv="refresh" content="5">
-    <style>
-        body {
-            font-family: 'Courier New', monospace;
-            background: #0a0e27;
-            color: #00ff41;
-            padding: 20px;
-            margin: 0;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-        h1 {
-            color: #00ff41;
-            text-align: center;
-            font-size: 2em;
-            margin-bottom: 10px;
-        }
-        .status {
-            font-size: 1.2em;
-            text-align: center;
-            margin-bottom: 20px;
-            padding: 10px;
-            background: rgba(0,255,65,0.1);
-            border-radius: 5px;
-        }
-        .section {
-            background: rgba(255,255,255,0.05);
-            padding: 15px;
-            margin: 15px 0;
-            border-radius: 5px;
-            border-left: 3px solid #00ff41;
-        }
-        .section h2 {
-            margin-top: 0;
-            color: #00d4ff;
-            font-size: 1.3em;
-        }
-        .metric {
-            display: grid;
-            grid-template-columns: 200px 1fr;
-            margin: 5px 0;
-            padding: 5px 0;
-        }
-        .metric-label {
-            color: #888;
-        }
-        .metric-value {
-            color: #00ff41;
-            font-weight: bold;
-        }
-        .log-line {
-            font-size: 0.85em;
-            padding: 2px 0;
-            border-bottom: 1px solid rgba(255,255,255,0.05);
-        }
-        .log-time {
-            color: #00d4ff;
-        }
-        .log-level-INFO {
-            color: #00ff41;
-        }
-        .log-level-ERROR {
-            color: #ff4444;
-        }
-        .log-level-WARNING {
-            color: #ffaa00;
-        }
-        .footer {
-            text-align: center;
-            margin-top: 30px;
-            color: #555;
-            font-size: 0.9em;
-        }
-        .running {
-            color: #00ff41;
-        }
-        .stopped {
-            color: #ff4444;
-        }
-    </style>
+    <noscript><meta http-equiv="refresh" content="5"></noscript>
+    <link rel="stylesheet" href="{{ css_url }}">
+    <script src="{{ js_url }}" defer></script>
 </head>
 <body>
     <div class="container">
         <h1>🤖 FractalTrader Live Monitor</h1>
 
         <div class="status">
-            Status: <span class="{{ status_class }}">{{ status }}</span> |
-            Uptime: {{ uptime }} |
-            Last Update: {{ timestamp }}
+            Status: <span id="status" class="{{ status_class }}">{{ status }}</span> |
+            Uptime: <span id="uptime">{{ uptime }}</span> |
+            Last Update: <span id="timestamp">{{ timestamp }}</span>
         </div>
 
         <div class="section">
             <h2>📊 Session Info</h2>
             <div class="metric">
                 <span class="metric-label">Started:</span>
-                <span class="metric-value">{{ session_start }}</span>
+                <span class="metric-value" id="session_start">{{ session_start }}</span>
             </div>
             <div class="metric">
                 <span class="metric-label">Starting Balance:</span>
-                <span class="metric-value">${{ starting_balance }}</span>
+                <span class="metric-value"
+                    >$<span id="starting_balance">{{ starting_balance }}</span></span>
             </div>
             <div class="metric">
                 <span class="metric-label">Open Positions:</span>
-                <span class="metric-value">{{ open_positions }}</span>
+                <span class="metric-value" id="open_positions">{{ open_positions }}</span>
             </div>
             <div class="metric">
                 <span class="metric-label">Total Trades:</span>
-                <span class="metric-value">{{ total_trades }}</span>
+                <span class="metric-value" id="total_trades">{{ total_trades }}</span>
             </div>
         </div>
 
         <div class="section">
             <h2>📈 Recent Activity (Last 50 lines)</h2>
-            <div style="max-height: 400px; overflow-y: auto;">
+            <div id="logs" style="max-height: 400px; overflow-y: auto;">
                 {% for line in logs %}
-                <div class="log-line">{{ line | safe }}</div>
+                <div class="log-line">{{ line }}</div>
                 {% endfor %}
             </div>
         </div>
 
         <div class="footer">
-            Auto-refreshes every 5 seconds | Branch: {{ branch }} | Mode: Simulation
+            Live updates | Branch: {{ branch }} | Mode: Simulation
         </div>
     </div>
 </body>
 </html>
 """
 
+# Compile the page once; autoescaping covers every value not marked as Markup
+_TEMPLATE = Environment(autoescape=select_autoescape(["html"])).from_string(HTML_TEMPLATE)
+
+# One match per non-blank log line; group 1 is the highlighted level, if any
+_LOG_LINE_RE = re.compile(r"^(?=.*? - (ERROR|WARNING) - )?.*\S.*$", re.MULTILINE)
+
+
+def _load_state_summary(key):
+    """Parse the state file, reusing the previous result if it has not changed."""
+    if key != _STATE_CACHE["key"]:
+        state = _loads(STATE_FILE.read_bytes())
+        _STATE_CACHE["value"] = {
+            "session_start": state.get("session_start", "N/A"),
+            "starting_balance": f"{state.get('starting_balance', 0):.2f}",
+            "open_positions": len(state.get("open_positions", {})),
+            # Legacy state files embed the history; newer ones use the trade log
+            "total_trades": len(state["trade_history"]) if "trade_history" in state else None,
+        }
+        _STATE_CACHE["key"] = key
+    return _STATE_CACHE["value"]
+
+
+def _count_trades(path):
+    """
+    Count trades in the trade log, reading only bytes appended since last call.
+
+    A replaced (new inode) or truncated log is recounted from the start.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return 0
+
+    try:
+        st = os.fstat(fd)
+        key = (path, st.st_ino)
+        if key != _TRADES_CACHE["key"] or st.st_size < _TRADES_CACHE["offset"]:
+            _TRADES_CACHE.update(key=key, offset=0, count=0)
+
+        offset = _TRADES_CACHE["offset"]
+        if st.st_size > offset:
+            chunk = os.pread(fd, st.st_size - offset, offset)
+            # Only count complete lines; a partial append is picked up next time
+            complete = chunk.rfind(b"\n") + 1
+            _TRADES_CACHE["offset"] = offset + complete
+            _TRADES_CACHE["count"] += chunk.count(b"\n", 0, complete)
+        return _TRADES_CACHE["count"]
+    finally:
+        os.close(fd)
+
 
 def get_bot_status():
     """Read bot status from state file."""
-    if not STATE_FILE.exists():
+    try:
+        st = STATE_FILE.stat()
+    except FileNotFoundError:
         return {
             "status": "STOPPED",
             "status_class": "stopped",
@@ -173,30 +214,36 @@ def get_bot_status():
         }
 
     try:
-        with open(STATE_FILE) as f:
-            state = json.load(f)
+        summary = _load_state_summary((STATE_FILE, st.st_mtime_ns, st.st_size))
+        if summary["total_trades"] is None:
+            summary = {**summary, "total_trades": _count_trades(trades_file_for(STATE_FILE))}
 
-        session_start = state.get("session_start", "N/A")
+        session_start = summary["session_start"]
         uptime = "N/A"
 
+        # Uptime is recomputed on every call so it stays live between state writes;
+        # session_start is only re-parsed when a new session begins
         if session_start != "N/A":
-            try:
-                start_time = datetime.fromisoformat(session_start)
-                now = datetime.now()
-                delta = now - start_time
-                hours = delta.total_seconds() / 3600
-                uptime = f"{hours:.1f}h"
-            except Exception:
-                pass
+            if session_start != _PARSED_START["raw"]:
+                try:
+                    start_time = datetime.fromisoformat(session_start)
+                except Exception:
+                    start_time = None
+                _PARSED_START.update(raw=session_start, dt=start_time)
+
+            if _PARSED_START["dt"] is not None:
+                try:
+                    delta = datetime.now() - _PARSED_START["dt"]
+                    hours = delta.total_seconds() / 3600
+                    uptime = f"{hours:.1f}h"
+                except Exception:
+                    pass
 
         return {
             "status": "RUNNING",
             "status_class": "running",
             "uptime": uptime,
-            "session_start": session_start,
-            "starting_balance": f"{state.get('starting_balance', 0):.2f}",
-            "open_positions": len(state.get("open_positions", {})),
-            "total_trades": len(state.get("trade_history", [])),
+            **summary,
         }
     except Exception as e:
         logger.error(f"Error reading state: {e}")
@@ -211,45 +258,63 @@ def get_bot_status():
         }
 
 
+def _tail(path, num_lines):
+    """
+    Read the last lines of a file without spawning ``tail``.
+
+    Reads one block from the end of the file and doubles the window
+    (up to ``_TAIL_MAX_BYTES``) only if it holds fewer than ``num_lines``.
+
+    Args:
+        path: File to read
+        num_lines: Number of trailing lines to return
+
+    Returns:
+        List of raw lines (bytes, without newlines), oldest first
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        window = num_lines * _TAIL_LINE_BYTES
+        while True:
+            window = min(window, size, _TAIL_MAX_BYTES)
+            offset = size - window
+            lines = os.pread(fd, window, offset).split(b"\n")
+            # First chunk may be a partial line unless we read from the start
+            if offset > 0:
+                lines = lines[1:]
+            if lines and not lines[-1]:
+                lines.pop()
+            if len(lines) >= num_lines or offset == 0 or window >= _TAIL_MAX_BYTES:
+                return lines[-num_lines:]
+            window *= 2
+    finally:
+        os.close(fd)
+
+
 def get_recent_logs(num_lines=50):
     """Get recent log lines."""
     if not LOG_FILE.exists():
         return ["No logs available"]
 
     try:
-        result = subprocess.run(
-            ["tail", f"-{num_lines}", str(LOG_FILE)],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        lines = result.stdout.strip().split("\n")
-
-        # Simple formatting with XSS protection
-        formatted = []
-        for line in lines:
-            if not line.strip():
-                continue
+        lines = _tail(LOG_FILE, num_lines)
 
-            # Escape HTML to prevent XSS attacks
-            safe_line = html.escape(line)
-
-            # Highlight log levels
-            if " - ERROR - " in line:
-                formatted.append(f'<span class="log-level-ERROR">{safe_line}</span>')
-            elif " - WARNING - " in line:
-                formatted.append(f'<span class="log-level-WARNING">{safe_line}</span>')
-            else:
-                formatted.append(f'<span class="log-level-INFO">{safe_line}</span>')
+        # Escape the whole block once (XSS protection), then wrap each line
+        text = escape(b"\n".join(lines).decode("utf-8", errors="replace"))
+        formatted = [
+            Markup(f'<span class="log-level-{m[1] or "INFO"}">{m[0]}</span>')
+            for m in _LOG_LINE_RE.finditer(text)
+        ]
 
         return formatted if formatted else ["No recent logs"]
     except Exception as e:
         logger.error(f"Error reading logs: {e}")
-        return [f"Error reading logs: {html.escape(str(e))}"]
+        return [f"Error reading logs: {e}"]
 
 
-def get_current_branch():
-    """Get current git branch."""
+def _read_branch_once():
+    """Get current git branch (called once at import)."""
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "HEAD"],
@@ -258,34 +323,214 @@ def get_current_branch():
             timeout=5,
             cwd="/app",
         )
-        return result.stdout.strip()
+        return result.stdout.strip() or "unknown"
     except Exception:
         return "unknown"
 
 
-@app.route("/")
-def index():
-    """Main dashboard page."""
-    status = get_bot_status()
-    logs = get_recent_logs()
-    branch = get_current_branch()
+# The branch cannot change inside a running container, so resolve it once.
+# Images built with the GIT_BRANCH build arg skip the git subprocess entirely.
+BRANCH = os.environ.get("GIT_BRANCH") or _read_branch_once()
+
 
-    return render_template_string(
-        HTML_TEMPLATE,
-        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC"),
-        branch=branch,
+def _render_snapshot():
+    """Render the page and status JSON once for all viewers."""
+    # Overlap the log read with the state read (matters on a cold page cache)
+    logs_future = _READ_POOL.submit(get_recent_logs)
+    status = get_bot_status()
+    logs = logs_future.result()
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+    page = _TEMPLATE.render(
+        timestamp=timestamp,
+        branch=BRANCH,
+        css_url=_CSS_URL,
+        js_url=_JS_URL,
         logs=logs,
         **status,
+    ).encode()
+    status_json = app.json.dumps(status).encode()
+
+    return {
+        "created": time.monotonic(),
+        "html": page,
+        "html_gz": gzip.compress(page, compresslevel=6),
+        "html_etag": hashlib.blake2b(page, digest_size=8).hexdigest(),
+        "json": status_json,
+        "json_etag": hashlib.blake2b(status_json, digest_size=8).hexdigest(),
+        # Fields pushed to live pages over /events (log lines are pre-escaped HTML)
+        "fields": {"timestamp": timestamp, **status, "logs": [escape(line) for line in logs]},
+    }
+
+
+def _publish(snapshot):
+    """Make a newly rendered snapshot current and wake /events streams."""
+    global _SNAPSHOT
+
+    _SNAPSHOT = snapshot
+    with _SNAPSHOT_CHANGED:
+        _SNAPSHOT_CHANGED.notify_all()
+
+
+def _get_snapshot():
+    """Return the current snapshot, rendering it inline if missing or stale."""
+    snapshot = _SNAPSHOT
+    if snapshot is None or time.monotonic() - snapshot["created"] > _SNAPSHOT_MAX_AGE:
+        with _SNAPSHOT_LOCK:
+            # Another request may have refreshed while we waited for the lock
+            snapshot = _SNAPSHOT
+            if snapshot is None or time.monotonic() - snapshot["created"] > _SNAPSHOT_MAX_AGE:
+                snapshot = _render_snapshot()
+                _publish(snapshot)
+    return snapshot
+
+
+def _source_fingerprint():
+    """Identify the current version of every file the page is built from."""
+    fingerprint = []
+    for path in (STATE_FILE, trades_file_for(STATE_FILE), LOG_FILE):
+        try:
+            st = os.stat(path)
+            fingerprint.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except OSError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
+
+def _refresh():
+    """Re-render the snapshot if a source file changed, else just re-date it."""
+    global _SNAPSHOT
+
+    now = time.monotonic()
+    fingerprint = _source_fingerprint()
+    if (
+        _SNAPSHOT is None
+        or fingerprint != _REFRESH_STATE["fingerprint"]
+        or now - _REFRESH_STATE["rendered"] >= IDLE_RENDER_INTERVAL
+    ):
+        _publish(_render_snapshot())
+        _REFRESH_STATE.update(fingerprint=fingerprint, rendered=now)
+    else:
+        _SNAPSHOT = {**_SNAPSHOT, "created": now}
+
+
+def _refresher():
+    """Refresh the snapshot every REFRESH_INTERVAL seconds."""
+    while True:
+        try:
+            _refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing dashboard: {e}")
+        time.sleep(REFRESH_INTERVAL)
+
+
+def start_refresher():
+    """Start the background snapshot refresher thread."""
+    thread = threading.Thread(target=_refresher, name="dashboard-refresher", daemon=True)
+    thread.start()
+    return thread
+
+
+def _cached_response(body, etag, mimetype, gzipped=None):
+    """
+    Build a short-lived cacheable response that honours If-None-Match.
+
+    Args:
+        body: Response bytes
+        etag: Entity tag for ``body``
+        mimetype: Response mimetype
+        gzipped: Optional pre-compressed ``body``, sent to clients accepting gzip
+    """
+    if gzipped is not None and "gzip" in request.accept_encodings:
+        response = Response(gzipped, mimetype=mimetype)
+        response.headers["Content-Encoding"] = "gzip"
+        etag = f"{etag}-gz"
+    else:
+        response = Response(body, mimetype=mimetype)
+    if gzipped is not None:
+        response.vary.add("Accept-Encoding")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = int(REFRESH_INTERVAL)
+    return response.make_conditional(request)
+
+
+@app.after_request
+def _immutable_static(response):
+    """Mark versioned static assets as immutable."""
+    if request.endpoint == "static":
+        response.cache_control.immutable = True
+    return response
+
+
+@app.route("/")
+def index():
+    """Main dashboard page."""
+    snapshot = _get_snapshot()
+    return _cached_response(
+        snapshot["html"], snapshot["html_etag"], "text/html", gzipped=snapshot["html_gz"]
     )
 
 
 @app.route("/api/status")
 def api_status():
     """JSON API endpoint."""
-    status = get_bot_status()
-    return jsonify(status)
+    snapshot = _get_snapshot()
+    return _cached_response(snapshot["json"], snapshot["json_etag"], "application/json")
+
+
+def _event_stream():
+    """
+    Yield Server-Sent Events carrying the page fields that changed.
+
+    The first event holds every field; later events only the changed ones.
+    The stream ends after SSE_MAX_STREAM_SECONDS and the browser reconnects.
+    """
+    sent = {}
+    deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+    yield f"retry: {int(REFRESH_INTERVAL * 5000)}\n\n"
+
+    while time.monotonic() < deadline:
+        fields = _get_snapshot()["fields"]
+        changed = {key: value for key, value in fields.items() if sent.get(key) != value}
+        if changed:
+            sent.update(changed)
+            yield f"data: {app.json.dumps(changed)}\n\n"
+
+        # Never yield while holding the condition: a slow client would block publishers
+        with _SNAPSHOT_CHANGED:
+            updated = _SNAPSHOT_CHANGED.wait_for(
+                lambda fields=fields: _SNAPSHOT is None or _SNAPSHOT["fields"] is not fields,
+                timeout=SSE_KEEPALIVE,
+            )
+        if not updated:
+            yield ": keepalive\n\n"
+
+
+@app.route("/events")
+def events():
+    """Server-Sent Events stream of dashboard updates."""
+    if not _STREAM_SLOTS.acquire(blocking=False):
+        return Response("Too many live viewers", status=503, headers={"Retry-After": "30"})
+    response = Response(
+        _event_stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(_STREAM_SLOTS.release)
+    return response
 
 
 if __name__ == "__main__":
     logger.info("Starting FractalTrader dashboard on port 8080...")
-    app.run(host="0.0.0.0", port=8080, debug=False)
+    start_refresher()
+    try:
+        from waitress import serve
+    except ImportError:
+        # Development fallback: Werkzeug's single-process server
+        logger.warning("waitress not installed, using Flask development server")
+        app.run(host="0.0.0.0", port=8080, debug=False)
+    else:
+        # Each open /events stream holds a thread, so size the pool above SSE_MAX_STREAMS
+        serve(app, host="0.0.0.0", port=8080, threads=32, connection_limit=256)
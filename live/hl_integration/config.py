@@ -1,17 +1,31 @@
 """Configuration for Hyperliquid trading."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal
 
 from dotenv import load_dotenv
 
-load_dotenv()
+# Whether .env has been read into os.environ; see _load_dotenv_once
+_dotenv_loaded = False
 
 
-@dataclass
+def _load_dotenv_once() -> None:
+    """Read .env into os.environ on first use (existing variables win)."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+@dataclass(slots=True, frozen=True)
 class HyperliquidConfig:
-    """Hyperliquid trading configuration."""
+    """
+    Hyperliquid trading configuration.
+
+    Instances are immutable; use ``dataclasses.replace`` to derive a config
+    with different settings.
+    """
 
     # Network
     network: Literal["testnet", "mainnet"] = "testnet"
@@ -33,8 +47,14 @@ class HyperliquidConfig:
 
     # Monitoring
     check_interval_seconds: int = 60  # How often to check for signals
+    account_state_ttl_seconds: float = 2.0  # Reuse user_state responses this long
+    request_timeout_seconds: float = 10.0  # Per-request timeout for Hyperliquid REST calls
+    stream_prices: bool = False  # Watch SL/TP on websocket mid prices between checks
     log_level: str = "INFO"
 
+    # Set once validate() passes; fields are frozen, so the result can't go stale
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+
     @classmethod
     def from_env(cls, network: str = "testnet") -> "HyperliquidConfig":
         """
@@ -46,12 +66,18 @@ class HyperliquidConfig:
         Optional env vars:
             HYPERLIQUID_MAX_POSITIONS - Max open positions (default: 3)
             HYPERLIQUID_MAX_RISK - Max risk per trade (default: 0.02)
+            HYPERLIQUID_STREAM_PRICES - Stream mid prices over websocket (default: false)
 
         Example .env file:
             HYPERLIQUID_PRIVATE_KEY=0x1234...
             HYPERLIQUID_MAX_POSITIONS=5
             HYPERLIQUID_MAX_RISK=0.015
+
+        The .env file is parsed on the first call only; later calls read the
+        process environment directly.
         """
+        _load_dotenv_once()
+
         private_key = os.getenv("HYPERLIQUID_PRIVATE_KEY")
         if not private_key:
             raise ValueError(
@@ -59,24 +85,33 @@ class HyperliquidConfig:
                 "Add to .env file or set environment variable."
             )
 
-        config = cls(network=network, private_key=private_key)
+        kwargs = {"network": network, "private_key": private_key}
 
-        # Override with env vars if present
+        # Override defaults with env vars if present
         if max_pos := os.getenv("HYPERLIQUID_MAX_POSITIONS"):
-            config.max_open_positions = int(max_pos)
+            kwargs["max_open_positions"] = int(max_pos)
 
         if max_risk := os.getenv("HYPERLIQUID_MAX_RISK"):
-            config.base_risk_percent = float(max_risk)
+            kwargs["base_risk_percent"] = float(max_risk)
+
+        if stream := os.getenv("HYPERLIQUID_STREAM_PRICES"):
+            kwargs["stream_prices"] = stream.lower() in ("1", "true", "yes")
 
-        return config
+        return cls(**kwargs)
 
     def validate(self) -> None:
         """
         Validate configuration.
 
+        Checks run once per instance; revalidating returns immediately. Configs
+        derived with ``dataclasses.replace`` are checked again.
+
         Raises:
             ValueError: If configuration is invalid
         """
+        if self._validated:
+            return
+
         if not self.private_key:
             raise ValueError("private_key is required")
 
@@ -91,3 +126,5 @@ class HyperliquidConfig:
 
         if self.min_confidence < 0 or self.min_confidence > 100:
             raise ValueError("min_confidence must be 0-100")
+
+        object.__setattr__(self, "_validated", True)
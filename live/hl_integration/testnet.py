@@ -1,14 +1,19 @@
 """Hyperliquid testnet paper trading."""
 
 import logging
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 
+import pandas as pd
 from eth_account import Account
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
-from ratelimit import limits, sleep_and_retry
 
 from data.hyperliquid_fetcher import HyperliquidFetcher
 from live.hl_integration.config import HyperliquidConfig
@@ -18,6 +23,125 @@ from strategies.base import BaseStrategy, Signal
 
 logger = logging.getLogger(__name__)
 
+# Tick sizes based on Hyperliquid requirements (as of 2026-01)
+# See: https://hyperliquid.gitbook.io/hyperliquid-docs
+TICK_SIZES = {
+    "BTC": 1,        # BTC: integer prices only
+    "ETH": 0.1,      # ETH: 0.1 precision
+    "SOL": 0.01,     # SOL: 0.01 precision
+    "AVAX": 0.01,
+    "DOGE": 0.00001,
+    "XRP": 0.0001,
+    "MATIC": 0.0001,
+    "LINK": 0.01,
+    "ARB": 0.0001,
+    "OP": 0.001,
+}
+DEFAULT_TICK_SIZE = 0.01
+
+
+def _tick_precision(tick_size: float) -> int:
+    """Decimal places of a tick size (0 for integer ticks)."""
+    if tick_size >= 1:
+        return 0
+    return len(f"{tick_size:f}".rstrip("0").split(".")[-1])
+
+
+# Worked out once at import rather than on every rounded price
+_TICK_PRECISION = {symbol: _tick_precision(tick) for symbol, tick in TICK_SIZES.items()}
+_DEFAULT_TICK_PRECISION = _tick_precision(DEFAULT_TICK_SIZE)
+
+# Size decimals assumed for coins missing from the exchange metadata
+DEFAULT_SIZE_DECIMALS = 5
+
+# Error message keywords used to classify exceptions (one precompiled pattern each)
+_TRANSIENT_ERROR_RE = re.compile(
+    "timeout|connection|network|temporary|rate limit|unavailable", re.IGNORECASE
+)
+_CRITICAL_ERROR_RE = re.compile("invalid|unauthorized|forbidden|insufficient|locked", re.IGNORECASE)
+
+# Price stream: how often the idle loop checks for pushed mids, and how old
+# pushed mids may get before iterations fall back to a REST request
+PRICE_STREAM_POLL_SECONDS = 1.0
+PRICE_STREAM_MAX_AGE = 5.0
+
+# Number of (symbol, period, last bar) ATR results kept between iterations
+ATR_CACHE_SIZE = 8
+
+# Period of the baseline ATR that the current (14-period) ATR is sized against
+BASELINE_ATR_PERIOD = 50
+
+# Candles kept per (symbol, timeframe); enough for strategy calculations
+OHLCV_LIMIT = 500
+
+# After a symbol returns no candles, skip re-requesting it for this long (seconds)
+NO_DATA_RETRY_SECONDS = 60.0
+
+# Hyperliquid accepts at most this many orders in one bulk action
+MAX_BULK_ORDERS = 50
+
+# Trades kept in memory; the full history stays in the state manager's trade log
+TRADE_HISTORY_LIMIT = 5000
+
+# State updates are written by a background thread at most this often (seconds)
+STATE_FLUSH_INTERVAL = 0.5
+
+# Circuit-breaker checks between reconciling the tracked equity with the account
+EQUITY_RECONCILE_CHECKS = 10
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Not thread-safe: each bucket belongs to the single-threaded trading loop.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum burst size (default: rate)
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> float:
+        """
+        Take one token if one is available, without blocking.
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds until one will be
+            available (no token is taken)
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        wait = self.try_acquire()
+        if wait > 0:
+            time.sleep(wait)
+            # The token that accrued while sleeping is spent right away
+            self._tokens = 0
+            self._updated += wait
+
+
+@dataclass(slots=True)
+class _ExchangePosition:
+    """Fields of an exchange position read during sync, plus the raw record."""
+
+    size: float  # Signed: negative for shorts
+    entry_price: float
+    unrealized_pnl: float
+    raw: dict
+
 
 class TransientError(Exception):
     """
@@ -39,6 +163,25 @@ class CriticalError(Exception):
     pass
 
 
+def _classify_error(error: Exception) -> type[Exception] | None:
+    """
+    Classify an exception by the keywords in its message.
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        CriticalError or TransientError (critical wins if both match), or None
+        if the message matches neither
+    """
+    message = str(error)
+    if _CRITICAL_ERROR_RE.search(message):
+        return CriticalError
+    if _TRANSIENT_ERROR_RE.search(message):
+        return TransientError
+    return None
+
+
 class HyperliquidTestnetTrader:
     """
     Paper trading on Hyperliquid testnet.
@@ -52,11 +195,23 @@ class HyperliquidTestnetTrader:
     Testnet URL: https://app.hyperliquid-testnet.xyz
     """
 
+    # Wall-clock time frozen at the start of the current trading iteration
+    _iter_now: datetime | None = None
+
+    # Background thread for requests that overlap the main loop (created lazily)
+    _io_pool: ThreadPoolExecutor | None = None
+
+    # Network this trader runs against (config.network must match)
+    NETWORK = "testnet"
+
     def __init__(
         self,
         config: HyperliquidConfig,
         strategy: BaseStrategy,
         state_file: str = ".testnet_state.json",
+        api_url: str = constants.TESTNET_API_URL,
+        backup_count: int = 5,
+        flush_interval: float | None = STATE_FLUSH_INTERVAL,
     ):
         """
         Initialize testnet trader.
@@ -65,12 +220,16 @@ class HyperliquidTestnetTrader:
             config: HyperliquidConfig with network='testnet'
             strategy: Strategy instance to trade
             state_file: Path to state file for persistence
+            api_url: Hyperliquid API endpoint for the Info/Exchange clients
+            backup_count: Number of state file backups to keep
+            flush_interval: Seconds between background state writes
+                (None = write synchronously on every change)
 
         Raises:
-            ValueError: If config.network != 'testnet'
+            ValueError: If config.network doesn't match the trader's network
         """
-        if config.network != "testnet":
-            raise ValueError("TestnetTrader requires network='testnet'")
+        if config.network != self.NETWORK:
+            raise ValueError(f"{type(self).__name__} requires network='{self.NETWORK}'")
 
         config.validate()
 
@@ -82,11 +241,40 @@ class HyperliquidTestnetTrader:
         logger.info(f"Wallet address: {self.wallet.address}")
 
         # Initialize Hyperliquid clients
-        self.info = Info(constants.TESTNET_API_URL, skip_ws=True)
-        self.exchange = Exchange(self.wallet, constants.TESTNET_API_URL)
+        timeout = config.request_timeout_seconds
+        self.info = Info(api_url, skip_ws=not config.stream_prices, timeout=timeout)
+        self.exchange = Exchange(self.wallet, api_url, timeout=timeout)
 
         # Initialize data fetcher
-        self.fetcher = HyperliquidFetcher(network="testnet")
+        self.fetcher = HyperliquidFetcher(network=config.network, timeout=timeout)
+        self._share_http_session()
+
+        # Short-lived cache of the account state (one user_state call per iteration)
+        self._user_state_cache: tuple[dict, float] | None = None
+        self._user_state_ttl = config.account_state_ttl_seconds
+
+        # Client-side API rate limits
+        self._order_rate_limit = TokenBucket(rate=5)  # Max 5 order placements per second
+        self._user_state_rate_limit = TokenBucket(rate=10)  # Max 10 account state requests/s
+
+        # Rolling OHLCV window per (symbol, timeframe), and when to retry a
+        # (symbol, timeframe) that returned no candles; see _fetch_ohlcv
+        self._ohlcv_cache: dict[tuple[str, str], pd.DataFrame] = {}
+        self._no_data_until: dict[tuple[str, str], float] = {}
+
+        # Latest ATR per (symbol, period, last bar); see _calculate_atr
+        self._atr_cache: dict[tuple, float] = {}
+
+        # Latest websocket mids (set from the websocket thread when streaming)
+        self._streamed_mids: tuple[dict, float] | None = None
+        self._price_subscription: int | None = None
+
+        # Size decimals per coin from the exchange metadata; see _size_decimals
+        self._sz_decimals: dict[str, int] | None = None
+
+        # Portfolio value tracked from fills and marks; see _get_equity
+        self._current_equity: float | None = None
+        self._equity_checks = 0
 
         # Risk parameters
         self.risk_params = RiskParameters(
@@ -96,14 +284,47 @@ class HyperliquidTestnetTrader:
         )
 
         # Initialize state manager (with persistence)
-        self.state_manager = StateManager(state_file=state_file, auto_save=True, backup_count=5)
+        self.state_manager = StateManager(
+            state_file=state_file,
+            auto_save=True,
+            backup_count=backup_count,
+            flush_interval=flush_interval,
+        )
 
         # Load state from previous session (if exists)
         self.open_positions: dict = self.state_manager.load_positions()
-        self.trade_history: list[dict] = self.state_manager.load_trade_history()
+        # Full Signal objects for positions opened this session (never persisted)
+        self._live_signals: dict[str, Signal] = {}
+        # Counters are seeded from the full history; only the most recent
+        # TRADE_HISTORY_LIMIT trades are kept in memory afterwards
+        history = self.state_manager.load_trade_history()
+        self.trade_history: deque[dict] = deque(history, maxlen=TRADE_HISTORY_LIMIT)
+        self._init_trade_counters(history)
         self.is_running = False
 
-        # Set starting balance if not set
+        self._init_starting_balance()
+
+        # Circuit breakers (testnet-specific safeguards)
+        self.max_daily_drawdown = 0.20  # Stop if down 20% (more lenient than mainnet)
+        self.max_daily_trades = 50  # Limit number of trades per day
+        self.circuit_breaker_triggered = False
+        self._circuit_breaker_date = datetime.now().date()  # Track daily reset
+
+        # Sync positions with exchange on startup (critical for recovery)
+        self._sync_positions_with_exchange()
+
+        logger.info(f"{type(self).__name__} initialized ({self.NETWORK})")
+        logger.info(
+            f"Circuit breakers: max_drawdown={self.max_daily_drawdown:.1%}, max_trades={self.max_daily_trades}"
+        )
+        if self.open_positions:
+            logger.info(f"Loaded {len(self.open_positions)} open positions from previous session")
+        if self.trade_history:
+            total_trades = self.state_manager.get_stats()["total_trades"]
+            logger.info(f"Loaded {total_trades} trades from history")
+
+    def _init_starting_balance(self):
+        """Set (or resume) the session starting balance and the simulation mode."""
         if self.state_manager.get_starting_balance() == 0:
             portfolio_value = self._get_portfolio_value()
 
@@ -131,30 +352,15 @@ class HyperliquidTestnetTrader:
             self.simulation_mode = actual_balance == 0
             logger.info(f"Resumed session with starting balance: " f"${self.starting_balance:,.2f}")
 
-        # Circuit breakers (testnet-specific safeguards)
-        self.max_daily_drawdown = 0.20  # Stop if down 20% (more lenient than mainnet)
-        self.max_daily_trades = 50  # Limit number of trades per day
-        self.circuit_breaker_triggered = False
-        self._circuit_breaker_date = datetime.now().date()  # Track daily reset
-
-        # Sync positions with exchange on startup (critical for recovery)
-        self._sync_positions_with_exchange()
-
-        logger.info("TestnetTrader initialized")
-        logger.info(
-            f"Circuit breakers: max_drawdown={self.max_daily_drawdown:.1%}, max_trades={self.max_daily_trades}"
-        )
-        if self.open_positions:
-            logger.info(f"Loaded {len(self.open_positions)} open positions from previous session")
-        if self.trade_history:
-            logger.info(f"Loaded {len(self.trade_history)} trades from history")
-
-    def run(self, duration_seconds: int | None = None):
+    def run(self, duration_seconds: int | None = None, stop_event: threading.Event | None = None):
         """
         Run trading loop.
 
         Args:
             duration_seconds: How long to run (None = indefinite)
+            stop_event: Optional event that ends the loop at the next iteration
+                boundary (e.g. set from a signal handler); it also cuts the
+                sleep between iterations short
 
         Example:
             >>> trader = TestnetTrader(config, strategy)
@@ -162,14 +368,19 @@ class HyperliquidTestnetTrader:
         """
         self.is_running = True
         start_time = time.time()
+        if stop_event is None:
+            stop_event = threading.Event()
 
         logger.info("Starting testnet trading loop")
         logger.info(f"Strategy: {self.strategy.name}")
         logger.info(f"Symbol: {self.config.default_symbol}")
         logger.info(f"Timeframe: {self.config.default_timeframe}")
 
+        if self.config.stream_prices:
+            self._start_price_stream()
+
         try:
-            while self.is_running:
+            while self.is_running and not stop_event.is_set():
                 # Check if duration exceeded
                 if duration_seconds:
                     elapsed = time.time() - start_time
@@ -180,8 +391,10 @@ class HyperliquidTestnetTrader:
                 # Main trading loop
                 self._trading_iteration()
 
-                # Sleep until next check
-                time.sleep(self.config.check_interval_seconds)
+                # Wait until next check (returns early once a stop is requested)
+                if self._wait_for_next_check(stop_event):
+                    logger.info("Stop requested, stopping")
+                    break
 
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
@@ -190,23 +403,98 @@ class HyperliquidTestnetTrader:
         finally:
             self.stop()
 
+    def _wait_for_next_check(self, stop_event: threading.Event) -> bool:
+        """
+        Wait out the check interval, watching SL/TP on streamed prices meanwhile.
+
+        Without a price stream this is a plain interruptible sleep. With one,
+        open positions are checked against each fresh websocket push, so a
+        stop loss reacts within about a second instead of a full interval.
+
+        Args:
+            stop_event: Event that ends the wait early
+
+        Returns:
+            True if a stop was requested
+        """
+        interval = self.config.check_interval_seconds
+        if self._price_subscription is None:
+            return stop_event.wait(interval)
+
+        deadline = time.monotonic() + interval
+        seen = self._streamed_mids
+        while (remaining := deadline - time.monotonic()) > 0:
+            if stop_event.wait(min(remaining, PRICE_STREAM_POLL_SECONDS)):
+                return True
+            latest = self._streamed_mids
+            if latest is seen or not self.open_positions:
+                continue
+            seen = latest
+            mids = latest[0]
+            self._monitor_positions(
+                {symbol: float(mids.get(symbol, 0)) for symbol in self.open_positions}
+            )
+        return False
+
+    def _start_price_stream(self):
+        """Subscribe to websocket allMids pushes (falls back to REST on failure)."""
+        try:
+            self._price_subscription = self.info.subscribe({"type": "allMids"}, self._on_mids)
+            logger.info("Streaming mid prices over websocket")
+        except Exception as e:
+            logger.warning(f"Price stream unavailable, polling REST instead: {e}")
+            self._price_subscription = None
+
+    def _stop_price_stream(self):
+        """Unsubscribe from allMids and close the websocket."""
+        if self._price_subscription is None:
+            return
+        try:
+            self.info.unsubscribe({"type": "allMids"}, self._price_subscription)
+            self.info.disconnect_websocket()
+        except Exception as e:
+            logger.warning(f"Failed to close price stream: {e}")
+        self._price_subscription = None
+        self._streamed_mids = None
+
+    def _on_mids(self, message: dict):
+        """Websocket callback: keep the latest pushed mids (runs on the ws thread)."""
+        mids = message.get("data", {}).get("mids")
+        if mids:
+            self._streamed_mids = (mids, time.monotonic())
+
     def _trading_iteration(self):
         """Single iteration of trading loop with circuit breakers."""
+        self._iter_now = datetime.now()
         try:
             # Check circuit breakers first
             if not self._check_circuit_breakers():
                 return
 
-            # 0. Monitor and manage existing positions (SL/TP)
-            self._monitor_positions()
-
-            # 1. Fetch latest data
-            data = self.fetcher.fetch_ohlcv(
-                self.config.default_symbol,
-                self.config.default_timeframe,
-                limit=500,  # Enough for strategy calculations
+            # 1. Fetch latest data in the background: it does not depend on
+            # position monitoring, so their requests overlap
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hl-io")
+            ohlcv = self._io_pool.submit(
+                self._fetch_ohlcv, self.config.default_symbol, self.config.default_timeframe
             )
 
+            try:
+                # 0. Monitor and manage existing positions (SL/TP); one allMids
+                # request prices every open position and a possible new order
+                prices = self._fetch_prices()
+                self._monitor_positions(prices)
+            except BaseException:
+                self._discard_fetch(ohlcv)
+                raise
+
+            # New marks moved the tracked equity; re-check before opening anything
+            if self._current_equity is not None and not self._check_drawdown(self._current_equity):
+                self._discard_fetch(ohlcv)
+                return
+
+            data = ohlcv.result()
+
             # 2. Generate signals
             signals = self.strategy.generate_signals(data)
 
@@ -218,29 +506,32 @@ class HyperliquidTestnetTrader:
             signals.sort(key=lambda s: (s.confidence, s.timestamp), reverse=True)
             best_signal = signals[0]
 
-            logger.info(
-                f"Selected best signal: "
-                f"{'LONG' if best_signal.direction == 1 else 'SHORT'} "
-                f"confidence={best_signal.confidence} "
-                f"({len([s for s in signals if s.direction == 1])} LONG, "
-                f"{len([s for s in signals if s.direction == -1])} SHORT available)"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                longs = sum(1 for s in signals if s.direction == 1)
+                logger.info(
+                    "Selected best signal: %s confidence=%s (%d LONG, %d SHORT available)",
+                    "LONG" if best_signal.direction == 1 else "SHORT",
+                    best_signal.confidence,
+                    longs,
+                    len(signals) - longs,
+                )
 
             # Check minimum confidence
             if best_signal.confidence < self.config.min_confidence:
                 logger.info(
-                    f"Signal confidence {best_signal.confidence} < "
-                    f"min_confidence {self.config.min_confidence}, skipping"
+                    "Signal confidence %s < min_confidence %s, skipping",
+                    best_signal.confidence,
+                    self.config.min_confidence,
                 )
                 return
 
-            logger.info(f"Signal: {best_signal.direction} @ " f"{best_signal.entry_price:.2f}")
+            logger.info("Signal: %s @ %.2f", best_signal.direction, best_signal.entry_price)
 
             # 4. Check if we can open position
             # First check if position already exists for this symbol
             symbol = self.config.default_symbol
             if symbol in self.open_positions:
-                logger.warning(f"Position already exists for {symbol}, skipping signal")
+                logger.warning("Position already exists for %s, skipping signal", symbol)
                 return
 
             if len(self.open_positions) >= self.config.max_open_positions:
@@ -266,47 +557,130 @@ class HyperliquidTestnetTrader:
                 return
 
             # 6. Place order
-            self._place_order(best_signal, position_size)
+            self._place_order(best_signal, position_size, prices)
 
         except TransientError as e:
             # Transient errors: network issues, API timeouts
-            logger.warning(f"Transient error, will retry on next iteration: {e}")
+            logger.warning("Transient error, will retry on next iteration: %s", e)
             time.sleep(5)  # Brief pause before continuing
 
         except CriticalError as e:
             # Critical errors: stop trading immediately
-            logger.critical(f"🛑 CRITICAL ERROR - Stopping trading: {e}")
+            logger.critical("🛑 CRITICAL ERROR - Stopping trading: %s", e)
             self.circuit_breaker_triggered = True
             self.stop()
 
         except Exception as e:
             # Unknown errors: log and categorize conservatively
-            error_msg = str(e).lower()
-
-            # Check if it's likely a transient error
-            transient_keywords = ["timeout", "connection", "network", "temporary", "rate limit"]
-            if any(keyword in error_msg for keyword in transient_keywords):
-                logger.warning(f"Likely transient error (retrying): {e}")
+            if _classify_error(e) is TransientError:
+                logger.warning("Likely transient error (retrying): %s", e)
                 time.sleep(5)
             else:
                 # Unknown error - log extensively but continue cautiously
-                logger.error(f"Iteration error (unknown type): {e}", exc_info=True)
+                logger.error("Iteration error (unknown type): %s", e, exc_info=True)
                 time.sleep(10)  # Longer pause for unknown errors
 
-    def _monitor_positions(self):
+        finally:
+            self._iter_now = None
+
+    def _now(self) -> datetime:
+        """Current time; one shared timestamp for everything within an iteration."""
+        return self._iter_now or datetime.now()
+
+    def _discard_fetch(self, future: Future):
+        """Cancel a background fetch the iteration no longer needs, or log its failure."""
+        if future.cancel():
+            return
+        try:
+            future.result()
+        except Exception as e:
+            logger.warning(f"Discarded background fetch failed: {e}")
+
+    def _fetch_ohlcv(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """
+        Fetch the latest OHLCV window, downloading only candles not yet held.
+
+        The first call bootstraps OHLCV_LIMIT candles. Later calls request
+        candles from the last held bar onwards (that bar may still have been
+        forming) and splice them onto the cached window. A symbol that
+        returned no candles is not asked again for NO_DATA_RETRY_SECONDS.
+
+        Args:
+            symbol: Coin name (e.g., 'BTC')
+            timeframe: Candle timeframe (e.g., '1h')
+
+        Returns:
+            DataFrame with the most recent OHLCV_LIMIT candles
+        """
+        key = (symbol, timeframe)
+        cached = self._ohlcv_cache.get(key)
+
+        if cached is None or cached.empty:
+            now = time.monotonic()
+            if cached is not None and self._no_data_until.get(key, 0.0) > now:
+                return cached
+
+            data = self.fetcher.fetch_ohlcv(symbol, timeframe, limit=OHLCV_LIMIT)
+            if data.empty:
+                self._no_data_until[key] = now + NO_DATA_RETRY_SECONDS
+            else:
+                self._no_data_until.pop(key, None)
+        else:
+            since_ms = cached.index[-1].value // 1_000_000
+            new = self.fetcher.fetch_ohlcv(symbol, timeframe, limit=OHLCV_LIMIT, since=since_ms)
+            if new.empty:
+                return cached
+            # Held bars before the first fetched one (index is sorted: slice, no mask)
+            kept = cached.iloc[: cached.index.searchsorted(new.index[0])]
+            data = pd.concat([kept, new]).tail(OHLCV_LIMIT)
+
+        self._ohlcv_cache[key] = data
+        return data
+
+    def _fetch_prices(self) -> dict[str, float]:
+        """
+        Fetch current prices for all open positions and the default symbol.
+
+        Returns:
+            Dict of symbol -> price (0.0 for unknown symbols)
+        """
+        symbols = [*self.open_positions]
+        if self.config.default_symbol not in self.open_positions:
+            symbols.append(self.config.default_symbol)
+
+        # Pushed mids are as good as a fresh allMids request while they are recent
+        streamed = self._streamed_mids
+        if streamed is not None and time.monotonic() - streamed[1] < PRICE_STREAM_MAX_AGE:
+            mids = streamed[0]
+            return {symbol: float(mids.get(symbol, 0)) for symbol in symbols}
+
+        return self.fetcher.get_current_prices(symbols)
+
+    def _monitor_positions(self, prices: dict[str, float] | None = None):
         """
         Monitor open positions and close them if SL/TP is hit.
 
         This is critical for risk management - positions must be closed
         when stop loss or take profit levels are reached.
+
+        Args:
+            prices: Current prices by symbol (fetched in one request if None)
         """
         if not self.open_positions:
             return
 
-        for symbol, position in list(self.open_positions.items()):
+        if prices is None:
+            prices = self.fetcher.get_current_prices(list(self.open_positions))
+
+        # SL/TP hits are collected and closed together after the sweep
+        to_close: list[tuple[str, float, str]] = []
+
+        # Closes are deferred until after the sweep, so the dict isn't resized
+        # while it's iterated and no snapshot copy is needed
+        for symbol, position in self.open_positions.items():
             try:
                 # Get current price
-                current_price = self.fetcher.get_current_price(symbol)
+                current_price = prices.get(symbol, 0.0)
                 if current_price <= 0:
                     logger.warning(f"Could not get price for {symbol}, skipping position check")
                     continue
@@ -316,13 +690,7 @@ class HyperliquidTestnetTrader:
                 take_profit = position.get("take_profit")
                 size = position.get("size", 0)
 
-                # Determine position direction (from signal or entry data)
-                signal = position.get("signal")
-                if signal and hasattr(signal, "direction"):
-                    is_long = signal.direction == 1
-                else:
-                    # Fallback: assume long if no signal data
-                    is_long = True
+                is_long = self._position_is_long(position)
 
                 # Check stop loss
                 if stop_loss:
@@ -333,7 +701,7 @@ class HyperliquidTestnetTrader:
                             f"🛑 STOP LOSS HIT for {symbol}! "
                             f"Price: ${current_price:,.2f}, SL: ${stop_loss:,.2f}"
                         )
-                        self._close_position(symbol, current_price, "STOP_LOSS")
+                        to_close.append((symbol, current_price, "STOP_LOSS"))
                         continue
 
                 # Check take profit
@@ -345,20 +713,46 @@ class HyperliquidTestnetTrader:
                             f"🎯 TAKE PROFIT HIT for {symbol}! "
                             f"Price: ${current_price:,.2f}, TP: ${take_profit:,.2f}"
                         )
-                        self._close_position(symbol, current_price, "TAKE_PROFIT")
+                        to_close.append((symbol, current_price, "TAKE_PROFIT"))
                         continue
 
-                # Update unrealized P&L for simulation mode
-                if hasattr(self, "simulation_mode") and self.simulation_mode:
-                    if is_long:
-                        unrealized_pnl = (current_price - entry_price) * size
-                    else:
-                        unrealized_pnl = (entry_price - current_price) * size
-                    position["unrealized_pnl"] = unrealized_pnl
+                # Update unrealized P&L and move the tracked equity by the change
+                if is_long:
+                    unrealized_pnl = (current_price - entry_price) * size
+                else:
+                    unrealized_pnl = (entry_price - current_price) * size
+                if self._current_equity is not None:
+                    self._current_equity += unrealized_pnl - position.get("unrealized_pnl", 0.0)
+                position["unrealized_pnl"] = unrealized_pnl
 
             except Exception as e:
                 logger.error(f"Error monitoring position {symbol}: {e}")
 
+        if to_close:
+            try:
+                self._close_positions(to_close)
+            except Exception as e:
+                logger.error(f"Error closing positions {[c[0] for c in to_close]}: {e}")
+
+    @staticmethod
+    def _position_is_long(position: dict) -> bool:
+        """
+        Get the side of a tracked position.
+
+        Positions store ``direction`` (1 long, -1 short). Entries persisted by
+        older versions stored the whole Signal instead, which comes back from
+        the state file as a plain dict.
+        """
+        direction = position.get("direction")
+        if direction is None:
+            signal = position.get("signal")
+            if isinstance(signal, dict):
+                direction = signal.get("direction")
+            else:
+                direction = getattr(signal, "direction", None)
+        # Fallback: assume long if no direction data
+        return direction != -1
+
     def _close_position(self, symbol: str, exit_price: float, reason: str):
         """
         Close a position and record the trade.
@@ -368,64 +762,136 @@ class HyperliquidTestnetTrader:
             exit_price: Price at which position is closed
             reason: Why position was closed (STOP_LOSS, TAKE_PROFIT, MANUAL)
         """
-        if symbol not in self.open_positions:
-            logger.warning(f"Cannot close position {symbol}: not found")
-            return
+        self._close_positions([(symbol, exit_price, reason)])
 
-        position = self.open_positions[symbol]
-        entry_price = position.get("entry_price", 0)
-        size = position.get("size", 0)
+    def _close_positions(self, closes: list[tuple[str, float, str]]):
+        """
+        Close several positions and record their trades.
 
-        # Determine direction
-        signal = position.get("signal")
-        if signal and hasattr(signal, "direction"):
-            is_long = signal.direction == 1
-        else:
-            is_long = True
+        The close orders go out as one signed bulk_orders action (chunked at
+        MAX_BULK_ORDERS) rather than one signed request each, so a sweep that
+        trips several stops at once pays for a single round-trip. Only
+        positions whose close order was accepted are booked; the rest stay
+        open and are retried on the next sweep.
 
-        # Calculate P&L
-        if is_long:
-            pnl = (exit_price - entry_price) * size
-        else:
-            pnl = (entry_price - exit_price) * size
+        Args:
+            closes: (symbol, exit_price, reason) for each position to close
+        """
+        closing = []
+        for symbol, exit_price, reason in closes:
+            if symbol not in self.open_positions:
+                logger.warning(f"Cannot close position {symbol}: not found")
+                continue
 
-        logger.info(
-            f"📊 Closing {symbol}: "
-            f"{'LONG' if is_long else 'SHORT'} "
-            f"Entry: ${entry_price:,.2f}, Exit: ${exit_price:,.2f}, "
-            f"P&L: ${pnl:+,.2f} ({reason})"
-        )
+            position = self.open_positions[symbol]
+            entry_price = position.get("entry_price", 0)
+            size = position.get("size", 0)
+
+            is_long = self._position_is_long(position)
+
+            # Calculate P&L
+            if is_long:
+                pnl = (exit_price - entry_price) * size
+            else:
+                pnl = (entry_price - exit_price) * size
+
+            logger.info(
+                f"📊 Closing {symbol}: "
+                f"{'LONG' if is_long else 'SHORT'} "
+                f"Entry: ${entry_price:,.2f}, Exit: ${exit_price:,.2f}, "
+                f"P&L: ${pnl:+,.2f} ({reason})"
+            )
+            closing.append((symbol, exit_price, reason, is_long, size, pnl))
+
+        if not closing:
+            return
 
-        # Place close order (unless in simulation mode)
+        # Place close orders (unless in simulation mode)
         if not (hasattr(self, "simulation_mode") and self.simulation_mode):
+            placed = self._send_close_orders(
+                [
+                    {
+                        "coin": symbol,
+                        "is_buy": not is_long,  # Opposite direction to close
+                        "sz": size,
+                        "limit_px": self._round_to_tick_size(symbol, exit_price),
+                        "order_type": {"limit": {"tif": "Gtc"}},
+                        "reduce_only": False,
+                    }
+                    for symbol, exit_price, _, is_long, size, _ in closing
+                ]
+            )
+            for symbol, *_ in closing:
+                if symbol not in placed:
+                    logger.warning(f"⚠️ Keeping {symbol} open: close order not accepted")
+            closing = [close for close in closing if close[0] in placed]
+
+        # One state write for the whole sweep
+        with self.state_manager.batch():
+            for symbol, exit_price, reason, _, _, pnl in closing:
+                self._record_closed_pnl(pnl)
+                self._realized_pnl += pnl
+                if self._current_equity is not None:
+                    # Realized P&L replaces the unrealized P&L already counted
+                    unrealized_pnl = self.open_positions[symbol].get("unrealized_pnl", 0.0)
+                    self._current_equity += pnl - unrealized_pnl
+
+                # Update trade in state manager and in the local history
+                close_updates = {
+                    "exit_price": exit_price,
+                    "pnl": pnl,
+                    "status": "CLOSED",
+                    "close_reason": reason,
+                    "close_timestamp": self._now().isoformat(),
+                }
+                self.state_manager.update_trade_status(symbol, **close_updates)
+                open_trade = self._open_trade_index.pop(symbol, None)
+                if open_trade is not None:
+                    open_trade.update(close_updates)
+
+                # Remove from open positions
+                del self.open_positions[symbol]
+                self._live_signals.pop(symbol, None)
+                self.state_manager.remove_position(symbol)
+
+                logger.info(f"✅ Position {symbol} closed successfully")
+
+    def _send_close_orders(self, order_requests: list[dict]) -> set[str]:
+        """
+        Send close orders as bulk actions and log each order's outcome.
+
+        Args:
+            order_requests: SDK order requests (coin, is_buy, sz, limit_px, ...)
+
+        Returns:
+            Coins whose close order is resting or filled
+        """
+        placed = set()
+        for start in range(0, len(order_requests), MAX_BULK_ORDERS):
+            batch = order_requests[start : start + MAX_BULK_ORDERS]
+            coins = [order["coin"] for order in batch]
             try:
-                # For long positions, we sell; for short, we buy
-                close_order = self.exchange.order(
-                    symbol,
-                    not is_long,  # Opposite direction to close
-                    size,
-                    self._round_to_tick_size(symbol, exit_price),
-                    {"limit": {"tif": "Gtc"}}
-                )
-                logger.info(f"Close order placed: {close_order}")
+                response = self.exchange.bulk_orders(batch)
             except Exception as e:
-                logger.error(f"Failed to place close order for {symbol}: {e}")
-
-        # Update trade in state manager
-        self.state_manager.update_trade_status(
-            symbol,
-            exit_price=exit_price,
-            pnl=pnl,
-            status="CLOSED",
-            close_reason=reason,
-            close_timestamp=datetime.now().isoformat()
-        )
-
-        # Remove from open positions
-        del self.open_positions[symbol]
-        self.state_manager.remove_position(symbol)
+                logger.error(f"Failed to place close orders for {coins}: {e}")
+                continue
+
+            if not isinstance(response, dict) or response.get("status") != "ok":
+                logger.error(f"Close orders for {coins} failed: {response}")
+                continue
+
+            statuses = response.get("response", {}).get("data", {}).get("statuses", [])
+            if len(statuses) < len(coins):
+                logger.error(f"Close orders for {coins[len(statuses):]} returned no status")
+            for coin, status in zip(coins, statuses, strict=False):
+                if "resting" in status or "filled" in status:
+                    placed.add(coin)
+                    logger.info(f"Close order placed for {coin}: {status}")
+                else:
+                    logger.error(f"Close order for {coin} rejected: {status.get('error', status)}")
 
-        logger.info(f"✅ Position {symbol} closed successfully")
+        self._invalidate_user_state()
+        return placed
 
     def _check_circuit_breakers(self) -> bool:
         """
@@ -435,7 +901,7 @@ class HyperliquidTestnetTrader:
             True if trading can continue, False if breakers triggered
         """
         # Reset circuit breakers at midnight (new trading day)
-        today = datetime.now().date()
+        today = self._now().date()
         if today != self._circuit_breaker_date:
             logger.info(f"📅 New trading day ({today}): Resetting circuit breakers")
             self._circuit_breaker_date = today
@@ -447,8 +913,32 @@ class HyperliquidTestnetTrader:
             return False
 
         # 1. Check drawdown limit
-        current_balance = self._get_portfolio_value()
+        if not self._check_drawdown(self._get_equity()):
+            return False
+
+        # 2. Check trade count limit (TODAY only, not all history)
+        today_trades = self._count_today_trades()
+        if today_trades > self.max_daily_trades:
+            logger.critical(
+                f"🛑 CIRCUIT BREAKER TRIGGERED! Today's trade count {today_trades} > "
+                f"{self.max_daily_trades}"
+            )
+            self.circuit_breaker_triggered = True
+            self.stop()
+            return False
+
+        return True
+
+    def _check_drawdown(self, current_balance: float) -> bool:
+        """
+        Trigger the circuit breaker if drawdown exceeds the daily limit.
+
+        Args:
+            current_balance: Current portfolio value in USD
 
+        Returns:
+            True if trading can continue, False if the breaker triggered
+        """
         # Prevent division by zero
         if self.starting_balance > 0:
             drawdown = (self.starting_balance - current_balance) / self.starting_balance
@@ -468,40 +958,132 @@ class HyperliquidTestnetTrader:
             self.stop()
             return False
 
-        # 2. Check trade count limit (TODAY only, not all history)
-        today_trades = self._count_today_trades()
-        if today_trades > self.max_daily_trades:
-            logger.critical(
-                f"🛑 CIRCUIT BREAKER TRIGGERED! Today's trade count {today_trades} > "
-                f"{self.max_daily_trades}"
-            )
-            self.circuit_breaker_triggered = True
-            self.stop()
-            return False
-
         return True
 
+    def _get_equity(self) -> float:
+        """
+        Get the portfolio value for the drawdown check.
+
+        Between reconciliations the value is moved by events instead of
+        re-read: _monitor_positions applies each change in unrealized P&L
+        and _close_positions swaps it for the realized P&L. It is reset from
+        _get_portfolio_value() (a REST call outside simulation mode) on first
+        use and then every EQUITY_RECONCILE_CHECKS calls.
+
+        Returns:
+            Portfolio value in USD
+        """
+        if self._current_equity is None or self._equity_checks >= EQUITY_RECONCILE_CHECKS:
+            self._current_equity = self._get_portfolio_value()
+            self._equity_checks = 0
+        self._equity_checks += 1
+        return self._current_equity
+
     def _count_today_trades(self) -> int:
         """Count trades executed today only."""
-        today = datetime.now().date()
-        count = 0
-        for trade in self.trade_history:
-            trade_time = trade.get("timestamp")
-            if trade_time:
-                # Handle both datetime and string timestamps
-                if isinstance(trade_time, str):
-                    try:
-                        trade_date = datetime.fromisoformat(trade_time).date()
-                    except ValueError:
-                        continue
-                elif hasattr(trade_time, 'date'):
-                    trade_date = trade_time.date()
-                else:
-                    continue
+        if self._today_date != self._now().date():
+            return 0
+        return self._today_trade_count
+
+    def _init_trade_counters(self, trades: list[dict] | None = None):
+        """
+        Initialize the streak, daily trade and realized P&L counters from loaded history.
+
+        Also indexes the OPEN trade of each symbol. Counters and index are
+        then kept up to date as trades open and close, so neither the
+        per-iteration checks nor closing a position rescan the trade history.
+
+        Args:
+            trades: Full trade history, oldest first (defaults to the in-memory
+                window, which may have dropped older trades)
+        """
+        if trades is None:
+            trades = self.trade_history
+
+        self._consec_wins = 0
+        self._consec_losses = 0
+        self._realized_pnl = 0.0
+        self._today_date = datetime.now().date()
+        self._today_trade_count = 0
+        self._open_trade_index = {}
+
+        for trade in trades:
+            pnl = trade.get("pnl")
+            if pnl is not None:
+                self._record_closed_pnl(pnl)
+            if trade.get("status") == "OPEN":
+                self._open_trade_index[trade.get("symbol")] = trade
+            elif trade.get("status") == "CLOSED":
+                self._realized_pnl += trade.get("pnl", 0.0)
+
+        # History is appended chronologically, so today's trades form its tail:
+        # walk back from the newest and stop at the first earlier day instead
+        # of parsing every timestamp in the history
+        for trade in reversed(trades):
+            trade_date = self._trade_date(trade)
+            if trade_date is None:
+                continue
+            if trade_date < self._today_date:
+                break
+            if trade_date == self._today_date:
+                self._today_trade_count += 1
+
+    @staticmethod
+    def _trade_date(trade: dict):
+        """Return the date a trade was opened, or None if it has no usable timestamp."""
+        trade_time = trade.get("timestamp")
+        if not trade_time:
+            return None
+        # Handle both datetime and string timestamps
+        if isinstance(trade_time, str):
+            try:
+                return datetime.fromisoformat(trade_time).date()
+            except ValueError:
+                return None
+        if hasattr(trade_time, "date"):
+            return trade_time.date()
+        return None
+
+    def _record_closed_pnl(self, pnl: float):
+        """Update the win/loss streaks with a closed trade's P&L."""
+        if pnl > 0:
+            self._consec_wins += 1
+            self._consec_losses = 0
+        elif pnl < 0:
+            self._consec_losses += 1
+            self._consec_wins = 0
+        else:
+            self._consec_wins = 0
+            self._consec_losses = 0
+
+    def _record_opened_trade(self, trade_date):
+        """Count a newly opened trade towards its day's total."""
+        if trade_date != self._today_date:
+            self._today_date = trade_date
+            self._today_trade_count = 0
+        self._today_trade_count += 1
+
+    def _size_decimals(self, symbol: str) -> int:
+        """
+        Get the number of size decimals the exchange allows for a coin.
+
+        The exchange metadata is requested once and kept; if the request
+        fails it is retried on the next call.
 
-                if trade_date == today:
-                    count += 1
-        return count
+        Args:
+            symbol: Asset symbol (e.g., 'BTC')
+
+        Returns:
+            Decimal places of the coin's size step
+        """
+        if self._sz_decimals is None:
+            try:
+                universe = self.info.meta()["universe"]
+                self._sz_decimals = {asset["name"]: int(asset["szDecimals"]) for asset in universe}
+            except Exception as e:
+                logger.warning("Failed to fetch asset metadata: %s", e)
+                return DEFAULT_SIZE_DECIMALS
+        return self._sz_decimals.get(symbol, DEFAULT_SIZE_DECIMALS)
 
     def _round_to_tick_size(self, symbol: str, price: float) -> float:
         """
@@ -516,48 +1098,32 @@ class HyperliquidTestnetTrader:
         Returns:
             Price rounded to valid tick size
         """
-        # Tick sizes based on Hyperliquid requirements (as of 2026-01)
-        # See: https://hyperliquid.gitbook.io/hyperliquid-docs
-        tick_sizes = {
-            "BTC": 1,        # BTC: integer prices only
-            "ETH": 0.1,      # ETH: 0.1 precision
-            "SOL": 0.01,     # SOL: 0.01 precision
-            "AVAX": 0.01,
-            "DOGE": 0.00001,
-            "XRP": 0.0001,
-            "MATIC": 0.0001,
-            "LINK": 0.01,
-            "ARB": 0.0001,
-            "OP": 0.001,
-        }
-
-        tick_size = tick_sizes.get(symbol, 0.01)  # Default to 0.01
-
-        if tick_size >= 1:
+        precision = _TICK_PRECISION.get(symbol, _DEFAULT_TICK_PRECISION)
+        if precision == 0:
             return round(price)
-        else:
-            # Round to tick size precision
-            precision = len(str(tick_size).split('.')[-1])
-            return round(price, precision)
+        return round(price, precision)
 
-    @sleep_and_retry
-    @limits(calls=5, period=1)  # Max 5 order placements per second
-    def _place_order(self, signal: Signal, size: float):
+    def _place_order(self, signal: Signal, size: float, prices: dict[str, float] | None = None):
         """
         Place order on Hyperliquid.
 
         Args:
             signal: Trading signal
             size: Position size in base currency
+            prices: Prices already fetched this iteration (fetched here if None)
         """
+        self._order_rate_limit.acquire()
         try:
             symbol = self.config.default_symbol
             is_buy = signal.direction == 1
 
             # Get current market price for limit order
-            current_price = self.fetcher.get_current_price(symbol)
+            if prices is not None and symbol in prices:
+                current_price = prices[symbol]
+            else:
+                current_price = self.fetcher.get_current_price(symbol)
             if current_price <= 0:
-                logger.error(f"Invalid price for {symbol}")
+                logger.error("Invalid price for %s", symbol)
                 return
 
             # Calculate limit price (slightly better than market)
@@ -572,11 +1138,14 @@ class HyperliquidTestnetTrader:
 
             # Round size to avoid float_to_wire rounding errors
             # Hyperliquid typically accepts up to 5 decimal places for size
-            size = round(size, 5)
+            size = round(size, DEFAULT_SIZE_DECIMALS)
 
             logger.info(
-                f"Placing order: {symbol} {'BUY' if is_buy else 'SELL'} "
-                f"{size:.4f} @ {limit_price:.2f}"
+                "Placing order: %s %s %.4f @ %.2f",
+                symbol,
+                "BUY" if is_buy else "SELL",
+                size,
+                limit_price,
             )
 
             # Place order
@@ -584,28 +1153,28 @@ class HyperliquidTestnetTrader:
                 symbol, is_buy, size, limit_price, {"limit": {"tif": "Gtc"}}  # Good-til-canceled
             )
 
-            logger.info(f"Order placed: {order}")
+            logger.info("Order placed: %s", order)
+            self._invalidate_user_state()
 
             # Only track position and record trade if order was successful
             if order.get('status') == 'ok':
-                # Track position
+                now = self._now()
+
+                # Track position (persisted, so plain values only)
                 position_data = {
-                    "signal": signal,
+                    "direction": signal.direction,
                     "size": size,
                     "entry_price": limit_price,
                     "stop_loss": signal.stop_loss,
                     "take_profit": signal.take_profit,
-                    "timestamp": datetime.now(),
-                    "order": order,
+                    "timestamp": now,
                 }
                 self.open_positions[symbol] = position_data
-
-                # Save position to state manager (persists to disk)
-                self.state_manager.save_position(symbol, position_data)
+                self._live_signals[symbol] = signal
 
                 # Record trade
                 trade_data = {
-                    "timestamp": datetime.now(),
+                    "timestamp": now,
                     "symbol": symbol,
                     "direction": "LONG" if is_buy else "SHORT",
                     "size": size,
@@ -615,36 +1184,87 @@ class HyperliquidTestnetTrader:
                     "status": "OPEN",
                 }
                 self.trade_history.append(trade_data)
-
-                # Save trade to state manager (persists to disk)
-                self.state_manager.save_trade(trade_data)
+                self._open_trade_index[symbol] = trade_data
+                self._record_opened_trade(trade_data["timestamp"].date())
+
+                # Save position and trade to state manager (one write to disk)
+                with self.state_manager.batch():
+                    self.state_manager.save_position(symbol, position_data)
+                    self.state_manager.save_trade(trade_data)
+                    # Concurrent-position peak for reports (live.cli report)
+                    peak = self.state_manager.get_metadata("max_concurrent_positions", 0)
+                    if len(self.open_positions) > peak:
+                        self.state_manager.save_metadata(
+                            "max_concurrent_positions", len(self.open_positions)
+                        )
             else:
-                logger.debug(f"Order failed, not tracking position: {order.get('response', 'Unknown error')}")
+                logger.debug(
+                    "Order failed, not tracking position: %s",
+                    order.get('response', 'Unknown error'),
+                )
 
         except Exception as e:
-            error_msg = str(e).lower()
-
             # Categorize the error
-            critical_keywords = ["invalid", "unauthorized", "forbidden", "insufficient", "locked"]
-            transient_keywords = [
-                "timeout",
-                "connection",
-                "network",
-                "temporary",
-                "rate limit",
-                "unavailable",
-            ]
-
-            if any(keyword in error_msg for keyword in critical_keywords):
+            error_type = _classify_error(e)
+            if error_type is CriticalError:
                 raise CriticalError(f"Order placement failed (critical): {e}")
-            elif any(keyword in error_msg for keyword in transient_keywords):
+            elif error_type is TransientError:
                 raise TransientError(f"Order placement failed (transient): {e}")
             else:
                 # Unknown error - log but don't stop trading
-                logger.error(f"Order placement failed (unknown): {e}", exc_info=True)
+                logger.error("Order placement failed (unknown): %s", e, exc_info=True)
+
+    def _share_http_session(self):
+        """
+        Route the Info and Exchange clients through the fetcher's HTTP session.
+
+        Each SDK client otherwise opens its own requests.Session, i.e. its own
+        keep-alive connection (and TLS handshake) to the same host. The
+        fetcher's session already has a sized connection pool.
+        """
+        session = self.fetcher.info.session
+        for client in (self.info, self.exchange):
+            if client.session is not session:
+                client.session.close()
+                client.session = session
+
+    def _fetch_user_state(self) -> dict:
+        """Fetch the account state from Hyperliquid (one REST round-trip)."""
+        return self.info.user_state(self.wallet.address)
+
+    def _get_user_state(self) -> dict:
+        """
+        Get the account state, reusing a response younger than the TTL.
+
+        The circuit breaker, position sizing and exchange sync all read the
+        account state within the same iteration; sharing one response saves a
+        Hyperliquid round-trip per caller.
+
+        When the request budget is spent, the expired response is served
+        instead of sleeping on the rate limit, so the circuit breaker check
+        never stalls the loop; only a cold cache waits for a token.
+
+        Returns:
+            Raw ``user_state`` response
+        """
+        now = time.monotonic()
+        if self._user_state_cache is not None:
+            user_state, fetched_at = self._user_state_cache
+            if now - fetched_at < self._user_state_ttl:
+                return user_state
+            if self._user_state_rate_limit.try_acquire() > 0:
+                return user_state
+        else:
+            self._user_state_rate_limit.acquire()
+
+        user_state = self._fetch_user_state()
+        self._user_state_cache = (user_state, now)
+        return user_state
+
+    def _invalidate_user_state(self) -> None:
+        """Drop the cached account state after an order changes it."""
+        self._user_state_cache = None
 
-    @sleep_and_retry
-    @limits(calls=10, period=1)  # Max 10 portfolio value checks per second
     def _get_actual_portfolio_value(self) -> float:
         """
         Get current portfolio value from Hyperliquid account.
@@ -654,7 +1274,7 @@ class HyperliquidTestnetTrader:
         """
         try:
             # Get account state from Hyperliquid
-            user_state = self.info.user_state(self.wallet.address)
+            user_state = self._get_user_state()
 
             # Extract account value
             # Testnet starts with 100,000 USDT
@@ -664,12 +1284,8 @@ class HyperliquidTestnetTrader:
             return account_value
 
         except Exception as e:
-            error_msg = str(e).lower()
-
             # Categorize the error
-            transient_keywords = ["timeout", "connection", "network", "temporary", "unavailable"]
-
-            if any(keyword in error_msg for keyword in transient_keywords):
+            if _classify_error(e) is TransientError:
                 # Transient error - use cached value or default
                 logger.warning(f"Transient error fetching portfolio value: {e}")
                 return 100000  # Default testnet starting balance
@@ -693,10 +1309,8 @@ class HyperliquidTestnetTrader:
             # Each position tracks unrealized P&L
             value += position.get("unrealized_pnl", 0.0)
 
-        # Add realized P&L from closed trades
-        for trade in self.trade_history:
-            if trade.get("status") == "closed":
-                value += trade.get("pnl", 0.0)
+        # Add realized P&L from closed trades (kept as a running total)
+        value += self._realized_pnl
 
         return max(0.0, value)
 
@@ -713,45 +1327,71 @@ class HyperliquidTestnetTrader:
         else:
             return self._get_actual_portfolio_value()
 
-    def _calculate_atr(self, data) -> float:
-        """Calculate current ATR (Average True Range)."""
-        # Use the strategy instance we already have
-        atr = self.strategy._calculate_atr(data, period=14)
-        if atr.empty:
+    def _calculate_atr(self, data, symbol: str | None = None, period: int = 14) -> float:
+        """
+        Calculate current ATR (Average True Range).
+
+        Iterations within one candle see the same bars, so the result is
+        cached by symbol, period and last bar (timestamp plus its
+        high/low/close, which still move while the candle is open).
+
+        Args:
+            data: OHLCV DataFrame indexed by timestamp
+            symbol: Symbol the data belongs to (default: config.default_symbol)
+            period: ATR period
+
+        Returns:
+            Latest ATR value (0.0 if it cannot be computed)
+        """
+        if data.empty:
             return 0.0
-        return float(atr.iloc[-1])
 
-    def _calculate_baseline_atr(self, data) -> float:
+        last = data.iloc[-1]
+        key = (
+            symbol or self.config.default_symbol,
+            period,
+            data.index[-1],
+            last["high"],
+            last["low"],
+            last["close"],
+        )
+        cached = self._atr_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Use the strategy instance we already have. The latest value only
+        # depends on the last `period` true ranges, i.e. the last period + 1 bars.
+        atr = self.strategy._calculate_atr(data.iloc[-(period + 1) :], period=period)
+        value = 0.0 if atr.empty or pd.isna(atr.iloc[-1]) else float(atr.iloc[-1])
+
+        if len(self._atr_cache) >= ATR_CACHE_SIZE:
+            self._atr_cache.pop(next(iter(self._atr_cache)))
+        self._atr_cache[key] = value
+        return value
+
+    def _calculate_baseline_atr(self, data, symbol: str | None = None) -> float:
         """Calculate baseline ATR (50-period average)."""
-        return self._calculate_atr(data)  # Simplified for now
+        return self._calculate_atr(data, symbol, period=BASELINE_ATR_PERIOD)
 
     def _count_consecutive_wins(self) -> int:
         """Count consecutive winning trades."""
-        count = 0
-        for trade in reversed(self.trade_history):
-            if trade.get("pnl", 0) > 0:
-                count += 1
-            else:
-                break
-        return count
+        return self._consec_wins
 
     def _count_consecutive_losses(self) -> int:
         """Count consecutive losing trades."""
-        count = 0
-        for trade in reversed(self.trade_history):
-            if trade.get("pnl", 0) < 0:
-                count += 1
-            else:
-                break
-        return count
+        return self._consec_losses
 
     def stop(self):
         """Stop trading loop."""
         self.is_running = False
+        self._stop_price_stream()
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
         logger.info("Testnet trader stopped")
 
-        # Force save state before stopping
-        self.state_manager.force_save()
+        # Flush pending updates and save state before stopping
+        self.state_manager.close()
         logger.info("State saved to disk")
 
         # Print summary
@@ -759,12 +1399,16 @@ class HyperliquidTestnetTrader:
 
     def _print_summary(self):
         """Print trading session summary."""
+        # The stats and balance lookup only feed INFO lines
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         logger.info("=" * 50)
         logger.info("TRADING SESSION SUMMARY")
         logger.info("=" * 50)
-        logger.info(f"Total trades: {len(self.trade_history)}")
-        logger.info(f"Open positions: {len(self.open_positions)}")
-        logger.info(f"Final portfolio value: ${self._get_portfolio_value():,.2f}")
+        logger.info("Total trades: %d", self.state_manager.get_stats()["total_trades"])
+        logger.info("Open positions: %d", len(self.open_positions))
+        logger.info("Final portfolio value: $%.2f", self._get_portfolio_value())
         logger.info("=" * 50)
 
     def _sync_positions_with_exchange(self):
@@ -786,50 +1430,50 @@ class HyperliquidTestnetTrader:
             logger.info("Syncing positions with exchange...")
 
             # Get current positions from exchange
-            user_state = self.info.user_state(self.wallet.address)
+            user_state = self._get_user_state()
             exchange_positions = user_state.get('assetPositions', [])
 
             # Build lookup of exchange positions by symbol
-            exchange_pos_map = {}
+            exchange_pos_map: dict[str, _ExchangePosition] = {}
             for asset_pos in exchange_positions:
                 pos = asset_pos.get('position', {})
                 coin = pos.get('coin')
                 size = float(pos.get('szi', 0))
 
                 if coin and size != 0:
-                    exchange_pos_map[coin] = {
-                        'size': size,
-                        'entry_price': float(pos.get('entryPx', 0)),
-                        'unrealized_pnl': float(pos.get('unrealizedPnl', 0)),
-                        'position_value': float(pos.get('positionValue', 0)),
-                        'margin_used': float(pos.get('marginUsed', 0)),
-                        'leverage': pos.get('leverage', {}),
-                    }
-
-            # Get local positions
-            local_symbols = set(self.open_positions.keys())
-            exchange_symbols = set(exchange_pos_map.keys())
+                    exchange_pos_map[coin] = _ExchangePosition(
+                        size=size,
+                        entry_price=float(pos.get('entryPx', 0)),
+                        unrealized_pnl=float(pos.get('unrealizedPnl', 0)),
+                        raw=pos,
+                    )
 
-            # Detect discrepancies
-            missing_in_state = exchange_symbols - local_symbols
-            extra_in_state = local_symbols - exchange_symbols
+            # Detect discrepancies: one pass over each side, in a stable order
+            missing_in_state = []
+            common_symbols = []
+            for symbol in exchange_pos_map:
+                if symbol in self.open_positions:
+                    common_symbols.append(symbol)
+                else:
+                    missing_in_state.append(symbol)
+            extra_in_state = [s for s in self.open_positions if s not in exchange_pos_map]
 
-            # Log discrepancies
-            if missing_in_state or extra_in_state:
+            # Log discrepancies (the report is only built when warnings are shown)
+            if (missing_in_state or extra_in_state) and logger.isEnabledFor(logging.WARNING):
                 logger.warning("⚠️  POSITION SYNC DISCREPANCY DETECTED")
                 logger.warning("=" * 60)
 
                 if missing_in_state:
-                    logger.warning(f"❌ Exchange has positions NOT in local state:")
+                    logger.warning("❌ Exchange has positions NOT in local state:")
                     for symbol in missing_in_state:
                         pos = exchange_pos_map[symbol]
                         logger.warning(
-                            f"   {symbol}: {pos['size']:+.5f} @ ${pos['entry_price']:,.2f} "
-                            f"(P&L: ${pos['unrealized_pnl']:+.2f})"
+                            f"   {symbol}: {pos.size:+.5f} @ ${pos.entry_price:,.2f} "
+                            f"(P&L: ${pos.unrealized_pnl:+.2f})"
                         )
 
                 if extra_in_state:
-                    logger.warning(f"❌ Local state has positions NOT on exchange:")
+                    logger.warning("❌ Local state has positions NOT on exchange:")
                     for symbol in extra_in_state:
                         pos = self.open_positions[symbol]
                         logger.warning(
@@ -840,66 +1484,78 @@ class HyperliquidTestnetTrader:
                 logger.warning("=" * 60)
                 logger.warning("🔧 Syncing local state to match exchange (source of truth)...")
 
-            # Remove positions that don't exist on exchange
-            for symbol in extra_in_state:
-                logger.info(f"Removing {symbol} from local state (not on exchange)")
-                del self.open_positions[symbol]
-                self.state_manager.remove_position(symbol)
-
-            # Add positions that exist on exchange but not in state
-            for symbol in missing_in_state:
-                exchange_pos = exchange_pos_map[symbol]
-                logger.warning(
-                    f"⚠️  Adding {symbol} to local state from exchange: "
-                    f"{exchange_pos['size']:+.5f} @ ${exchange_pos['entry_price']:,.2f}"
-                )
+            # Apply all corrections with a single state write
+            with self.state_manager.batch():
+                # Remove positions that don't exist on exchange
+                for symbol in extra_in_state:
+                    logger.info("Removing %s from local state (not on exchange)", symbol)
+                    del self.open_positions[symbol]
+                    self._live_signals.pop(symbol, None)
+                    self.state_manager.remove_position(symbol)
+
+                # Add positions that exist on exchange but not in state
+                for symbol in missing_in_state:
+                    exchange_pos = exchange_pos_map[symbol]
+                    logger.warning(
+                        "⚠️  Adding %s to local state from exchange: %+.5f @ $%.2f",
+                        symbol,
+                        exchange_pos.size,
+                        exchange_pos.entry_price,
+                    )
 
-                # Create position data matching our internal structure
-                # Note: We don't have the original signal, so create minimal data
-                position_data = {
-                    "signal": None,  # Unknown - position predates this session
-                    "size": abs(exchange_pos['size']),  # Store as positive, track direction separately
-                    "entry_price": exchange_pos['entry_price'],
-                    "stop_loss": None,  # User set manually
-                    "take_profit": None,  # User set manually
-                    "timestamp": datetime.now(),  # Current time (actual entry time unknown)
-                    "synced_from_exchange": True,  # Flag to indicate this was synced
-                    "exchange_data": exchange_pos,  # Store full exchange data for reference
-                }
+                    # Create position data matching our internal structure
+                    # Note: We don't have the original signal, so create minimal data
+                    position_data = {
+                        "direction": 1 if exchange_pos.size > 0 else -1,
+                        # Store as positive, track direction separately
+                        "size": abs(exchange_pos.size),
+                        "entry_price": exchange_pos.entry_price,
+                        "stop_loss": None,  # User set manually
+                        "take_profit": None,  # User set manually
+                        "timestamp": datetime.now(),  # Current time (actual entry time unknown)
+                        "synced_from_exchange": True,  # Flag to indicate this was synced
+                        "exchange_data": exchange_pos.raw,  # Exchange's own record, for reference
+                    }
 
-                self.open_positions[symbol] = position_data
-                self.state_manager.save_position(symbol, position_data)
+                    self.open_positions[symbol] = position_data
+                    self.state_manager.save_position(symbol, position_data)
 
-                logger.info(
-                    f"✅ Synced {symbol}: size={exchange_pos['size']:+.5f}, "
-                    f"entry=${exchange_pos['entry_price']:,.2f}, "
-                    f"pnl=${exchange_pos['unrealized_pnl']:+.2f}"
-                )
+                    logger.info(
+                        "✅ Synced %s: size=%+.5f, entry=$%.2f, pnl=$%+.2f",
+                        symbol,
+                        exchange_pos.size,
+                        exchange_pos.entry_price,
+                        exchange_pos.unrealized_pnl,
+                    )
 
-            # Compare sizes for positions that exist in both
-            common_symbols = local_symbols & exchange_symbols
-            for symbol in common_symbols:
-                local_size = self.open_positions[symbol].get('size', 0)
-                exchange_size = abs(exchange_pos_map[symbol]['size'])
+                # Compare sizes for positions that exist in both, in whole size steps
+                for symbol in common_symbols:
+                    local_size = self.open_positions[symbol].get('size', 0)
+                    exchange_size = abs(exchange_pos_map[symbol].size)
+                    steps_per_unit = 10 ** self._size_decimals(symbol)
 
-                if abs(local_size - exchange_size) > 0.0001:  # Allow for rounding
-                    logger.warning(
-                        f"⚠️  Size mismatch for {symbol}: "
-                        f"local={local_size:.5f}, exchange={exchange_size:.5f}"
-                    )
-                    logger.warning(f"   Updating local state to match exchange")
+                    if round(local_size * steps_per_unit) != round(exchange_size * steps_per_unit):
+                        logger.warning(
+                            "⚠️  Size mismatch for %s: local=%.5f, exchange=%.5f",
+                            symbol,
+                            local_size,
+                            exchange_size,
+                        )
+                        logger.warning("   Updating local state to match exchange")
 
-                    # Update position size to match exchange
-                    self.open_positions[symbol]['size'] = exchange_size
-                    self.state_manager.save_position(symbol, self.open_positions[symbol])
+                        # Update position size to match exchange
+                        self.open_positions[symbol]['size'] = exchange_size
+                        self.state_manager.save_position(symbol, self.open_positions[symbol])
 
             # Summary
             if exchange_positions:
-                logger.info(f"✅ Position sync complete: {len(exchange_pos_map)} positions tracked")
+                logger.info(
+                    "✅ Position sync complete: %d positions tracked", len(exchange_pos_map)
+                )
             else:
                 logger.info("✅ Position sync complete: No open positions on exchange")
 
         except Exception as e:
             # Don't fail initialization if sync fails - log and continue
-            logger.error(f"Failed to sync positions with exchange: {e}", exc_info=True)
+            logger.error("Failed to sync positions with exchange: %s", e, exc_info=True)
             logger.warning("Continuing with local state (may be out of sync with exchange)")
@@ -1,13 +1,11 @@
 """Hyperliquid mainnet live trading."""
 
 import logging
-from datetime import datetime
 
 from hyperliquid.utils import constants
 
 from live.hl_integration.config import HyperliquidConfig
 from live.hl_integration.testnet import HyperliquidTestnetTrader
-from live.state_manager import StateManager
 from strategies.base import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -27,6 +25,8 @@ class HyperliquidTrader(HyperliquidTestnetTrader):
     Inherits from TestnetTrader (same logic, different network).
     """
 
+    NETWORK = "mainnet"
+
     def __init__(
         self,
         config: HyperliquidConfig,
@@ -64,71 +64,38 @@ class HyperliquidTrader(HyperliquidTestnetTrader):
             if confirmation != "CONFIRM":
                 raise RuntimeError("Mainnet trading not confirmed")
 
-        # Initialize parent class (TestnetTrader logic)
-        config.validate()
-
-        self.config = config
-        self.strategy = strategy
-        self.simulation_mode = False  # Mainnet is never simulation
-
-        # Setup wallet
-        from eth_account import Account
-
-        self.wallet = Account.from_key(config.private_key)
-        logger.info(f"Mainnet wallet address: {self.wallet.address}")
-
-        # Initialize Hyperliquid clients (MAINNET!)
-        from hyperliquid.exchange import Exchange
-        from hyperliquid.info import Info
-
-        self.info = Info(constants.MAINNET_API_URL, skip_ws=True)
-        self.exchange = Exchange(self.wallet, constants.MAINNET_API_URL)
-
-        # Initialize data fetcher
-        from data.hyperliquid_fetcher import HyperliquidFetcher
-
-        self.fetcher = HyperliquidFetcher(network="mainnet")
+        super().__init__(
+            config,
+            strategy,
+            state_file=state_file,
+            api_url=constants.MAINNET_API_URL,
+            backup_count=10,
+            flush_interval=None,  # Write every change synchronously (CRITICAL for mainnet)
+        )
 
-        # Risk parameters
-        from risk.position_sizing import RiskParameters
+        # Mainnet-specific: Tighter circuit breakers
+        self.max_daily_drawdown = 0.10  # Stop if down 10% (stricter than testnet)
+        self.max_daily_trades = 20  # Fewer trades on mainnet
 
-        self.risk_params = RiskParameters(
-            base_risk_percent=config.base_risk_percent,
-            max_position_percent=config.max_position_percent,
-            min_confidence=config.min_confidence,
+        logger.warning("Starting balance: $%.2f", self.starting_balance)
+        logger.warning(
+            "Mainnet circuit breakers: max_drawdown=%.1f%%, max_trades=%d",
+            self.max_daily_drawdown * 100,
+            self.max_daily_trades,
         )
 
-        # Initialize state manager (CRITICAL for mainnet - must persist!)
-        self.state_manager = StateManager(state_file=state_file, auto_save=True, backup_count=10)
-
-        # Load state from previous session
-        self.open_positions: dict = self.state_manager.load_positions()
-        self.trade_history: list[dict] = self.state_manager.load_trade_history()
-        self.is_running = False
+    def _init_starting_balance(self):
+        """Set (or resume) the starting balance from the real account (never simulated)."""
+        self.simulation_mode = False  # Mainnet is never simulation
 
-        # Set starting balance
         if self.state_manager.get_starting_balance() == 0:
             portfolio_value = self._get_actual_portfolio_value()
             self.state_manager.set_starting_balance(portfolio_value)
             self.starting_balance = portfolio_value
-            logger.info(f"Set starting balance: ${portfolio_value:,.2f}")
+            logger.info("Set starting balance: $%.2f", portfolio_value)
         else:
             self.starting_balance = self.state_manager.get_starting_balance()
-            logger.info(f"Resumed session with starting balance: ${self.starting_balance:,.2f}")
-
-        # Mainnet-specific: Tighter circuit breakers
-        self.max_daily_drawdown = 0.10  # Stop if down 10% (stricter than testnet)
-        self.max_daily_trades = 20  # Fewer trades on mainnet
-        self.circuit_breaker_triggered = False
-        self._circuit_breaker_date = datetime.now().date()
-
-        # Sync positions with exchange
-        self._sync_positions_with_exchange()
-
-        logger.info("HyperliquidTrader initialized (MAINNET)")
-        logger.warning(f"Starting balance: ${self.starting_balance:,.2f}")
-        if self.open_positions:
-            logger.warning(f"Loaded {len(self.open_positions)} open positions from previous session")
+            logger.info("Resumed session with starting balance: $%.2f", self.starting_balance)
 
     def _trading_iteration(self):
         """Single iteration of trading loop with mainnet safeguards."""
@@ -142,21 +109,25 @@ class HyperliquidTrader(HyperliquidTestnetTrader):
         # Force save state before printing summary
         self.state_manager.force_save()
 
-        current_balance = self._get_portfolio_value()
-        pnl = current_balance - self.starting_balance
-        pnl_pct = (pnl / self.starting_balance * 100) if self.starting_balance > 0 else 0
-
-        logger.info("=" * 50)
-        logger.info("⚠️  MAINNET TRADING SESSION SUMMARY ⚠️")
-        logger.info("=" * 50)
-        logger.info(f"Starting balance: ${self.starting_balance:,.2f}")
-        logger.info(f"Final balance: ${current_balance:,.2f}")
-        logger.info(f"P&L: ${pnl:,.2f} ({pnl_pct:.2f}%)")
-        logger.info(f"Total trades: {len(self.trade_history)}")
-        logger.info(f"Open positions: {len(self.open_positions)}")
+        # The balance lookup and stats only feed INFO lines
+        if logger.isEnabledFor(logging.INFO):
+            current_balance = self._get_portfolio_value()
+            pnl = current_balance - self.starting_balance
+            pnl_pct = (pnl / self.starting_balance * 100) if self.starting_balance > 0 else 0
+
+            logger.info("=" * 50)
+            logger.info("⚠️  MAINNET TRADING SESSION SUMMARY ⚠️")
+            logger.info("=" * 50)
+            logger.info("Starting balance: $%.2f", self.starting_balance)
+            logger.info("Final balance: $%.2f", current_balance)
+            logger.info("P&L: $%.2f (%.2f%%)", pnl, pnl_pct)
+            logger.info("Total trades: %d", self.state_manager.get_stats()["total_trades"])
+            logger.info("Open positions: %d", len(self.open_positions))
         if self.open_positions:
             logger.warning("⚠️  OPEN POSITIONS REMAIN - Manual intervention may be needed!")
             for symbol, pos in self.open_positions.items():
-                logger.warning(f"   {symbol}: {pos.get('size', 0):.4f} @ ${pos.get('entry_price', 0):,.2f}")
+                logger.warning(
+                    "   %s: %.4f @ $%.2f", symbol, pos.get("size", 0), pos.get("entry_price", 0)
+                )
         logger.info("=" * 50)
         logger.info("State saved to disk")
@@ -1,7 +1,8 @@
 """Centralized logging configuration for FractalTrader.
 
 This module provides a unified logging setup function that configures both file
-and console logging with rotation support.
+and console logging with rotation support. Records are handed to a background
+thread through a queue, so logging calls never wait on disk or console I/O.
 
 Usage:
     from live.logging_config import setup_logging
@@ -16,12 +17,30 @@ Usage:
     setup_logging(log_file=None)
 """
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
+# Background thread writing queued records to the real handlers
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the background logging thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(
     log_level: str = "INFO",
@@ -35,7 +54,9 @@ def setup_logging(
 
     Sets up logging handlers for both file and console output with consistent
     formatting across all modules. Uses rotating file handler to prevent
-    unbounded log file growth.
+    unbounded log file growth. The root logger only enqueues records; a
+    background QueueListener writes them (stopped and flushed at exit, or when
+    logging is set up again).
 
     Args:
         log_level: Log level (DEBUG/INFO/WARNING/ERROR/CRITICAL)
@@ -49,10 +70,14 @@ def setup_logging(
         >>> logger = logging.getLogger(__name__)
         >>> logger.info("Application started")
     """
-    # Clear existing handlers to prevent duplicates
+    global _listener
+
+    # Clear existing handlers (and the previous listener) to prevent duplicates
+    _stop_listener()
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
     root_logger.handlers.clear()
+    handlers: list[logging.Handler] = []
 
     # Standard format with timestamp, module name, level, and message
     formatter = logging.Formatter(
@@ -73,11 +98,17 @@ def setup_logging(
         )
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.DEBUG)  # Capture everything to file
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
 
     # Console handler (stdout)
     if console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
         console_handler.setLevel(getattr(logging, log_level.upper()))
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    if handlers:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root_logger.addHandler(QueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
@@ -7,19 +7,86 @@ Generates daily/weekly reports with key metrics:
 - Trade statistics
 """
 
+import csv
+import functools
 import json
 import logging
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Report encoding (orjson is optional, serializes in C)
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize a report to indented JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize a report to indented JSON."""
+        return json.dumps(obj, indent=2).encode()
 
-@dataclass
+
+# Trade histories at least this long use the compiled drawdown scan (if numba
+# is installed); shorter ones aren't worth the import and JIT cost
+NUMBA_MIN_TRADES = 1000
+
+
+@functools.cache
+def _compiled_max_drawdown() -> Callable[[np.ndarray, float], float] | None:
+    """
+    Build the numba-compiled drawdown scan on first use.
+
+    numba is optional and slow to import, so it's only loaded once a long
+    history needs it.
+
+    Returns:
+        Compiled ``scan(pnls, starting_balance) -> max_drawdown``, or None
+        if numba isn't installed
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True)
+    def scan(pnls, starting_balance):
+        balance = starting_balance
+        peak = starting_balance
+        max_dd = 0.0
+        for pnl in pnls:
+            balance += pnl
+            if balance > peak:
+                peak = balance
+            if peak > 0:
+                dd = (peak - balance) / peak
+                if dd > max_dd:
+                    max_dd = dd
+        return max_dd
+
+    return scan
+
+
+# ISO 8601 timestamp parser (ciso8601 is optional, parses in C)
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
-    """Trading performance metrics."""
+    """Trading performance metrics (immutable)."""
 
     # Period
     period_start: str
@@ -109,6 +176,7 @@ class PerformanceReporter:
         open_positions: dict | None = None,
         trade_history: list[dict] | None = None,
         session_start: str | None = None,
+        max_concurrent_positions: int = 0,
     ):
         """
         Initialize performance reporter.
@@ -118,12 +186,22 @@ class PerformanceReporter:
             open_positions: Dict of open positions
             trade_history: List of trades
             session_start: Session start time (ISO format)
+            max_concurrent_positions: Most positions held at once, as tracked
+                by the trader while positions open
         """
         self.starting_balance = starting_balance
-        self.open_positions = open_positions or {}
-        self.trade_history = trade_history or []
+        # Kept by reference (even when empty) so the owner's updates show up
+        self.open_positions = open_positions if open_positions is not None else {}
+        self.trade_history = trade_history if trade_history is not None else []
         self.session_start = session_start or datetime.now().isoformat()
 
+        # Most positions held at once, tracked by the trader as positions open
+        self._max_concurrent = max(max_concurrent_positions, len(self.open_positions))
+
+        # Parsed trade timestamps by ISO string (None if unparseable), so
+        # repeated reports parse each trade's timestamp once
+        self._parsed_timestamps: dict[str, datetime | None] = {}
+
     def calculate_metrics(
         self,
         current_balance: float,
@@ -143,39 +221,45 @@ class PerformanceReporter:
         """
         # Parse dates
         start_dt = datetime.fromisoformat(period_start or self.session_start)
-        end_dt = datetime.fromisoformat(period_end or datetime.now().isoformat())
+        end_dt = datetime.fromisoformat(period_end) if period_end else datetime.now()
 
         duration_hours = (end_dt - start_dt).total_seconds() / 3600
 
-        # Filter trades in period
-        trades_in_period = self._filter_trades_by_period(period_start, period_end)
+        # Trade fields as columns (one pass over the history), then the period's rows
+        all_pnls, all_confidences, timestamps = self._trade_columns()
+        in_period = self._period_mask(timestamps, period_start, period_end)
+        if in_period is None:
+            period_pnls, confidences = all_pnls, all_confidences
+        else:
+            period_pnls, confidences = all_pnls[in_period], all_confidences[in_period]
 
         # Calculate PnL
         pnl = current_balance - self.starting_balance
         pnl_percent = (pnl / self.starting_balance) if self.starting_balance > 0 else 0
 
+        # Trades without a P&L yet (NaN) are left out of the P&L statistics
+        total_trades = len(confidences)
+        pnls = period_pnls[~np.isnan(period_pnls)]
+
         # Trade statistics
-        total_trades = len(trades_in_period)
-        winning_trades = sum(1 for t in trades_in_period if t.get("pnl", 0) > 0)
-        losing_trades = sum(1 for t in trades_in_period if t.get("pnl", 0) < 0)
+        winning_trades = int(np.count_nonzero(pnls > 0))
+        losing_trades = int(np.count_nonzero(pnls < 0))
         win_rate = (winning_trades / total_trades) if total_trades > 0 else 0
 
         # Confidence statistics
-        confidences = [t.get("confidence", 50) for t in trades_in_period]
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-        min_confidence = min(confidences) if confidences else 0
-        max_confidence = max(confidences) if confidences else 0
+        avg_confidence = float(confidences.mean()) if confidences.size else 0
+        min_confidence = float(confidences.min()) if confidences.size else 0
+        max_confidence = float(confidences.max()) if confidences.size else 0
 
         # Position statistics
         open_count = len(self.open_positions)
         max_concurrent = self._calculate_max_concurrent_positions()
 
         # Risk statistics
-        max_drawdown = self._calculate_max_drawdown()
-        pnls = [t.get("pnl", 0) for t in trades_in_period if "pnl" in t]
-        avg_trade_pnl = sum(pnls) / len(pnls) if pnls else 0
-        best_trade = max(pnls) if pnls else 0
-        worst_trade = min(pnls) if pnls else 0
+        max_drawdown = self._calculate_max_drawdown(np.nan_to_num(all_pnls, nan=0.0))
+        avg_trade_pnl = float(pnls.mean()) if pnls.size else 0
+        best_trade = float(pnls.max()) if pnls.size else 0
+        worst_trade = float(pnls.min()) if pnls.size else 0
 
         return PerformanceMetrics(
             period_start=start_dt.isoformat(),
@@ -207,41 +291,39 @@ class PerformanceReporter:
         Args:
             metrics: Performance metrics to print
         """
-        print("=" * 60)
-        print("📊 TRADING PERFORMANCE REPORT")
-        print("=" * 60)
-
-        print("\n⏱️  PERIOD")
-        print(f"  Start: {metrics.period_start}")
-        print(f"  End: {metrics.period_end}")
-        print(f"  Duration: {metrics.duration_hours:.1f} hours")
-
-        print("\n💰 PORTFOLIO")
-        print(f"  Starting Balance: ${metrics.starting_balance:,.2f}")
-        print(f"  Ending Balance: ${metrics.ending_balance:,.2f}")
+        # Built in full and written at once, so other output can't interleave
+        rule = "=" * 60
         pnl_sign = "+" if metrics.pnl >= 0 else ""
-        print(f"  P&L: {pnl_sign}${metrics.pnl:,.2f} ({pnl_sign}{metrics.pnl_percent:.2%})")
-
-        print("\n📈 TRADES")
-        print(f"  Total: {metrics.total_trades}")
-        print(f"  Winning: {metrics.winning_trades} ({metrics.win_rate:.1%})")
-        print(f"  Losing: {metrics.losing_trades}")
-
-        print("\n🎯 CONFIDENCE")
-        print(f"  Average: {metrics.avg_confidence:.1f}")
-        print(f"  Range: {metrics.min_confidence:.0f} - {metrics.max_confidence:.0f}")
-
-        print("\n📊 POSITIONS")
-        print(f"  Currently Open: {metrics.open_positions}")
-        print(f"  Max Concurrent: {metrics.max_concurrent_positions}")
-
-        print("\n⚠️  RISK METRICS")
-        print(f"  Max Drawdown: {metrics.max_drawdown:.2%}")
-        print(f"  Avg Trade P&L: ${metrics.avg_trade_pnl:,.2f}")
-        print(f"  Best Trade: ${metrics.best_trade:,.2f}")
-        print(f"  Worst Trade: ${metrics.worst_trade:,.2f}")
-
-        print("=" * 60)
+        lines = [
+            rule,
+            "📊 TRADING PERFORMANCE REPORT",
+            rule,
+            "\n⏱️  PERIOD",
+            f"  Start: {metrics.period_start}",
+            f"  End: {metrics.period_end}",
+            f"  Duration: {metrics.duration_hours:.1f} hours",
+            "\n💰 PORTFOLIO",
+            f"  Starting Balance: ${metrics.starting_balance:,.2f}",
+            f"  Ending Balance: ${metrics.ending_balance:,.2f}",
+            f"  P&L: {pnl_sign}${metrics.pnl:,.2f} ({pnl_sign}{metrics.pnl_percent:.2%})",
+            "\n📈 TRADES",
+            f"  Total: {metrics.total_trades}",
+            f"  Winning: {metrics.winning_trades} ({metrics.win_rate:.1%})",
+            f"  Losing: {metrics.losing_trades}",
+            "\n🎯 CONFIDENCE",
+            f"  Average: {metrics.avg_confidence:.1f}",
+            f"  Range: {metrics.min_confidence:.0f} - {metrics.max_confidence:.0f}",
+            "\n📊 POSITIONS",
+            f"  Currently Open: {metrics.open_positions}",
+            f"  Max Concurrent: {metrics.max_concurrent_positions}",
+            "\n⚠️  RISK METRICS",
+            f"  Max Drawdown: {metrics.max_drawdown:.2%}",
+            f"  Avg Trade P&L: ${metrics.avg_trade_pnl:,.2f}",
+            f"  Best Trade: ${metrics.best_trade:,.2f}",
+            f"  Worst Trade: ${metrics.worst_trade:,.2f}",
+            rule,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def save_report(self, metrics: PerformanceMetrics, filepath: str, format: str = "json") -> None:
         """
@@ -256,9 +338,8 @@ class PerformanceReporter:
         path.parent.mkdir(parents=True, exist_ok=True)
 
         if format == "json":
-            with open(path, "w") as f:
-                json.dump(metrics.to_dict(), f, indent=2)
-            logger.info(f"Report saved to {filepath}")
+            path.write_bytes(_dumps(metrics.to_dict()))
+            logger.info("Report saved to %s", filepath)
         elif format == "csv":
             self._save_csv_report(metrics, path)
         else:
@@ -268,73 +349,126 @@ class PerformanceReporter:
         """Save report as CSV."""
         data = metrics.to_dict()
 
-        # Flatten nested dict
-        rows = []
-        for category, values in data.items():
-            for key, value in values.items():
-                rows.append(f"{category}_{key},{value}")
+        # Flatten nested dict, one row per metric
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["metric", "value"])
+            for category, values in data.items():
+                for key, value in values.items():
+                    writer.writerow([f"{category}_{key}", value])
+
+        logger.info("CSV report saved to %s", path)
 
-        with open(path, "w") as f:
-            f.write("metric,value\n")
-            f.write("\n".join(rows))
+    def _trade_columns(self) -> tuple[np.ndarray, np.ndarray, tuple]:
+        """
+        Split the trade history into per-field columns in one pass.
 
-        logger.info(f"CSV report saved to {path}")
+        The analytics only read P&L, confidence and timestamp; pulling them
+        out once lets every statistic run on contiguous arrays instead of
+        looking fields up in each trade dict again.
 
-    def _filter_trades_by_period(
-        self, period_start: str | None, period_end: str | None
-    ) -> list[dict]:
-        """Filter trades within reporting period."""
+        Returns:
+            Tuple of (pnls with NaN where a trade has no P&L yet, confidences
+            defaulting to 50, raw timestamps)
+        """
+        if not self.trade_history:
+            return np.empty(0), np.empty(0), ()
+
+        pnls, confidences, timestamps = zip(
+            *[
+                (t.get("pnl", np.nan), t.get("confidence", 50), t.get("timestamp"))
+                for t in self.trade_history
+            ],
+            strict=True,
+        )
+        return (
+            np.array(pnls, dtype=np.float64),
+            np.array(confidences, dtype=np.float64),
+            timestamps,
+        )
+
+    def _period_mask(
+        self, timestamps: tuple, period_start: str | None, period_end: str | None
+    ) -> np.ndarray | None:
+        """
+        Mark the trades within the reporting period.
+
+        Returns:
+            Boolean mask over the trades (trades without a valid timestamp are
+            excluded), or None if no period was given and every trade counts
+        """
         if not period_start and not period_end:
-            return self.trade_history
+            return None
 
         start_dt = datetime.fromisoformat(period_start or "1970-01-01")
-        end_dt = datetime.fromisoformat(period_end or datetime.now().isoformat())
+        end_dt = datetime.fromisoformat(period_end) if period_end else datetime.now()
 
-        filtered = []
-        for trade in self.trade_history:
-            trade_time_str = trade.get("timestamp")
-            if not trade_time_str:
+        mask = np.zeros(len(timestamps), dtype=bool)
+        for i, timestamp in enumerate(timestamps):
+            if not timestamp:
                 continue
 
             # Handle both datetime objects and ISO strings
-            if isinstance(trade_time_str, datetime):
-                trade_dt = trade_time_str
+            if isinstance(timestamp, datetime):
+                trade_dt = timestamp
             else:
-                try:
-                    trade_dt = datetime.fromisoformat(trade_time_str)
-                except:
+                trade_dt = self._parse_timestamp(timestamp)
+                if trade_dt is None:
                     continue
 
-            if start_dt <= trade_dt <= end_dt:
-                filtered.append(trade)
+            mask[i] = start_dt <= trade_dt <= end_dt
+
+        return mask
+
+    def _parse_timestamp(self, timestamp: Any) -> datetime | None:
+        """Parse an ISO trade timestamp once; None if it isn't valid ISO format."""
+        if not isinstance(timestamp, str):
+            return None
 
-        return filtered
+        try:
+            return self._parsed_timestamps[timestamp]
+        except KeyError:
+            pass
+
+        try:
+            parsed = _parse_iso(timestamp)
+        except ValueError:
+            parsed = None
+        self._parsed_timestamps[timestamp] = parsed
+        return parsed
 
     def _calculate_max_concurrent_positions(self) -> int:
         """Calculate maximum concurrent positions held."""
-        # Simplified: just return current open positions
-        # TODO: Track this over time for accurate max
-        return len(self.open_positions)
+        # Peak tracked as positions open; the current count covers positions
+        # opened since the peak was read
+        return max(self._max_concurrent, len(self.open_positions))
+
+    def _calculate_max_drawdown(self, pnls: np.ndarray) -> float:
+        """
+        Calculate maximum drawdown during period.
 
-    def _calculate_max_drawdown(self) -> float:
-        """Calculate maximum drawdown during period."""
+        Args:
+            pnls: P&L of every trade in the history, in order (0 if not closed)
+        """
         # Simplified: calculate from trade history
-        if not self.trade_history:
+        if not pnls.size:
             return 0.0
 
-        balance = self.starting_balance
-        peak = balance
-        max_dd = 0.0
-
-        for trade in self.trade_history:
-            pnl = trade.get("pnl", 0)
-            balance += pnl
+        # Long histories: one compiled pass with no temporary arrays
+        if len(pnls) >= NUMBA_MIN_TRADES and (scan := _compiled_max_drawdown()) is not None:
+            return float(scan(pnls, float(self.starting_balance)))
 
-            if balance > peak:
-                peak = balance
+        # Balance before the first trade and after each one, and the running peak
+        balances = self.starting_balance + np.concatenate(([0.0], pnls.cumsum()))
+        peaks = np.maximum.accumulate(balances)
 
-            dd = (peak - balance) / peak if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
-
-        return max_dd
+        # Drawdown from the peak. Peaks never fall below a positive starting
+        # balance, so only a non-positive start needs the masked division
+        # (drawdown is 0 while the peak isn't positive)
+        if self.starting_balance > 0:
+            drawdowns = (peaks - balances) / peaks
+        else:
+            drawdowns = np.divide(
+                peaks - balances, peaks, out=np.zeros_like(balances), where=peaks > 0
+            )
+        return float(drawdowns.max())
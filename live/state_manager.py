@@ -6,6 +6,12 @@ Critical for Sprint 3 success criteria: "Can stop/restart without losing state"
 
 import json
 import logging
+import os
+import threading
+import time
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
 from copy import deepcopy
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
@@ -16,6 +22,59 @@ from filelock import FileLock, Timeout
 
 logger = logging.getLogger(__name__)
 
+# Auto-saves rotate the state backups at most this often (seconds);
+# force_save() and close() always do
+BACKUP_INTERVAL = 60.0
+
+# State file encoding (orjson is optional, parses/serializes in C)
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _loads(data: bytes) -> Any:
+        """Parse state file contents."""
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize state to indented JSON."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+
+    def _dumps_line(obj: Any) -> bytes:
+        """Serialize one record as a newline-terminated JSON line."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+
+    def _loads(data: bytes) -> Any:
+        """Parse state file contents."""
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize state to indented JSON."""
+        return json.dumps(obj, indent=2).encode()
+
+    def _dumps_line(obj: Any) -> bytes:
+        """Serialize one record as a newline-terminated JSON line."""
+        return json.dumps(obj).encode() + b"\n"
+
+
+def trades_file_for(state_file: str | Path) -> Path:
+    """
+    Get the trade log path that belongs to a state file.
+
+    Trade history is kept as newline-delimited JSON next to the state file
+    (e.g. ``.testnet_state.json`` -> ``.testnet_state.trades.ndjson``) so new
+    trades are appended instead of rewriting the whole state.
+
+    Args:
+        state_file: Path to the state file
+
+    Returns:
+        Path to the trade log
+    """
+    return Path(state_file).with_suffix(".trades.ndjson")
+
 
 @dataclass
 class TradingState:
@@ -54,6 +113,7 @@ class StateManager:
 
     Features:
     - Automatic state saving
+    - Append-only trade log (``*.trades.ndjson``) next to the summary state
     - Graceful recovery from corrupted files
     - Backup rotation (keeps last N states)
     - Thread-safe operations
@@ -67,7 +127,11 @@ class StateManager:
     """
 
     def __init__(
-        self, state_file: str = ".trading_state.json", backup_count: int = 5, auto_save: bool = True
+        self,
+        state_file: str = ".trading_state.json",
+        backup_count: int = 5,
+        auto_save: bool = True,
+        flush_interval: float | None = None,
     ):
         """
         Initialize state manager.
@@ -76,10 +140,41 @@ class StateManager:
             state_file: Path to state file (relative or absolute)
             backup_count: Number of backup files to keep
             auto_save: If True, save state after each update
+            flush_interval: If set, auto-saves are coalesced and written by a
+                background thread at most once per this many seconds instead
+                of synchronously; call close() (or force_save()) to flush
         """
         self.state_file = Path(state_file)
+        self.trades_file = trades_file_for(self.state_file)
         self.backup_count = backup_count
         self.auto_save = auto_save
+        self.flush_interval = flush_interval
+
+        # Guards state against the background flusher (re-entrant: updates save)
+        self._lock = threading.RLock()
+        self._save_requested = threading.Event()
+        self._flusher_stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._last_backup: float | None = None
+
+        # Open batch() blocks, and whether an update inside them wants a save
+        self._batch_depth = 0
+        self._batch_save_pending = False
+
+        # Trades already in the trade log; a dirty log is rewritten on next save
+        self._trades_written = 0
+        self._trades_dirty = False
+
+        # Byte offset of each logged trade's line and the end of the log, so a
+        # trade changed in place is rewritten from its own line onwards only
+        self._trade_offsets: list[int] = []
+        self._trades_log_end = 0
+        self._trades_changed_from: int | None = None
+
+        # Append-only descriptor for the trade log, opened on first append and
+        # reused so each flush is a single write() (StateManager is the only writer)
+        self._trades_fd: int | None = None
+        self._trades_fd_close: weakref.finalize | None = None
 
         # Ensure parent directory exists
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
@@ -87,6 +182,11 @@ class StateManager:
         # Load existing state or create new
         self.state = self._load_or_create_state()
 
+        # Indices of OPEN trades per symbol (oldest first) so closing one needs no
+        # history scan
+        self._open_trades: dict[str, list[int]] = {}
+        self._index_open_trades()
+
         logger.info(f"StateManager initialized: {self.state_file}")
 
     def save_position(self, symbol: str, position_data: dict[str, Any]) -> None:
@@ -97,13 +197,14 @@ class StateManager:
             symbol: Trading symbol (e.g., 'BTC')
             position_data: Position information dict
         """
-        self.state.open_positions[symbol] = self._serialize_position(position_data)
-        self.state.last_updated = datetime.now().isoformat()
+        with self._lock:
+            self.state.open_positions[symbol] = self._serialize_position(position_data)
+            self.state.last_updated = datetime.now().isoformat()
 
-        if self.auto_save:
-            self._save_state()
+            if self.auto_save:
+                self._request_save()
 
-        logger.debug(f"Saved position: {symbol}")
+            logger.debug(f"Saved position: {symbol}")
 
     def remove_position(self, symbol: str) -> None:
         """
@@ -112,14 +213,15 @@ class StateManager:
         Args:
             symbol: Trading symbol to remove
         """
-        if symbol in self.state.open_positions:
-            del self.state.open_positions[symbol]
-            self.state.last_updated = datetime.now().isoformat()
+        with self._lock:
+            if symbol in self.state.open_positions:
+                del self.state.open_positions[symbol]
+                self.state.last_updated = datetime.now().isoformat()
 
-            if self.auto_save:
-                self._save_state()
+                if self.auto_save:
+                    self._request_save()
 
-            logger.debug(f"Removed position: {symbol}")
+                logger.debug(f"Removed position: {symbol}")
 
     def load_positions(self) -> dict[str, Any]:
         """
@@ -137,23 +239,34 @@ class StateManager:
         Args:
             trade_data: Trade information dict
         """
-        serialized_trade = self._serialize_trade(trade_data)
-        self.state.trade_history.append(serialized_trade)
-        self.state.last_updated = datetime.now().isoformat()
+        with self._lock:
+            serialized_trade = self._serialize_trade(trade_data)
+            self.state.trade_history.append(serialized_trade)
+            if serialized_trade.get("status") == "OPEN":
+                symbol = serialized_trade.get("symbol")
+                index = len(self.state.trade_history) - 1
+                self._open_trades.setdefault(symbol, []).append(index)
+            self.state.last_updated = datetime.now().isoformat()
 
-        if self.auto_save:
-            self._save_state()
+            if self.auto_save:
+                self._request_save()
 
-        logger.debug(f"Saved trade: {serialized_trade.get('symbol')}")
+            logger.debug(f"Saved trade: {serialized_trade.get('symbol')}")
 
-    def load_trade_history(self) -> list[dict[str, Any]]:
+    def load_trade_history(self, limit: int | None = None) -> list[dict[str, Any]]:
         """
-        Load complete trade history.
+        Load trade history.
+
+        Args:
+            limit: If set, only the most recent ``limit`` trades are returned
 
         Returns:
-            List of all trades (deep copy)
+            List of trades, oldest first (deep copy)
         """
-        return deepcopy(self.state.trade_history)
+        trades = self.state.trade_history
+        if limit is not None:
+            trades = trades[-limit:] if limit > 0 else []
+        return deepcopy(trades)
 
     def update_trade_status(self, symbol: str, **updates) -> bool:
         """
@@ -166,24 +279,35 @@ class StateManager:
         Returns:
             True if trade was found and updated, False otherwise
         """
-        for trade in reversed(self.state.trade_history):
-            if trade.get("symbol") == symbol and trade.get("status") == "OPEN":
-                # Serialize datetime objects if present
-                for key, value in updates.items():
-                    if isinstance(value, datetime):
-                        updates[key] = value.isoformat()
+        with self._lock:
+            open_trades = self._open_trades.get(symbol)
+            if not open_trades:
+                logger.warning(f"No OPEN trade found for {symbol}")
+                return False
 
-                trade.update(updates)
-                self.state.last_updated = datetime.now().isoformat()
+            index = open_trades[-1]
+            trade = self.state.trade_history[index]
 
-                if self.auto_save:
-                    self._save_state()
+            # Serialize datetime objects if present
+            for key, value in updates.items():
+                if isinstance(value, datetime):
+                    updates[key] = value.isoformat()
 
-                logger.info(f"Updated trade {symbol}: {updates}")
-                return True
+            trade.update(updates)
+            if trade.get("status") != "OPEN":
+                open_trades.pop()
+                if not open_trades:
+                    del self._open_trades[symbol]
 
-        logger.warning(f"No OPEN trade found for {symbol}")
-        return False
+            if self._trades_changed_from is None or index < self._trades_changed_from:
+                self._trades_changed_from = index
+            self.state.last_updated = datetime.now().isoformat()
+
+            if self.auto_save:
+                self._request_save()
+
+            logger.info(f"Updated trade {symbol}: {updates}")
+            return True
 
     def set_starting_balance(self, balance: float) -> None:
         """
@@ -192,14 +316,15 @@ class StateManager:
         Args:
             balance: Starting portfolio value
         """
-        self.state.starting_balance = balance
-        self.state.session_start = datetime.now().isoformat()
-        self.state.last_updated = datetime.now().isoformat()
+        with self._lock:
+            self.state.starting_balance = balance
+            self.state.session_start = datetime.now().isoformat()
+            self.state.last_updated = datetime.now().isoformat()
 
-        if self.auto_save:
-            self._save_state()
+            if self.auto_save:
+                self._request_save()
 
-        logger.info(f"Set starting balance: ${balance:,.2f}")
+            logger.info(f"Set starting balance: ${balance:,.2f}")
 
     def get_starting_balance(self) -> float:
         """
@@ -218,11 +343,12 @@ class StateManager:
             key: Metadata key
             value: Metadata value (must be JSON-serializable)
         """
-        self.state.metadata[key] = value
-        self.state.last_updated = datetime.now().isoformat()
+        with self._lock:
+            self.state.metadata[key] = value
+            self.state.last_updated = datetime.now().isoformat()
 
-        if self.auto_save:
-            self._save_state()
+            if self.auto_save:
+                self._request_save()
 
     def get_metadata(self, key: str, default: Any = None) -> Any:
         """
@@ -256,11 +382,47 @@ class StateManager:
             "starting_balance": self.state.starting_balance,
         }
 
+    @contextmanager
+    def batch(self) -> Iterator["StateManager"]:
+        """
+        Group several updates into a single save.
+
+        Auto-saves requested inside the block are deferred and issued once
+        when the outermost block exits. Blocks can be nested.
+
+        Example:
+            >>> with manager.batch():
+            ...     manager.save_position('BTC', position_data)
+            ...     manager.save_trade(trade_data)
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._batch_save_pending:
+                    self._batch_save_pending = False
+                    self._request_save()
+
     def force_save(self) -> None:
         """Force save state immediately."""
-        self._save_state()
+        self._save_requested.clear()
+        self._save_state(backup=True)
         logger.info("State saved manually")
 
+    def close(self) -> None:
+        """Stop the background flusher and save state a final time."""
+        if self._flusher is not None:
+            self._flusher_stop.set()
+            self._save_requested.set()
+            self._flusher.join()
+            self._flusher = None
+            self._flusher_stop.clear()
+
+        self.force_save()
+        self._close_trade_log()
+
     def reset_state(self, confirm: bool = False) -> None:
         """
         Reset state (clear all data).
@@ -274,15 +436,26 @@ class StateManager:
         if not confirm:
             raise ValueError("Must set confirm=True to reset state")
 
-        # Backup current state before reset
-        self._create_backup()
+        with self._lock:
+            # Backup current state before reset
+            self._create_backup()
 
-        # Create new empty state
-        self.state = TradingState()
-        self._save_state()
+            # Create new empty state
+            self.state = TradingState()
+            self._open_trades = {}
+            self._trades_dirty = True
+            self._trades_changed_from = None
+            self._save_state()
 
         logger.warning("State reset complete")
 
+    def _index_open_trades(self) -> None:
+        """Rebuild the per-symbol index of OPEN trades from the trade history."""
+        self._open_trades = {}
+        for index, trade in enumerate(self.state.trade_history):
+            if trade.get("status") == "OPEN":
+                self._open_trades.setdefault(trade.get("symbol"), []).append(index)
+
     def _load_or_create_state(self) -> TradingState:
         """Load existing state or create new one."""
         if self.state_file.exists():
@@ -291,8 +464,13 @@ class StateManager:
 
             try:
                 with lock:
-                    with open(self.state_file) as f:
-                        data = json.load(f)
+                    data = _loads(self.state_file.read_bytes())
+                    if "trade_history" in data:
+                        # Legacy single-file state: migrate trades on next save
+                        self._trades_dirty = True
+                    else:
+                        data["trade_history"] = self._load_trade_log()
+                        self._trades_written = len(data["trade_history"])
                     logger.info(f"Loaded state from {self.state_file}")
                     return TradingState.from_dict(data)
             except Timeout:
@@ -306,24 +484,69 @@ class StateManager:
                 if self._try_recover_from_backup():
                     return self._load_or_create_state()
 
-        # Create new state
+        # Create new state, keeping any trades already in the trade log
         logger.info("Creating new state")
-        return TradingState()
+        trade_history = self._load_trade_log()
+        self._trades_written = len(trade_history)
+        return TradingState(trade_history=trade_history)
+
+    def _request_save(self) -> None:
+        """Save after an update: now, or via the background flusher if enabled."""
+        if self._batch_depth:
+            self._batch_save_pending = True
+            return
+
+        if self.flush_interval is None:
+            self._save_state()
+            return
+
+        self._save_requested.set()
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="state-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Write requested saves, at most once per flush_interval."""
+        while True:
+            self._save_requested.wait()
+            if self._flusher_stop.is_set():
+                return
+            self._save_requested.clear()
+            self._save_state()
+            if self._flusher_stop.wait(self.flush_interval):
+                return
+
+    def _save_state(self, backup: bool = False) -> None:
+        """
+        Save current state to file.
 
-    def _save_state(self) -> None:
-        """Save current state to file."""
+        Args:
+            backup: Rotate the backups first even if BACKUP_INTERVAL has not
+                passed since the last rotation
+        """
         lock_file = f"{self.state_file}.lock"
         lock = FileLock(lock_file, timeout=10)
 
         try:
-            with lock:
-                # Create backup before saving
-                if self.state_file.exists():
+            with self._lock, lock:
+                # Create backup before saving (the summary itself is replaced
+                # atomically, so routine auto-saves need not copy it each time)
+                backup_due = (
+                    self._last_backup is None
+                    or time.monotonic() - self._last_backup >= BACKUP_INTERVAL
+                )
+                if self.state_file.exists() and (backup or backup_due):
                     self._create_backup()
 
-                # Write state to file
-                with open(self.state_file, "w") as f:
-                    json.dump(self.state.to_dict(), f, indent=2)
+                # Write state summary (trades live in the trade log); written to a
+                # temporary file and renamed so readers never see a partial file
+                summary = {k: v for k, v in vars(self.state).items() if k != "trade_history"}
+                tmp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+                tmp_file.write_bytes(_dumps(summary))
+                os.replace(tmp_file, self.state_file)
+                self._save_trade_log()
 
                 logger.debug(f"State saved to {self.state_file}")
         except Timeout:
@@ -331,6 +554,125 @@ class StateManager:
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
+    def _load_trade_log(self) -> list[dict[str, Any]]:
+        """Read trade history from the trade log (one JSON object per line)."""
+        self._trade_offsets = []
+        self._trades_log_end = 0
+        if not self.trades_file.exists():
+            return []
+
+        trades = []
+        offset = 0
+        for line in self.trades_file.read_bytes().splitlines(keepends=True):
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                trades.append(_loads(line))
+                self._trade_offsets.append(start)
+            except ValueError:
+                # A crash mid-append can leave a torn last line; rewrite without it
+                logger.warning(f"Skipping unreadable line in {self.trades_file}")
+                self._trades_dirty = True
+        self._trades_log_end = offset
+        return trades
+
+    def _save_trade_log(self) -> None:
+        """
+        Append new trades to the trade log, rewriting it only when needed.
+
+        Line offsets and the written-trade count only move forward once the
+        write has succeeded; if it fails, the log may be partly written or
+        truncated, so it is marked dirty and replaced in full on the next save.
+        """
+        trades = self.state.trade_history
+
+        try:
+            if self._trades_dirty or self._trades_written > len(trades):
+                # Log no longer matches the history: replace it atomically
+                data, offsets = self._encode_trades(trades, 0)
+                self._replace_trade_log(data)
+                log_end = len(data)
+            else:
+                start = self._trades_written
+                offsets = self._trade_offsets
+                log_end = self._trades_log_end
+                if self._trades_changed_from is not None and self._trades_changed_from < start:
+                    # Trades updated in place (usually the latest ones, e.g. closing
+                    # an open trade): truncate the log at the first changed line and
+                    # append from there, so earlier lines are neither read nor written
+                    start = self._trades_changed_from
+                    prefix_end = self._trade_offsets[start]
+                    tail, tail_offsets = self._encode_trades(trades[start:], prefix_end)
+                    self._open_trade_log()
+                    os.ftruncate(self._trades_fd, prefix_end)
+                    self._append_trade_log(tail)
+                    offsets = self._trade_offsets[:start] + tail_offsets
+                    log_end = prefix_end + len(tail)
+                elif start < len(trades):
+                    tail, tail_offsets = self._encode_trades(trades[start:], log_end)
+                    self._append_trade_log(tail)
+                    offsets = self._trade_offsets + tail_offsets
+                    log_end += len(tail)
+        except Exception:
+            self._trades_dirty = True
+            raise
+
+        self._trade_offsets = offsets
+        self._trades_log_end = log_end
+        self._trades_written = len(trades)
+        self._trades_dirty = False
+        self._trades_changed_from = None
+
+    def _encode_trades(self, trades: list[dict[str, Any]], offset: int) -> tuple[bytes, list[int]]:
+        """
+        Serialize trades as log lines.
+
+        Args:
+            trades: Trades to encode
+            offset: Log position the first line will be written at
+
+        Returns:
+            Tuple of (encoded lines, log position where each line starts)
+        """
+        lines = []
+        offsets = []
+        for trade in trades:
+            line = _dumps_line(trade)
+            offsets.append(offset)
+            offset += len(line)
+            lines.append(line)
+        return b"".join(lines), offsets
+
+    def _replace_trade_log(self, data: bytes) -> None:
+        """Atomically replace the trade log's contents (temporary file + rename)."""
+        tmp_file = self.trades_file.with_suffix(".ndjson.tmp")
+        tmp_file.write_bytes(data)
+        self._close_trade_log()
+        os.replace(tmp_file, self.trades_file)
+
+    def _open_trade_log(self) -> None:
+        """Open the persistent append descriptor for the trade log if needed."""
+        if self._trades_fd is None:
+            self._trades_fd = os.open(
+                self.trades_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666
+            )
+            self._trades_fd_close = weakref.finalize(self, os.close, self._trades_fd)
+
+    def _append_trade_log(self, data: bytes) -> None:
+        """Append bytes to the trade log through the persistent descriptor."""
+        self._open_trade_log()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._trades_fd, view) :]
+
+    def _close_trade_log(self) -> None:
+        """Close the trade log descriptor (it is reopened on the next append)."""
+        if self._trades_fd_close is not None:
+            self._trades_fd_close()
+        self._trades_fd = None
+        self._trades_fd_close = None
+
     def _create_backup(self) -> None:
         """Create backup of current state file."""
         if not self.state_file.exists():
@@ -345,17 +687,12 @@ class StateManager:
                 if old_backup.exists():
                     old_backup.rename(new_backup)
 
-            # Create new backup
-            backup_path = self.state_file.with_suffix(".json.bak1")
-            self.state_file.rename(backup_path)
-
-            # Restore original (we just renamed it)
-            backup_path.rename(self.state_file)
-
             # Copy to backup
             import shutil
 
+            backup_path = self.state_file.with_suffix(".json.bak1")
             shutil.copy2(self.state_file, backup_path)
+            self._last_backup = time.monotonic()
 
             logger.debug(f"Backup created: {backup_path}")
         except Exception as e:
@@ -379,12 +716,10 @@ class StateManager:
 
             try:
                 with lock:
-                    with open(backup_path) as f:
-                        data = json.load(f)
+                    data = _loads(backup_path.read_bytes())
 
                     # Backup is valid, restore it
-                    with open(self.state_file, "w") as f:
-                        json.dump(data, f, indent=2)
+                    self.state_file.write_bytes(_dumps(data))
 
                     logger.info(f"Recovered from backup: {backup_path}")
                     return True
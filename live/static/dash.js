@@ -0,0 +1,37 @@
+// FractalTrader dashboard live updates: applies status diffs pushed over /events
+(function () {
+    if (!window.EventSource) {
+        setTimeout(function () { location.reload(); }, 5000);
+        return;
+    }
+
+    var source = new EventSource("/events");
+    source.onerror = function () {
+        // The server turned the stream away (too many viewers): poll by reloading
+        if (source.readyState === EventSource.CLOSED) {
+            setTimeout(function () { location.reload(); }, 5000);
+        }
+    };
+    source.onmessage = function (event) {
+        var data = JSON.parse(event.data);
+        Object.keys(data).forEach(function (key) {
+            var value = data[key];
+            if (key === "status_class") {
+                document.getElementById("status").className = value;
+                return;
+            }
+            var element = document.getElementById(key);
+            if (!element) {
+                return;
+            }
+            if (key === "logs") {
+                // Log lines arrive HTML-escaped and wrapped by the server
+                element.innerHTML = value.map(function (line) {
+                    return '<div class="log-line">' + line + "</div>";
+                }).join("");
+            } else {
+                element.textContent = value;
+            }
+        });
+    };
+})();
@@ -16,6 +16,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=find_packages(exclude=["tests", "tests.*"]),
+    package_data={"live": ["static/*"]},
     python_requires=">=3.11",
     install_requires=requirements,
     extras_require={
@@ -7,7 +7,9 @@ All strategies inherit from BaseStrategy and implement the signal generation log
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 @dataclass
@@ -193,18 +195,25 @@ class BaseStrategy(ABC):
         Returns:
             Series of ATR values
         """
-        high = data["high"]
-        low = data["low"]
-        close = data["close"]
+        high = data["high"].to_numpy(dtype=float)
+        low = data["low"].to_numpy(dtype=float)
+        close = data["close"].to_numpy(dtype=float)
 
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
 
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        # fmax skips NaN like DataFrame.max, so the first bar's range is high - low
+        true_range = np.fmax(
+            high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+        )
 
-        return atr
+        # Simple moving average over complete windows only (rolling(period).mean())
+        atr = np.full(len(true_range), np.nan)
+        if len(true_range) >= period:
+            atr[period - 1 :] = sliding_window_view(true_range, period).mean(axis=1)
+
+        return pd.Series(atr, index=data.index)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}', params={self.params})"
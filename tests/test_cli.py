@@ -0,0 +1,146 @@
+"""Tests for the trading bot command-line interface."""
+
+import argparse
+import signal
+from unittest.mock import patch
+
+import pytest
+
+from live import cli
+from live.state_manager import StateManager
+from strategies.fvg_fill import FVGFillStrategy
+
+
+class TestGetStrategy:
+    """Tests for strategy lookup."""
+
+    def test_registry_entries_resolve(self):
+        """Test every registered strategy path imports and instantiates."""
+        for name in cli._STRATEGY_REGISTRY:
+            assert cli.get_strategy(name) is not None
+
+    def test_returns_strategy_instance(self):
+        """Test the named strategy class is instantiated."""
+        assert isinstance(cli.get_strategy("fvg_fill"), FVGFillStrategy)
+
+    def test_unknown_strategy(self):
+        """Test unknown names raise with the available choices."""
+        with pytest.raises(ValueError, match="Unknown strategy: nope"):
+            cli.get_strategy("nope")
+
+
+class TestShutdownSignal:
+    """Tests for signal-driven shutdown."""
+
+    def test_handler_only_requests_stop(self):
+        """Test the signal handler sets the stop event instead of exiting."""
+        cli._STOP.clear()
+
+        cli._handle_shutdown_signal(signal.SIGTERM, None)
+
+        assert cli._STOP.is_set()
+        cli._STOP.clear()
+
+
+class TestStop:
+    """Tests for the stop command."""
+
+    @pytest.fixture
+    def pid_file(self, tmp_path, monkeypatch):
+        """Point the CLI at a temporary PID file."""
+        path = tmp_path / "bot.pid"
+        monkeypatch.setattr(cli, "PID_FILE", path)
+        return path
+
+    def test_stop_sends_sigterm(self, pid_file):
+        """Test stop signals the recorded process and removes the PID file."""
+        pid_file.write_text("4242")
+
+        with patch("live.cli.os.kill") as mock_kill:
+            assert cli.cmd_stop(None) == 0
+
+        mock_kill.assert_called_once_with(4242, signal.SIGTERM)
+        assert not pid_file.exists()
+
+    def test_stop_cleans_stale_pid_file(self, pid_file):
+        """Test a PID file for a dead process is removed."""
+        pid_file.write_text("4242")
+
+        with patch("live.cli.os.kill", side_effect=ProcessLookupError):
+            assert cli.cmd_stop(None) == 0
+
+        assert not pid_file.exists()
+
+    def test_stop_without_running_bot(self, pid_file):
+        """Test stop is a no-op when no PID file exists."""
+        with patch("live.cli.os.kill") as mock_kill:
+            assert cli.cmd_stop(None) == 0
+
+        mock_kill.assert_not_called()
+
+
+class TestStatusAndReport:
+    """Tests for the read-only status and report commands."""
+
+    @pytest.fixture
+    def state_file(self, tmp_path, monkeypatch):
+        """Populate a temporary state file and point the CLI at it."""
+        path = tmp_path / "state.json"
+        manager = StateManager(state_file=path)
+        manager.set_starting_balance(1000.0)
+        manager.save_position("BTC", {"entry_price": 50000.0, "size": 0.1})
+        manager.save_trade({"symbol": "BTC", "pnl": 10.0})
+        manager.save_trade({"symbol": "ETH", "pnl": -5.0})
+        manager.save_trade({"symbol": "SOL", "status": "OPEN"})
+
+        monkeypatch.setattr(cli, "STATE_FILE", path)
+        monkeypatch.setattr(cli, "PID_FILE", tmp_path / "bot.pid")
+        return path
+
+    def test_status_lists_open_positions(self, state_file, capsys):
+        """Test status prints the stored positions."""
+        assert cli.cmd_status(None) == 0
+
+        output = capsys.readouterr().out
+        assert "BTC: 0.1000 @ $50,000.00" in output
+        assert "Total: 3" in output
+
+    def test_report_balance_includes_trade_pnl(self, state_file):
+        """Test the report balance is starting balance plus summed trade PnL."""
+        args = argparse.Namespace(output=None, format="json")
+
+        with patch("live.cli.PerformanceReporter") as mock_reporter:
+            assert cli.cmd_report(args) == 0
+
+        mock_reporter.return_value.calculate_metrics.assert_called_once_with(1005.0)
+
+    def test_report_uses_tracked_position_peak(self, state_file):
+        """Test the report reads the concurrent-position peak the trader stored."""
+        StateManager(state_file=state_file).save_metadata("max_concurrent_positions", 3)
+        args = argparse.Namespace(output=None, format="json")
+
+        with patch("live.cli.PerformanceReporter") as mock_reporter:
+            assert cli.cmd_report(args) == 0
+
+        assert mock_reporter.call_args.kwargs["max_concurrent_positions"] == 3
+
+
+class TestArgumentParsing:
+    """Tests for command-line parsing."""
+
+    def test_strategy_choices_come_from_registry(self, capsys):
+        """Test --help lists registered strategies without importing them."""
+        with patch("sys.argv", ["live.cli", "start", "--help"]), pytest.raises(SystemExit):
+            cli.main()
+
+        output = capsys.readouterr().out
+        for name in cli._STRATEGY_REGISTRY:
+            assert name in output
+
+    def test_unknown_strategy_rejected(self, capsys):
+        """Test argparse rejects strategies missing from the registry."""
+        with patch("sys.argv", ["live.cli", "start", "--strategy", "nope"]):
+            with pytest.raises(SystemExit):
+                cli.main()
+
+        assert "invalid choice" in capsys.readouterr().err
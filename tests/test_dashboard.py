@@ -0,0 +1,354 @@
+"""Tests for the public monitoring dashboard."""
+
+import gzip
+import json
+import os
+import threading
+
+import pytest
+
+from live import dashboard
+from live.state_manager import trades_file_for
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot(monkeypatch):
+    """Render every request from scratch unless a test reuses a snapshot."""
+    monkeypatch.setattr(dashboard, "_SNAPSHOT", None)
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Point the dashboard at a temporary log file."""
+    path = tmp_path / "bot.log"
+    monkeypatch.setattr(dashboard, "LOG_FILE", path)
+    return path
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    """Point the dashboard at a temporary state file."""
+    path = tmp_path / "state.json"
+    monkeypatch.setattr(dashboard, "STATE_FILE", path)
+    return path
+
+
+def write_state(path, trades):
+    """Write a minimal state file with the given number of trades."""
+    state = {
+        "session_start": "2024-01-01T00:00:00",
+        "starting_balance": 1000,
+        "open_positions": {"BTC": {}},
+        "trade_history": [{"pnl": 1.0}] * trades,
+    }
+    path.write_text(json.dumps(state))
+
+
+class TestBotStatus:
+    """Tests for state-file status reporting."""
+
+    def test_missing_state_file(self, state_file):
+        """Test bot reports stopped without a state file."""
+        assert dashboard.get_bot_status()["status"] == "STOPPED"
+
+    def test_running_status(self, state_file):
+        """Test status fields are read from the state file."""
+        write_state(state_file, trades=2)
+
+        status = dashboard.get_bot_status()
+
+        assert status["status"] == "RUNNING"
+        assert status["starting_balance"] == "1000.00"
+        assert status["open_positions"] == 1
+        assert status["total_trades"] == 2
+        assert status["uptime"].endswith("h")
+
+    def test_unchanged_file_is_not_reparsed(self, state_file):
+        """Test the parsed state is reused while mtime and size are unchanged."""
+        write_state(state_file, trades=2)
+        st = state_file.stat()
+        assert dashboard.get_bot_status()["total_trades"] == 2
+
+        # Same size and mtime: contents must not be re-read
+        state_file.write_bytes(b" " * st.st_size)
+        os.utime(state_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert dashboard.get_bot_status()["total_trades"] == 2
+
+        write_state(state_file, trades=3)
+        assert dashboard.get_bot_status()["total_trades"] == 3
+
+    def test_trade_count_from_trade_log(self, state_file):
+        """Test trades are counted incrementally from the append-only log."""
+        state_file.write_text(json.dumps({"session_start": "2024-01-01T00:00:00"}))
+        trades_file = trades_file_for(state_file)
+        assert dashboard.get_bot_status()["total_trades"] == 0
+
+        trades_file.write_text('{"pnl": 1}\n{"pnl": 2}\n')
+        assert dashboard.get_bot_status()["total_trades"] == 2
+
+        # A partially appended line is not counted until it is complete
+        with open(trades_file, "a") as f:
+            f.write('{"pnl": 3}\n{"pn')
+        assert dashboard.get_bot_status()["total_trades"] == 3
+        with open(trades_file, "a") as f:
+            f.write('l": 4}\n')
+        assert dashboard.get_bot_status()["total_trades"] == 4
+
+        # A rewritten (truncated) log is recounted
+        trades_file.write_text('{"pnl": 1}\n')
+        assert dashboard.get_bot_status()["total_trades"] == 1
+
+    def test_session_start_parsed_once(self, state_file, monkeypatch):
+        """Test the session start is parsed once per session, not per request."""
+        monkeypatch.setattr(dashboard, "_PARSED_START", {"raw": None, "dt": None})
+        write_state(state_file, trades=0)
+        dashboard.get_bot_status()
+        parsed = dashboard._PARSED_START["dt"]
+
+        write_state(state_file, trades=1)
+        dashboard.get_bot_status()
+
+        assert dashboard._PARSED_START["dt"] is parsed
+        assert dashboard._PARSED_START["raw"] == "2024-01-01T00:00:00"
+
+    def test_invalid_session_start(self, state_file):
+        """Test an unparseable session start leaves uptime unknown."""
+        state_file.write_text(json.dumps({"session_start": "yesterday"}))
+
+        status = dashboard.get_bot_status()
+
+        assert status["status"] == "RUNNING"
+        assert status["uptime"] == "N/A"
+
+    def test_corrupted_state_file(self, state_file):
+        """Test unreadable state reports an error."""
+        state_file.write_text("{not json")
+
+        assert dashboard.get_bot_status()["status"] == "ERROR"
+
+
+class TestTail:
+    """Tests for the in-process log tail reader."""
+
+    def test_tail_returns_last_lines(self, tmp_path):
+        """Test only the trailing lines are returned, oldest first."""
+        path = tmp_path / "bot.log"
+        path.write_text("".join(f"line {i}\n" for i in range(100)))
+
+        assert dashboard._tail(path, 3) == [b"line 97", b"line 98", b"line 99"]
+
+    def test_tail_short_file(self, tmp_path):
+        """Test a file shorter than the request returns every line."""
+        path = tmp_path / "bot.log"
+        path.write_text("first\nsecond")
+
+        assert dashboard._tail(path, 50) == [b"first", b"second"]
+
+    def test_tail_empty_file(self, tmp_path):
+        """Test an empty file yields no lines."""
+        path = tmp_path / "bot.log"
+        path.write_bytes(b"")
+
+        assert dashboard._tail(path, 50) == []
+
+    def test_tail_grows_window_for_long_lines(self, tmp_path):
+        """Test the read window grows when lines exceed the size guess."""
+        path = tmp_path / "bot.log"
+        lines = [f"{i:04d}".encode() + b"x" * 1000 for i in range(20)]
+        path.write_bytes(b"\n".join(lines) + b"\n")
+
+        assert dashboard._tail(path, 5) == lines[-5:]
+
+
+class TestRecentLogs:
+    """Tests for log formatting."""
+
+    def test_missing_log_file(self, log_file):
+        """Test placeholder when no log file exists."""
+        assert dashboard.get_recent_logs() == ["No logs available"]
+
+    def test_levels_highlighted_and_escaped(self, log_file):
+        """Test log levels map to CSS classes and HTML is escaped."""
+        log_file.write_text(
+            "t - bot - ERROR - boom <script>\n"
+            "t - bot - WARNING - careful\n"
+            "\n"
+            "t - bot - INFO - ok\n"
+        )
+
+        assert dashboard.get_recent_logs() == [
+            '<span class="log-level-ERROR">t - bot - ERROR - boom &lt;script&gt;</span>',
+            '<span class="log-level-WARNING">t - bot - WARNING - careful</span>',
+            '<span class="log-level-INFO">t - bot - INFO - ok</span>',
+        ]
+
+    def test_unlabelled_lines_default_to_info(self, log_file):
+        """Test lines without a recognised level use the INFO style."""
+        log_file.write_text("Traceback (most recent call last):\n  File x\n")
+
+        assert dashboard.get_recent_logs() == [
+            '<span class="log-level-INFO">Traceback (most recent call last):</span>',
+            '<span class="log-level-INFO">  File x</span>',
+        ]
+
+
+class TestIndex:
+    """Tests for the dashboard page."""
+
+    def test_index_uses_cached_branch(self, log_file, tmp_path, monkeypatch):
+        """Test the page renders the branch resolved at import time."""
+        monkeypatch.setattr(dashboard, "STATE_FILE", tmp_path / "missing.json")
+        monkeypatch.setattr(dashboard, "BRANCH", "feature-x")
+
+        response = dashboard.app.test_client().get("/")
+
+        assert response.status_code == 200
+        assert b"Branch: feature-x" in response.data
+
+    def test_index_escapes_log_lines(self, log_file, tmp_path, monkeypatch):
+        """Test log text is escaped while the level markup is kept."""
+        monkeypatch.setattr(dashboard, "STATE_FILE", tmp_path / "missing.json")
+        log_file.write_text("t - bot - ERROR - <script>alert(1)</script>\n")
+
+        response = dashboard.app.test_client().get("/")
+
+        assert b"<script>" not in response.data
+        assert b'<span class="log-level-ERROR">' in response.data
+        assert b"&lt;script&gt;alert(1)&lt;/script&gt;" in response.data
+
+    def test_conditional_request_returns_not_modified(self, log_file, state_file):
+        """Test a matching If-None-Match is answered with 304 from the snapshot."""
+        client = dashboard.app.test_client()
+        first = client.get("/")
+
+        assert first.headers["Cache-Control"] == "public, max-age=1"
+        second = client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert second.status_code == 304
+        assert second.data == b""
+
+    def test_snapshot_shared_between_requests(self, log_file, state_file):
+        """Test requests reuse the rendered snapshot until it goes stale."""
+        client = dashboard.app.test_client()
+        assert client.get("/api/status").json["status"] == "STOPPED"
+
+        write_state(state_file, trades=1)
+        assert client.get("/api/status").json["status"] == "STOPPED"
+
+        dashboard._SNAPSHOT["created"] -= dashboard._SNAPSHOT_MAX_AGE + 1
+        status = client.get("/api/status").json
+        assert status["status"] == "RUNNING"
+        assert status["total_trades"] == 1
+
+    def test_gzip_page_for_accepting_clients(self, log_file, state_file):
+        """Test the pre-compressed page is sent when the client accepts gzip."""
+        client = dashboard.app.test_client()
+        plain = client.get("/")
+        compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(compressed.data) == plain.data
+        assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    def test_stylesheet_is_versioned_and_immutable(self, log_file, state_file):
+        """Test the page links the hashed stylesheet, served with a long cache."""
+        client = dashboard.app.test_client()
+        assert dashboard._CSS_URL.encode() in client.get("/").data
+
+        response = client.get(dashboard._CSS_URL)
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        response.close()
+
+
+class TestRefresher:
+    """Tests for the change-gated background refresh."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_refresh_state(self, monkeypatch):
+        """Start each test without a previous render."""
+        monkeypatch.setattr(dashboard, "_REFRESH_STATE", {"fingerprint": None, "rendered": 0.0})
+
+    def test_unchanged_sources_are_not_rerendered(self, log_file, state_file):
+        """Test a quiet bot only re-dates the existing snapshot."""
+        write_state(state_file, trades=1)
+        dashboard._refresh()
+        first = dashboard._SNAPSHOT
+
+        dashboard._refresh()
+
+        assert dashboard._SNAPSHOT["html"] is first["html"]
+        assert dashboard._SNAPSHOT["created"] >= first["created"]
+
+    def test_changed_sources_are_rerendered(self, log_file, state_file):
+        """Test a state or log change triggers a new render."""
+        write_state(state_file, trades=1)
+        dashboard._refresh()
+        first = dashboard._SNAPSHOT
+
+        log_file.write_text("t - bot - INFO - new line\n")
+        dashboard._refresh()
+
+        assert dashboard._SNAPSHOT["html"] is not first["html"]
+        assert b"new line" in dashboard._SNAPSHOT["html"]
+
+    def test_idle_snapshot_rerendered_periodically(self, log_file, state_file):
+        """Test unchanged pages are still re-rendered after the idle interval."""
+        dashboard._refresh()
+        first = dashboard._SNAPSHOT
+
+        dashboard._REFRESH_STATE["rendered"] -= dashboard.IDLE_RENDER_INTERVAL
+        dashboard._refresh()
+
+        assert dashboard._SNAPSHOT["html"] is not first["html"]
+
+
+class TestEvents:
+    """Tests for the Server-Sent Events stream."""
+
+    def test_page_uses_event_stream(self, log_file, state_file):
+        """Test the page loads the live-update script instead of meta refresh."""
+        page = dashboard.app.test_client().get("/").data
+
+        assert dashboard._JS_URL.encode() in page
+        assert b'<noscript><meta http-equiv="refresh" content="5"></noscript>' in page
+
+    def test_stream_sends_full_state_then_changes(self, log_file, state_file):
+        """Test the first event holds all fields and later events only diffs."""
+        log_file.write_text("t - bot - INFO - first\n")
+        response = dashboard.app.test_client().get("/events", buffered=False)
+        stream = iter(response.response)
+
+        assert next(stream) == b"retry: 5000\n\n"
+        first = json.loads(next(stream).removeprefix(b"data: "))
+        assert first["status"] == "STOPPED"
+        assert first["logs"] == ['<span class="log-level-INFO">t - bot - INFO - first</span>']
+
+        log_file.write_text("t - bot - ERROR - <b>second</b>\n")
+        dashboard._publish(dashboard._render_snapshot())
+        update = json.loads(next(stream).removeprefix(b"data: "))
+
+        assert "status" not in update
+        assert update["logs"] == [
+            '<span class="log-level-ERROR">t - bot - ERROR - &lt;b&gt;second&lt;/b&gt;</span>'
+        ]
+        response.close()
+
+    def test_stream_count_is_capped(self, log_file, state_file, monkeypatch):
+        """Test viewers beyond the stream cap get a 503 until a slot frees up."""
+        monkeypatch.setattr(dashboard, "_STREAM_SLOTS", threading.BoundedSemaphore(1))
+        client = dashboard.app.test_client()
+
+        first = client.get("/events", buffered=False)
+        rejected = client.get("/events", buffered=False)
+
+        assert first.status_code == 200
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "30"
+
+        first.close()
+        retry = client.get("/events", buffered=False)
+        assert retry.status_code == 200
+        retry.close()
@@ -1,8 +1,10 @@
 """Tests for data fetchers."""
 
-from unittest.mock import patch
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
 
 import ccxt
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -72,6 +74,25 @@ class TestBaseFetcher:
             fetcher.validate_dataframe(df)
 
 
+class TestLegacyFetchOhlcv:
+    """Tests for the backward-compatible fetch_ohlcv function."""
+
+    def test_reuses_fetcher_per_exchange(self):
+        """Test repeated calls don't rebuild the CCXT exchange."""
+        from data import fetcher as fetcher_module
+
+        fetcher_module._get_ccxt_fetcher.cache_clear()
+        try:
+            with patch("data.ccxt_fetcher.CCXTFetcher") as mock_cls:
+                fetcher_module.fetch_ohlcv("BTC/USDT", "1h", 10, exchange_id="binance")
+                fetcher_module.fetch_ohlcv("ETH/USDT", "1h", 10, exchange_id="binance")
+
+                mock_cls.assert_called_once_with("binance")
+                assert mock_cls.return_value.fetch_ohlcv.call_count == 2
+        finally:
+            fetcher_module._get_ccxt_fetcher.cache_clear()
+
+
 class TestHyperliquidFetcher:
     """Tests for Hyperliquid data fetcher."""
 
@@ -165,7 +186,7 @@ class TestHyperliquidFetcher:
     def test_get_available_symbols(self, fetcher):
         """Test fetching available symbols."""
         symbols = fetcher.get_available_symbols()
-        assert isinstance(symbols, list)
+        assert isinstance(symbols, tuple)
         # Should have some symbols
         assert len(symbols) > 0
 
@@ -177,6 +198,219 @@ class TestHyperliquidFetcher:
         assert price >= 0
 
 
+class TestHyperliquidCandleParsing:
+    """Offline tests for Hyperliquid candle parsing (no network)."""
+
+    @pytest.fixture
+    def fetcher(self):
+        """Create fetcher with the SDK client mocked out."""
+        with patch("data.hyperliquid_fetcher.Info"):
+            return HyperliquidFetcher(network="testnet")
+
+    @pytest.fixture
+    def candles(self):
+        """Raw candles in Hyperliquid API format."""
+        return [
+            {"t": 1700000000000, "o": "40000", "h": "41000", "l": "39000", "c": "40500", "v": "1"},
+            {"t": 1700003600000, "o": "40500", "h": "40900", "l": "40100", "c": "402e2", "v": "5"},
+        ]
+
+    def test_candles_to_dataframe_format(self, fetcher, candles):
+        """Test parsed candles match the standard DataFrame format."""
+        df = fetcher._candles_to_dataframe(candles)
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert all(dtype == np.float64 for dtype in df.dtypes)
+        assert isinstance(df.index, pd.DatetimeIndex)
+        assert str(df.index.tz) == "UTC"
+        assert df.index.name == "timestamp"
+        assert df["close"].tolist() == [40500.0, 40200.0]
+        assert df["volume"].tolist() == [1.0, 5.0]
+
+    def test_candles_to_dataframe_columns_are_zero_copy(self, fetcher, candles):
+        """Test OHLCV columns share one float64 block (no copy on .to_numpy())."""
+        df = fetcher._candles_to_dataframe(candles)
+        block = df.to_numpy()
+
+        for column in ["open", "high", "low", "close", "volume"]:
+            values = df[column].to_numpy()
+            assert np.shares_memory(values, block)
+            assert values.flags["C_CONTIGUOUS"]
+
+    def test_candles_to_dataframe_sorts_unordered_input(self, fetcher, candles):
+        """Test out-of-order candles are still returned in time order."""
+        df = fetcher._candles_to_dataframe(list(reversed(candles)))
+
+        assert df.index.is_monotonic_increasing
+        assert df["open"].tolist() == [40000.0, 40500.0]
+
+    def test_client_uses_timeout_and_pooled_session(self):
+        """Test SDK client gets the request timeout and a sized connection pool."""
+        with patch("data.hyperliquid_fetcher.Info") as mock_info:
+            HyperliquidFetcher(network="testnet", timeout=12)
+
+        assert mock_info.call_args.kwargs["timeout"] == 12
+        mount_args = mock_info.return_value.session.mount.call_args.args
+        assert mount_args[0] == "https://"
+        assert mount_args[1]._pool_maxsize == HyperliquidFetcher.HTTP_POOL_SIZE
+
+    def test_validate_ohlcv_fast_accepts_parsed_candles(self, fetcher, candles):
+        """Test fast validator passes well-formed candles."""
+        df = fetcher._candles_to_dataframe(candles)
+        assert fetcher._validate_ohlcv_fast(df) is True
+
+    def test_validate_ohlcv_fast_rejects_bad_prices(self, fetcher, candles):
+        """Test fast validator catches empty, non-finite and inconsistent prices."""
+        with pytest.raises(ValueError, match="DataFrame is empty"):
+            fetcher._validate_ohlcv_fast(fetcher._empty_dataframe())
+
+        df = fetcher._candles_to_dataframe(candles)
+        df.iloc[0, df.columns.get_loc("close")] = float("nan")
+        with pytest.raises(ValueError, match="NaN or infinite"):
+            fetcher._validate_ohlcv_fast(df)
+
+        df = fetcher._candles_to_dataframe(candles)
+        df.iloc[1, df.columns.get_loc("high")] = 1.0
+        with pytest.raises(ValueError, match="inconsistent"):
+            fetcher._validate_ohlcv_fast(df)
+
+    def test_orjson_response_hook_decodes_body(self):
+        """Test session hook swaps response.json() for orjson decoding."""
+        pytest.importorskip("orjson")
+        from data.hyperliquid_fetcher import _orjson_response_hook
+
+        response = Mock()
+        response.content = b'[{"t": 1700000000000, "o": "40000"}]'
+
+        assert _orjson_response_hook(response) is response
+        assert response.json() == [{"t": 1700000000000, "o": "40000"}]
+
+        response.content = b"not json"
+        with pytest.raises(ValueError):
+            response.json()
+
+    def test_parse_since_integer_timestamp(self, fetcher):
+        """Test integer timestamps skip date parsing (seconds and ms)."""
+        assert fetcher._parse_since(1704067200) == 1704067200000
+        assert fetcher._parse_since(1704067200000) == 1704067200000
+
+    def test_parse_since_rejects_pre_2000_timestamp(self, fetcher):
+        """Test implausibly old timestamps are rejected."""
+        with pytest.raises(ValueError, match="Invalid 'since' format"):
+            fetcher._parse_since("12345")
+        with pytest.raises(ValueError, match="Invalid 'since' format"):
+            fetcher._parse_since(12345)
+
+    def test_parse_since_compact_date(self, fetcher):
+        """Test digit strings too small for an epoch time are parsed as dates."""
+        assert fetcher._parse_since("20240101") == 1704067200000
+
+    def test_parse_since_numpy_int_and_datetime(self, fetcher):
+        """Test NumPy integers and datetime objects are accepted."""
+        assert fetcher._parse_since(np.int64(1704067200000)) == 1704067200000
+        assert fetcher._parse_since(datetime(2024, 1, 1, tzinfo=UTC)) == 1704067200000
+        assert fetcher._parse_since(pd.Timestamp("2024-01-01", tz="UTC")) == 1704067200000
+
+
+class TestHyperliquidSnapshotCache:
+    """Offline tests for cached allMids/meta lookups."""
+
+    @pytest.fixture
+    def fetcher(self):
+        """Create fetcher with the SDK client mocked out."""
+        with patch("data.hyperliquid_fetcher.Info"):
+            return HyperliquidFetcher(network="testnet")
+
+    def test_current_price_reuses_cached_mids(self, fetcher):
+        """Test repeated price lookups share one allMids request."""
+        fetcher.info.all_mids.return_value = {"BTC": "42000", "ETH": "2200.5"}
+
+        assert fetcher.get_current_price("BTC") == 42000.0
+        assert fetcher.get_current_price("ETH") == 2200.5
+        assert fetcher.info.all_mids.call_count == 1
+
+    def test_cache_hits_skip_rate_limiter(self, fetcher):
+        """Test cached lookups never wait on the API rate limiter."""
+        fetcher.info.all_mids.return_value = {"BTC": "42000"}
+        fetcher.info.meta.return_value = {"universe": [{"name": "BTC"}]}
+
+        with patch("ratelimit.decorators.time.sleep") as mock_sleep:
+            for _ in range(50):
+                fetcher._get_mids()
+                fetcher._get_meta()
+
+        mock_sleep.assert_not_called()
+        assert fetcher.info.all_mids.call_count == 1
+        assert fetcher.info.meta.call_count == 1
+
+    def test_current_price_refreshes_after_ttl(self, fetcher):
+        """Test expired mids are fetched again."""
+        fetcher.info.all_mids.side_effect = [{"BTC": "42000"}, {"BTC": "43000"}]
+        fetcher.MIDS_CACHE_TTL = 0.0
+
+        assert fetcher.get_current_price("BTC") == 42000.0
+        assert fetcher.get_current_price("BTC") == 43000.0
+        assert fetcher.info.all_mids.call_count == 2
+
+    def test_get_current_prices_batches_symbols(self, fetcher):
+        """Test batch price lookup returns every requested symbol."""
+        fetcher.info.all_mids.return_value = {"BTC": "42000", "ETH": "2200.5"}
+
+        prices = fetcher.get_current_prices(["BTC", "ETH", "UNKNOWN"])
+
+        assert prices == {"BTC": 42000.0, "ETH": 2200.5, "UNKNOWN": 0.0}
+        assert fetcher.info.all_mids.call_count == 1
+
+    def test_available_symbols_cached_as_tuple(self, fetcher):
+        """Test symbol tuple is built once and reused."""
+        fetcher.info.meta.return_value = {"universe": [{"name": "BTC"}, {"name": "ETH"}]}
+
+        symbols = fetcher.get_available_symbols()
+        fetcher.META_CACHE_TTL = 0.0  # Symbols outlive the meta cache
+
+        assert symbols == ("BTC", "ETH")
+        assert fetcher.get_available_symbols() is symbols
+        assert fetcher.info.meta.call_count == 1
+
+    def test_available_symbols_error_returns_empty(self, fetcher):
+        """Test API failure returns an empty tuple and is not cached."""
+        fetcher.info.meta.side_effect = [ConnectionError("down"), {"universe": [{"name": "BTC"}]}]
+
+        assert fetcher.get_available_symbols() == ()
+        assert fetcher.get_available_symbols() == ("BTC",)
+
+
+class TestHyperliquidBatchFetch:
+    """Offline tests for concurrent multi-symbol fetching."""
+
+    @pytest.fixture
+    def fetcher(self):
+        """Create fetcher with the SDK client mocked out."""
+        with patch("data.hyperliquid_fetcher.Info"):
+            return HyperliquidFetcher(network="testnet")
+
+    def test_fetch_ohlcv_batch_returns_frame_per_symbol(self, fetcher):
+        """Test each symbol is fetched once and keyed by name."""
+        frames = {"BTC": fetcher._empty_dataframe(), "ETH": fetcher._empty_dataframe()}
+
+        with patch.object(fetcher, "fetch_ohlcv", side_effect=lambda s, *a: frames[s]) as mock:
+            result = fetcher.fetch_ohlcv_batch(["BTC", "ETH"], "1h", limit=10)
+
+        assert set(result) == {"BTC", "ETH"}
+        assert result["ETH"] is frames["ETH"]
+        assert mock.call_count == 2
+
+    def test_fetch_ohlcv_batch_empty_symbols(self, fetcher):
+        """Test empty symbol list returns empty dict."""
+        assert fetcher.fetch_ohlcv_batch([]) == {}
+
+    def test_fetch_ohlcv_batch_propagates_errors(self, fetcher):
+        """Test a failed symbol surfaces the fetch error."""
+        with patch.object(fetcher, "fetch_ohlcv", side_effect=ConnectionError("down")):
+            with pytest.raises(ConnectionError):
+                fetcher.fetch_ohlcv_batch(["BTC"])
+
+
 class TestCCXTFetcher:
     """Tests for CCXT data fetcher."""
 
@@ -253,6 +487,28 @@ class TestCCXTFetcher:
         ts = fetcher._parse_since("1704067200")
         assert ts == 1704067200000
 
+    def test_parse_since_numpy_int_and_datetime(self, fetcher):
+        """Test NumPy integers and datetime objects are accepted."""
+        assert fetcher._parse_since(np.int64(1704067200)) == 1704067200000
+        assert fetcher._parse_since(datetime(2024, 1, 1, tzinfo=UTC)) == 1704067200000
+
+    def test_ohlcv_to_dataframe_format(self, fetcher):
+        """Test CCXT rows convert to the standard format (no network)."""
+        ohlcv = [
+            [1700003600000, 40500, 40900, 40100, 40200, 55.5],
+            [1700000000000, 40000, 41000, 39000, 40500, 100],
+            [1700003600000, 40500, 40900, 40100, 40200, 55.5],  # pagination overlap
+        ]
+
+        df = fetcher._ohlcv_to_dataframe(ohlcv)
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert all(dtype == np.float64 for dtype in df.dtypes)
+        assert str(df.index.tz) == "UTC"
+        assert df.index.is_monotonic_increasing
+        assert not df.index.has_duplicates
+        assert df["close"].tolist() == [40500.0, 40200.0]
+
 
 class TestFetcherCompatibility:
     """Test that both fetchers return compatible DataFrames."""
@@ -1,11 +1,21 @@
 """Tests for live trading implementation."""
 
+import threading
+from dataclasses import FrozenInstanceError, replace
+from datetime import date, datetime
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
 
 from live.hl_integration.config import HyperliquidConfig
-from live.hl_integration.testnet import HyperliquidTestnetTrader
+from live.hl_integration.testnet import (
+    TRADE_HISTORY_LIMIT,
+    CriticalError,
+    HyperliquidTestnetTrader,
+    TokenBucket,
+    TransientError,
+)
 from live.hl_integration.trader import HyperliquidTrader
 from strategies.liquidity_sweep import LiquiditySweepStrategy
 
@@ -25,6 +35,34 @@ class TestHyperliquidConfig:
         config = HyperliquidConfig(network="testnet", private_key="0x" + "0" * 64)
         config.validate()  # Should not raise
 
+    def test_config_revalidates_changed_fields(self):
+        """Test a validated config is checked again once a validated field changes."""
+        config = HyperliquidConfig(network="testnet", private_key="0x" + "0" * 64)
+        config.validate()
+        config.validate()
+
+        config = replace(config, base_risk_percent=0.06)
+        with pytest.raises(ValueError, match="base_risk_percent too high"):
+            config.validate()
+
+    def test_config_validation_state_is_per_instance(self):
+        """Test the validated flag doesn't affect equality, repr or other instances."""
+        config = HyperliquidConfig(network="testnet", private_key="0x" + "0" * 64)
+        config.validate()
+        fresh = HyperliquidConfig(network="testnet", private_key="0x" + "0" * 64)
+
+        assert config == fresh
+        assert hash(config) == hash(fresh)
+        assert "_validated" not in repr(config)
+        assert not fresh._validated
+
+    def test_config_is_immutable(self):
+        """Test settings can't be changed on an existing config."""
+        config = HyperliquidConfig(network="testnet", private_key="0x" + "0" * 64)
+        with pytest.raises(FrozenInstanceError):
+            config.max_open_positions = 5
+        assert not hasattr(config, "__dict__")
+
     def test_config_validation_missing_key(self):
         """Test validation fails without private key."""
         config = HyperliquidConfig(network="testnet", private_key=None)
@@ -65,7 +103,7 @@ class TestHyperliquidConfig:
             config.validate()
 
         # Test too high
-        config.min_confidence = 101
+        config = replace(config, min_confidence=101)
         with pytest.raises(ValueError, match="min_confidence must be 0-100"):
             config.validate()
 
@@ -88,6 +126,16 @@ class TestHyperliquidConfig:
             assert config.max_open_positions == 5
             assert config.base_risk_percent == 0.03
 
+    def test_config_from_env_parses_dotenv_once(self):
+        """Test .env is read on the first from_env call, not at import or on reloads."""
+        env_vars = {"HYPERLIQUID_PRIVATE_KEY": "0x" + "1" * 64}
+        with patch("live.hl_integration.config._dotenv_loaded", False):
+            with patch("live.hl_integration.config.load_dotenv") as mock_load:
+                with patch.dict("os.environ", env_vars):
+                    HyperliquidConfig.from_env("testnet")
+                    HyperliquidConfig.from_env("testnet")
+        mock_load.assert_called_once()
+
 
 class TestTestnetTrader:
     """Tests for testnet trader."""
@@ -178,7 +226,7 @@ class TestTestnetTrader:
 
     def test_testnet_trader_respects_min_confidence(self, testnet_trader):
         """Test trader respects minimum confidence."""
-        testnet_trader.config.min_confidence = 70
+        testnet_trader.config = replace(testnet_trader.config, min_confidence=70)
 
         signal = Mock()
         signal.confidence = 50  # Below minimum
@@ -203,6 +251,60 @@ class TestTestnetTrader:
         # Should not raise
         testnet_trader._trading_iteration()
 
+    def test_testnet_trader_fetches_ohlcv_alongside_prices(self, testnet_trader):
+        """Test the candle request is already in flight while prices are fetched."""
+        ohlcv_started = threading.Event()
+        overlapped = []
+
+        def fetch_ohlcv(*args, **kwargs):
+            ohlcv_started.set()
+            return pd.DataFrame()
+
+        def get_current_prices(symbols):
+            overlapped.append(ohlcv_started.wait(timeout=1))
+            return dict.fromkeys(symbols, 0.0)
+
+        testnet_trader.starting_balance = 100000
+        testnet_trader._get_portfolio_value = Mock(return_value=100000)
+        testnet_trader.fetcher.fetch_ohlcv = Mock(side_effect=fetch_ohlcv)
+        testnet_trader.fetcher.get_current_prices = Mock(side_effect=get_current_prices)
+
+        testnet_trader._trading_iteration()
+
+        assert overlapped == [True]
+        testnet_trader.strategy.generate_signals.assert_called_once()
+
+    def test_testnet_trader_skips_ohlcv_when_breaker_tripped(self, testnet_trader):
+        """Test no candle request is made while the circuit breaker blocks trading."""
+        testnet_trader._check_circuit_breakers = Mock(return_value=False)
+        testnet_trader.fetcher.fetch_ohlcv = Mock()
+
+        testnet_trader._trading_iteration()
+
+        testnet_trader.fetcher.fetch_ohlcv.assert_not_called()
+
+    def test_testnet_trader_discards_ohlcv_when_sweep_fails(self, testnet_trader, caplog):
+        """Test a failed price sweep settles the in-flight candle fetch and logs its error."""
+        ohlcv_started = threading.Event()
+
+        def fetch_ohlcv(*args, **kwargs):
+            ohlcv_started.set()
+            raise RuntimeError("candles down")
+
+        def fetch_prices():
+            ohlcv_started.wait(timeout=1)
+            raise RuntimeError("prices down")
+
+        testnet_trader._check_circuit_breakers = Mock(return_value=True)
+        testnet_trader.fetcher.fetch_ohlcv = Mock(side_effect=fetch_ohlcv)
+        testnet_trader._fetch_prices = Mock(side_effect=fetch_prices)
+
+        with patch("live.hl_integration.testnet.time.sleep"):
+            testnet_trader._trading_iteration()
+
+        assert "Discarded background fetch failed: candles down" in caplog.text
+        testnet_trader.strategy.generate_signals.assert_not_called()
+
     def test_testnet_trader_circuit_breaker_drawdown(self, testnet_trader):
         """Test circuit breaker triggers on excessive drawdown."""
         # Set starting balance
@@ -239,6 +341,525 @@ class TestTestnetTrader:
         assert result is True
         assert testnet_trader.circuit_breaker_triggered is False
 
+    def test_testnet_trader_drawdown_tracks_marks_without_refetch(self, testnet_trader):
+        """Test drawdown follows position marks between account reconciliations."""
+        testnet_trader.starting_balance = 100000
+        testnet_trader._get_portfolio_value = Mock(return_value=100000)
+        testnet_trader.open_positions = {"BTC": {"direction": 1, "size": 1.0, "entry_price": 50000}}
+
+        assert testnet_trader._check_circuit_breakers() is True
+
+        testnet_trader._monitor_positions({"BTC": 20000.0})
+        assert testnet_trader._current_equity == 70000
+        testnet_trader._get_portfolio_value.assert_called_once()
+
+        assert testnet_trader._check_circuit_breakers() is False
+
+    def test_testnet_trader_prices_iteration_with_one_request(self, testnet_trader):
+        """Test open positions and the new order share one batched price lookup."""
+        testnet_trader.simulation_mode = True
+        testnet_trader.open_positions = {
+            "ETH": {"size": 1.0, "entry_price": 2000, "stop_loss": 1900},
+            "SOL": {"size": 10.0, "entry_price": 100, "stop_loss": 90},
+        }
+        prices = {"ETH": 1850.0, "SOL": 105.0, "BTC": 50000.0}
+        testnet_trader.fetcher.get_current_prices = Mock(return_value=prices)
+        testnet_trader.fetcher.get_current_price = Mock()
+
+        fetched = testnet_trader._fetch_prices()
+        testnet_trader._monitor_positions(fetched)
+
+        testnet_trader.fetcher.get_current_prices.assert_called_once_with(["ETH", "SOL", "BTC"])
+        assert "ETH" not in testnet_trader.open_positions  # Stop loss hit
+        assert testnet_trader.open_positions["SOL"]["unrealized_pnl"] == 50.0
+
+        signal = Mock(direction=1, stop_loss=49000, take_profit=52000, confidence=80)
+        testnet_trader.exchange.order = Mock(return_value={"status": "ok"})
+        testnet_trader._place_order(signal, 0.01, fetched)
+
+        testnet_trader.fetcher.get_current_price.assert_not_called()
+        assert testnet_trader.open_positions["BTC"]["entry_price"] == 49950
+
+    def test_testnet_trader_price_stream(self, testnet_trader):
+        """Test streamed mids drive SL/TP checks between iterations and replace REST."""
+        testnet_trader.info.subscribe = Mock(return_value=7)
+        testnet_trader._start_price_stream()
+        testnet_trader.info.subscribe.assert_called_once_with(
+            {"type": "allMids"}, testnet_trader._on_mids
+        )
+
+        stop_event = threading.Event()
+        testnet_trader.open_positions = {"BTC": {"size": 0.1, "entry_price": 50000}}
+        testnet_trader._monitor_positions = Mock(side_effect=lambda prices: stop_event.set())
+        push = threading.Timer(
+            0.05, testnet_trader._on_mids, args=[{"data": {"mids": {"BTC": "49000"}}}]
+        )
+        push.start()
+        with patch("live.hl_integration.testnet.PRICE_STREAM_POLL_SECONDS", 0.01):
+            assert testnet_trader._wait_for_next_check(stop_event) is True
+        push.join()
+        testnet_trader._monitor_positions.assert_called_once_with({"BTC": 49000.0})
+
+        testnet_trader.fetcher.get_current_prices = Mock()
+        assert testnet_trader._fetch_prices() == {"BTC": 49000.0}
+        testnet_trader.fetcher.get_current_prices.assert_not_called()
+
+        testnet_trader._stop_price_stream()
+        testnet_trader.info.unsubscribe.assert_called_once_with({"type": "allMids"}, 7)
+        assert testnet_trader._streamed_mids is None
+
+    def test_testnet_trader_caches_atr_per_bar(self, testnet_trader):
+        """Test ATR is computed once per last bar and recomputed when it changes."""
+        index = pd.date_range("2026-01-01", periods=3, freq="1h", tz="UTC")
+        data = pd.DataFrame(
+            {"high": [101.0, 102.0, 103.0], "low": [99.0, 100.0, 101.0], "close": [100.0] * 3},
+            index=index,
+        )
+        testnet_trader.strategy._calculate_atr = Mock(return_value=pd.Series([2.0, 2.5]))
+
+        assert testnet_trader._calculate_atr(data) == 2.5
+        assert testnet_trader._calculate_atr(data) == 2.5
+        testnet_trader.strategy._calculate_atr.assert_called_once()
+
+        # Baseline is a separate 50-period ATR, cached the same way
+        assert testnet_trader._calculate_baseline_atr(data) == 2.5
+        assert testnet_trader._calculate_baseline_atr(data) == 2.5
+        assert testnet_trader.strategy._calculate_atr.call_count == 2
+        assert testnet_trader.strategy._calculate_atr.call_args.kwargs["period"] == 50
+
+        data.loc[index[-1], "high"] = 104.0  # Open candle moved
+        testnet_trader._calculate_atr(data)
+        assert testnet_trader.strategy._calculate_atr.call_count == 3
+
+        assert testnet_trader._calculate_atr(data.iloc[:0]) == 0.0
+
+    @pytest.mark.parametrize(
+        "message, expected",
+        [
+            ("Insufficient margin", CriticalError),
+            ("Read TIMEOUT", TransientError),
+            ("Service Unavailable", TransientError),
+        ],
+    )
+    def test_testnet_trader_classifies_order_errors(self, testnet_trader, message, expected):
+        """Test order errors are classified by their message keywords."""
+        testnet_trader.exchange.order = Mock(side_effect=Exception(message))
+        signal = Mock(direction=1, stop_loss=49000, take_profit=52000, confidence=80)
+
+        with pytest.raises(expected):
+            testnet_trader._place_order(signal, 0.01, {"BTC": 50000.0})
+
+    def test_testnet_trader_fetches_ohlcv_incrementally(self, testnet_trader):
+        """Test later iterations only fetch candles from the last held bar on."""
+
+        def candles(start, closes):
+            index = pd.date_range(start, periods=len(closes), freq="1h", tz="UTC")
+            return pd.DataFrame({"close": closes}, index=index)
+
+        testnet_trader.fetcher.fetch_ohlcv = Mock(
+            side_effect=[
+                candles("2026-01-01 00:00", [1.0, 2.0, 3.0]),
+                candles("2026-01-01 02:00", [3.5, 4.0]),  # Last bar updated + one new
+                candles("2026-01-01 03:00", []),
+            ]
+        )
+
+        with patch("live.hl_integration.testnet.OHLCV_LIMIT", 3):
+            first = testnet_trader._fetch_ohlcv("BTC", "1h")
+            second = testnet_trader._fetch_ohlcv("BTC", "1h")
+            third = testnet_trader._fetch_ohlcv("BTC", "1h")
+
+        assert list(first["close"]) == [1.0, 2.0, 3.0]
+        assert list(second["close"]) == [2.0, 3.5, 4.0]
+        assert third is second
+        since = pd.Timestamp("2026-01-01 02:00", tz="UTC").value // 1_000_000
+        assert testnet_trader.fetcher.fetch_ohlcv.call_args_list[1].kwargs["since"] == since
+
+    def test_testnet_trader_skips_symbols_without_candles(self, testnet_trader):
+        """Test a symbol with no candles is not re-requested until the retry delay passes."""
+        empty = pd.DataFrame({"close": []}, index=pd.DatetimeIndex([], tz="UTC"))
+        testnet_trader.fetcher.fetch_ohlcv = Mock(return_value=empty)
+
+        assert testnet_trader._fetch_ohlcv("NEW", "1h").empty
+        assert testnet_trader._fetch_ohlcv("NEW", "1h").empty
+        testnet_trader.fetcher.fetch_ohlcv.assert_called_once()
+
+        testnet_trader._no_data_until[("NEW", "1h")] = 0.0  # Retry delay elapsed
+        testnet_trader._fetch_ohlcv("NEW", "1h")
+        assert testnet_trader.fetcher.fetch_ohlcv.call_count == 2
+
+    def test_testnet_trader_freezes_time_per_iteration(self, testnet_trader):
+        """Test everything within one iteration shares a timestamp, released afterwards."""
+        seen = []
+
+        def check():
+            seen.extend([testnet_trader._now(), testnet_trader._now()])
+            return False
+
+        testnet_trader._check_circuit_breakers = Mock(side_effect=check)
+        testnet_trader._trading_iteration()
+
+        assert seen[0] is seen[1]
+        assert testnet_trader._iter_now is None
+        assert testnet_trader._now() is not testnet_trader._now()
+
+    def test_testnet_trader_bounds_in_memory_history(self, testnet_trader):
+        """Test the in-memory trade history is a bounded window of recent trades."""
+        assert testnet_trader.trade_history.maxlen == TRADE_HISTORY_LIMIT
+
+        for i in range(TRADE_HISTORY_LIMIT + 3):
+            testnet_trader.trade_history.append({"trade": i})
+
+        assert len(testnet_trader.trade_history) == TRADE_HISTORY_LIMIT
+        assert testnet_trader.trade_history[0] == {"trade": 3}
+
+    def test_testnet_trader_seeds_counters_from_full_history(self, mock_config, mock_strategy):
+        """Test realized P&L and OPEN trades older than the in-memory window are kept."""
+        history = [
+            {"symbol": "ETH", "status": "OPEN"},
+            {"symbol": "BTC", "status": "CLOSED", "pnl": 40.0},
+            {"symbol": "SOL", "status": "CLOSED", "pnl": -10.0},
+            {"symbol": "BTC", "status": "CLOSED", "pnl": 5.0},
+        ]
+        with (
+            patch("live.hl_integration.testnet.TRADE_HISTORY_LIMIT", 2),
+            patch(
+                "live.hl_integration.testnet.StateManager.load_trade_history",
+                return_value=history,
+            ),
+            patch("live.hl_integration.testnet.Account"),
+            patch("live.hl_integration.testnet.Info"),
+            patch("live.hl_integration.testnet.Exchange"),
+            patch("live.hl_integration.testnet.HyperliquidFetcher"),
+        ):
+            trader = HyperliquidTestnetTrader(mock_config, mock_strategy)
+
+        assert list(trader.trade_history) == history[-2:]
+        assert trader._realized_pnl == 35.0
+        assert trader._open_trade_index["ETH"] is history[0]
+
+    def test_testnet_trader_round_to_tick_size(self, testnet_trader):
+        """Test prices round to each asset's tick size."""
+        assert testnet_trader._round_to_tick_size("BTC", 50123.6) == 50124
+        assert testnet_trader._round_to_tick_size("ETH", 2500.123) == 2500.1
+        assert testnet_trader._round_to_tick_size("DOGE", 0.1234567) == 0.12346
+        assert testnet_trader._round_to_tick_size("UNKNOWN", 1.23456) == 1.23
+
+    def test_testnet_trader_trade_counters(self, testnet_trader):
+        """Test streak and daily trade counters follow history, closes and opens."""
+        today = datetime.now().isoformat()
+        testnet_trader.trade_history = [
+            # Older than the first earlier-day trade: never parsed
+            {"timestamp": Mock(date=Mock(side_effect=AssertionError("parsed")))},
+            {"timestamp": "2020-01-01T00:00:00", "pnl": -5.0},
+            {"timestamp": today, "pnl": 10.0},
+            {"timestamp": today, "pnl": 3.0},
+            {"timestamp": "not a date"},
+        ]
+        testnet_trader._init_trade_counters()
+
+        assert testnet_trader._count_consecutive_wins() == 2
+        assert testnet_trader._count_consecutive_losses() == 0
+        assert testnet_trader._count_today_trades() == 2
+
+        testnet_trader.simulation_mode = True
+        testnet_trader.open_positions = {"BTC": {"size": 1.0, "entry_price": 100}}
+        testnet_trader._close_position("BTC", 90, "STOP_LOSS")
+        assert testnet_trader._count_consecutive_wins() == 0
+        assert testnet_trader._count_consecutive_losses() == 1
+
+        testnet_trader._record_opened_trade(datetime.now().date())
+        assert testnet_trader._count_today_trades() == 3
+        testnet_trader._today_date = date(2020, 1, 1)
+        assert testnet_trader._count_today_trades() == 0
+
+    def test_testnet_trader_simulated_value_uses_realized_total(self, testnet_trader):
+        """Test simulated portfolio value adds realized P&L without rescanning history."""
+        testnet_trader.trade_history = [
+            {"status": "CLOSED", "pnl": 25.0},
+            {"status": "CLOSED", "pnl": -5.0},
+            {"symbol": "ETH", "status": "OPEN"},
+        ]
+        testnet_trader._init_trade_counters()
+        testnet_trader.starting_balance = 1000
+        testnet_trader.simulation_mode = True
+        testnet_trader.open_positions = {
+            "BTC": {"size": 1.0, "entry_price": 100, "unrealized_pnl": -3.0},
+            "ETH": {"size": 1.0, "entry_price": 100},
+        }
+        assert testnet_trader._get_simulated_portfolio_value() == 1017.0
+
+        testnet_trader._close_position("ETH", 110, "TAKE_PROFIT")
+        testnet_trader.trade_history = []
+        assert testnet_trader._get_simulated_portfolio_value() == 1027.0
+
+    def test_testnet_trader_close_updates_local_history(self, testnet_trader):
+        """Test closing a position marks its trade CLOSED in the local history."""
+        testnet_trader.simulation_mode = True
+        testnet_trader.exchange.order = Mock(return_value={"status": "ok"})
+        signal = Mock(direction=1, stop_loss=49000, take_profit=52000, confidence=80)
+        testnet_trader._place_order(signal, 0.1, {"BTC": 50000.0})
+
+        testnet_trader._close_position("BTC", 51000, "TAKE_PROFIT")
+
+        trade = testnet_trader.trade_history[-1]
+        assert trade["status"] == "CLOSED"
+        assert trade["pnl"] == pytest.approx(0.1 * (51000 - 49950))
+        assert trade["close_reason"] == "TAKE_PROFIT"
+        assert "BTC" not in testnet_trader._open_trade_index
+
+    def test_testnet_trader_tracks_position_peak(self, testnet_trader):
+        """Test opening positions raises the stored concurrent-position peak only."""
+        testnet_trader.open_positions = {}
+        testnet_trader.state_manager.save_metadata("max_concurrent_positions", 1)
+        testnet_trader.exchange.order = Mock(return_value={"status": "ok"})
+        prices = {"BTC": 50000.0, "ETH": 2000.0}
+
+        for symbol in prices:
+            testnet_trader.config = replace(testnet_trader.config, default_symbol=symbol)
+            signal = Mock(direction=1, stop_loss=1.0, take_profit=1e6, confidence=80)
+            testnet_trader._place_order(signal, 0.1, prices)
+
+        assert testnet_trader.state_manager.get_metadata("max_concurrent_positions") == 2
+
+    def test_testnet_trader_persists_direction_not_signal(self, testnet_trader):
+        """Test positions store a plain direction and short P&L survives a reload."""
+        testnet_trader.exchange.order = Mock(return_value={"status": "ok"})
+        signal = Mock(direction=-1, stop_loss=51000, take_profit=48000, confidence=80)
+        testnet_trader._place_order(signal, 0.1, {"BTC": 50000.0})
+
+        position = testnet_trader.state_manager.load_positions()["BTC"]
+        assert position["direction"] == -1
+        assert "signal" not in position
+        assert testnet_trader._live_signals["BTC"] is signal
+
+        # Legacy entries carry the serialized Signal dict instead
+        legacy = {"signal": {"direction": -1}, "size": 0.1, "entry_price": 50000}
+        assert not testnet_trader._position_is_long(legacy)
+
+        testnet_trader.open_positions["BTC"] = position
+        testnet_trader.exchange.bulk_orders = Mock(
+            return_value={"status": "ok", "response": {"data": {"statuses": [{"filled": {}}]}}}
+        )
+        testnet_trader._close_position("BTC", 49000, "TAKE_PROFIT")
+        assert testnet_trader.trade_history[-1]["pnl"] > 0
+        assert "BTC" not in testnet_trader._live_signals
+
+    def test_testnet_trader_closes_hits_in_one_bulk_order(self, testnet_trader):
+        """Test tripped positions share one bulk action and only accepted closes are booked."""
+        testnet_trader.simulation_mode = False
+        testnet_trader.open_positions = {
+            "ETH": {"size": 1.0, "entry_price": 2000, "stop_loss": 1900},
+            "SOL": {"size": 10.0, "entry_price": 100, "take_profit": 110},
+            "BTC": {"size": 0.1, "entry_price": 50000, "stop_loss": 45000},
+        }
+        realized = testnet_trader._realized_pnl
+        testnet_trader.exchange.bulk_orders = Mock(
+            return_value={
+                "status": "ok",
+                "response": {"data": {"statuses": [{"resting": {"oid": 1}}, {"error": "x"}]}},
+            }
+        )
+
+        testnet_trader._monitor_positions({"ETH": 1850.0, "SOL": 111.0, "BTC": 50000.0})
+
+        testnet_trader.exchange.bulk_orders.assert_called_once()
+        (orders,) = testnet_trader.exchange.bulk_orders.call_args.args
+        assert [(o["coin"], o["is_buy"], o["limit_px"]) for o in orders] == [
+            ("ETH", False, 1850.0),
+            ("SOL", False, 111.0),
+        ]
+        # The rejected SOL close stays open and is retried on the next sweep
+        assert list(testnet_trader.open_positions) == ["SOL", "BTC"]
+        assert testnet_trader._realized_pnl == pytest.approx(realized - 150.0)
+
+        testnet_trader.exchange.bulk_orders.return_value = {
+            "status": "ok",
+            "response": {"data": {"statuses": [{"filled": {"oid": 2}}]}},
+        }
+        testnet_trader._monitor_positions({"SOL": 111.0, "BTC": 50000.0})
+
+        assert list(testnet_trader.open_positions) == ["BTC"]
+        assert testnet_trader._realized_pnl == pytest.approx(realized - 40.0)
+
+    def test_testnet_trader_failed_close_batch_keeps_positions(self, testnet_trader):
+        """Test a bulk close that errors out leaves every position open and unbooked."""
+        testnet_trader.simulation_mode = False
+        testnet_trader.open_positions = {"ETH": {"size": 1.0, "entry_price": 2000}}
+        realized = testnet_trader._realized_pnl
+        testnet_trader.exchange.bulk_orders = Mock(side_effect=ConnectionError("down"))
+
+        testnet_trader._close_position("ETH", 1850.0, "STOP_LOSS")
+
+        assert list(testnet_trader.open_positions) == ["ETH"]
+        assert testnet_trader._realized_pnl == realized
+
+    def test_testnet_trader_logs_close_orders_without_status(self, testnet_trader, caplog):
+        """Test coins missing from a short bulk order response are reported."""
+        testnet_trader.exchange.bulk_orders = Mock(
+            return_value={"status": "ok", "response": {"data": {"statuses": [{"filled": {}}]}}}
+        )
+
+        testnet_trader._send_close_orders([{"coin": "ETH"}, {"coin": "SOL"}])
+
+        assert "Close order placed for ETH" in caplog.text
+        assert "Close orders for ['SOL'] returned no status" in caplog.text
+
+    def test_testnet_trader_reuses_recent_user_state(self, testnet_trader):
+        """Test account state is fetched once per TTL window and refetched after orders."""
+        testnet_trader._invalidate_user_state()
+        testnet_trader.info.user_state = Mock(
+            return_value={"marginSummary": {"accountValue": "12345.6"}, "assetPositions": []}
+        )
+
+        assert testnet_trader._get_actual_portfolio_value() == 12345.6
+        assert testnet_trader._get_actual_portfolio_value() == 12345.6
+        testnet_trader.info.user_state.assert_called_once()
+
+        testnet_trader.open_positions = {"BTC": {"size": 0.1, "entry_price": 50000}}
+        testnet_trader.simulation_mode = False
+        testnet_trader._close_position("BTC", 51000, "TAKE_PROFIT")
+        testnet_trader._get_actual_portfolio_value()
+        assert testnet_trader.info.user_state.call_count == 2
+
+        testnet_trader._user_state_ttl = 0
+        testnet_trader._get_actual_portfolio_value()
+        assert testnet_trader.info.user_state.call_count == 3
+
+    def test_testnet_trader_serves_stale_user_state_when_rate_limited(self, testnet_trader):
+        """Test an expired account state is reused instead of sleeping on the rate limit."""
+        testnet_trader._invalidate_user_state()
+        testnet_trader._user_state_ttl = 0
+        testnet_trader._user_state_rate_limit = TokenBucket(rate=1)
+        testnet_trader.info.user_state = Mock(
+            return_value={"marginSummary": {"accountValue": "12345.6"}, "assetPositions": []}
+        )
+
+        with patch("live.hl_integration.testnet.time.sleep") as mock_sleep:
+            assert testnet_trader._get_actual_portfolio_value() == 12345.6
+            assert testnet_trader._get_actual_portfolio_value() == 12345.6
+
+        testnet_trader.info.user_state.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_testnet_trader_syncs_positions_with_exchange(self, testnet_trader):
+        """Test sync drops, adopts and resizes positions to match the exchange."""
+        testnet_trader.simulation_mode = False
+        testnet_trader._invalidate_user_state()
+        testnet_trader.open_positions = {
+            "BTC": {"direction": 1, "size": 0.1, "entry_price": 50000},
+            "SOL": {"direction": 1, "size": 5.0, "entry_price": 100},
+        }
+        testnet_trader.info.user_state = Mock(
+            return_value={
+                "assetPositions": [
+                    {"position": {"coin": "BTC", "szi": "0.2", "entryPx": "50000"}},
+                    {"position": {"coin": "ETH", "szi": "-1.5", "entryPx": "2000"}},
+                ]
+            }
+        )
+
+        testnet_trader._sync_positions_with_exchange()
+
+        assert sorted(testnet_trader.open_positions) == ["BTC", "ETH"]
+        assert testnet_trader.open_positions["BTC"]["size"] == 0.2
+        assert testnet_trader.open_positions["ETH"]["direction"] == -1
+        assert testnet_trader.open_positions["ETH"]["entry_price"] == 2000.0
+        assert testnet_trader.open_positions["ETH"]["exchange_data"] == {
+            "coin": "ETH",
+            "szi": "-1.5",
+            "entryPx": "2000",
+        }
+        assert sorted(testnet_trader.state_manager.load_positions()) == ["BTC", "ETH"]
+
+    def test_testnet_trader_sync_compares_sizes_in_size_steps(self, testnet_trader):
+        """Test sync flags size differences of one exchange size step and ignores float noise."""
+        testnet_trader.simulation_mode = False
+        testnet_trader._invalidate_user_state()
+        testnet_trader.open_positions = {
+            "BTC": {"direction": 1, "size": 0.1, "entry_price": 50000},
+            "DOGE": {"direction": 1, "size": 300.0, "entry_price": 0.1},
+        }
+        testnet_trader.info.meta = Mock(
+            return_value={
+                "universe": [
+                    {"name": "BTC", "szDecimals": 5},
+                    {"name": "DOGE", "szDecimals": 0},
+                ]
+            }
+        )
+        testnet_trader.info.user_state = Mock(
+            return_value={
+                "assetPositions": [
+                    {"position": {"coin": "BTC", "szi": "0.10004", "entryPx": "50000"}},
+                    {"position": {"coin": "DOGE", "szi": "300.0000001", "entryPx": "0.1"}},
+                ]
+            }
+        )
+
+        testnet_trader._sync_positions_with_exchange()
+        testnet_trader._sync_positions_with_exchange()
+
+        assert testnet_trader.open_positions["BTC"]["size"] == 0.10004
+        assert testnet_trader.open_positions["DOGE"]["size"] == 300.0
+        testnet_trader.info.meta.assert_called_once()
+
+    def test_testnet_trader_shares_fetcher_http_session(self, testnet_trader):
+        """Test Info and Exchange reuse the fetcher's pooled session."""
+        session = testnet_trader.fetcher.info.session
+        assert testnet_trader.info.session is session
+        assert testnet_trader.exchange.session is session
+
+    def test_testnet_trader_run_honours_stop_event(self, testnet_trader):
+        """Test a set stop event ends the loop at the iteration boundary."""
+        stop_event = threading.Event()
+        testnet_trader._trading_iteration = Mock(side_effect=stop_event.set)
+        testnet_trader.stop = Mock()
+
+        testnet_trader.run(stop_event=stop_event)
+
+        testnet_trader._trading_iteration.assert_called_once()
+        testnet_trader.stop.assert_called_once()
+
+
+class TestTokenBucket:
+    """Test the client-side API rate limiter."""
+
+    def test_token_bucket_allows_burst_then_waits(self):
+        """Test calls within capacity pass immediately and the next one sleeps."""
+        clock = {"now": 100.0}
+        with patch("live.hl_integration.testnet.time") as mock_time:
+            mock_time.monotonic.side_effect = lambda: clock["now"]
+            bucket = TokenBucket(rate=5)
+
+            for _ in range(5):
+                bucket.acquire()
+            mock_time.sleep.assert_not_called()
+
+            bucket.acquire()
+            mock_time.sleep.assert_called_once_with(pytest.approx(0.2))
+
+            # Refills at `rate` tokens per second
+            clock["now"] += 1.2
+            for _ in range(5):
+                bucket.acquire()
+            mock_time.sleep.assert_called_once()
+
+    def test_token_bucket_try_acquire_does_not_block(self):
+        """Test try_acquire reports the wait instead of sleeping and keeps the token."""
+        clock = {"now": 100.0}
+        with patch("live.hl_integration.testnet.time") as mock_time:
+            mock_time.monotonic.side_effect = lambda: clock["now"]
+            bucket = TokenBucket(rate=2, capacity=1)
+
+            assert bucket.try_acquire() == 0.0
+            assert bucket.try_acquire() == pytest.approx(0.5)
+            assert bucket.try_acquire() == pytest.approx(0.5)
+
+            clock["now"] += 0.5
+            assert bucket.try_acquire() == 0.0
+            mock_time.sleep.assert_not_called()
+
 
 class TestHyperliquidTrader:
     """Tests for mainnet trader."""
@@ -258,20 +879,20 @@ class TestHyperliquidTrader:
     def test_mainnet_trader_requires_confirmation(self, mainnet_config, mock_strategy):
         """Test mainnet trader requires confirmation."""
         # Mock confirm=False and provide 'CANCEL' instead of 'CONFIRM'
-        with patch("eth_account.Account"):
-            with patch("hyperliquid.info.Info"):
-                with patch("hyperliquid.exchange.Exchange"):
-                    with patch("data.hyperliquid_fetcher.HyperliquidFetcher"):
+        with patch("live.hl_integration.testnet.Account"):
+            with patch("live.hl_integration.testnet.Info"):
+                with patch("live.hl_integration.testnet.Exchange"):
+                    with patch("live.hl_integration.testnet.HyperliquidFetcher"):
                         with patch("builtins.input", return_value="CANCEL"):
                             with pytest.raises(RuntimeError, match="not confirmed"):
                                 HyperliquidTrader(mainnet_config, mock_strategy)
 
     def test_mainnet_trader_accepts_confirm_flag(self, mainnet_config, mock_strategy):
         """Test mainnet trader initializes with confirm=True flag."""
-        with patch("eth_account.Account"):
-            with patch("hyperliquid.info.Info"):
-                with patch("hyperliquid.exchange.Exchange"):
-                    with patch("data.hyperliquid_fetcher.HyperliquidFetcher"):
+        with patch("live.hl_integration.testnet.Account"):
+            with patch("live.hl_integration.testnet.Info"):
+                with patch("live.hl_integration.testnet.Exchange"):
+                    with patch("live.hl_integration.testnet.HyperliquidFetcher"):
                         # Should not raise
                         trader = HyperliquidTrader(mainnet_config, mock_strategy, confirm=True)
                         assert trader.config.network == "mainnet"
@@ -284,12 +905,42 @@ class TestHyperliquidTrader:
             with patch("builtins.input", return_value="CONFIRM"):
                 HyperliquidTrader(config, mock_strategy)
 
+    def test_mainnet_trader_reuses_testnet_init(self, mainnet_config, mock_strategy, tmp_path):
+        """Test mainnet trader builds on the testnet __init__ with mainnet overrides."""
+        from hyperliquid.utils import constants
+
+        with patch("live.hl_integration.testnet.Account"):
+            with patch("live.hl_integration.testnet.Info") as mock_info:
+                with patch("live.hl_integration.testnet.Exchange"):
+                    with patch("live.hl_integration.testnet.HyperliquidFetcher") as mock_fetcher:
+                        mock_info.return_value.user_state.return_value = {
+                            "marginSummary": {"accountValue": "5000"},
+                            "assetPositions": [],
+                        }
+                        trader = HyperliquidTrader(
+                            mainnet_config,
+                            mock_strategy,
+                            state_file=str(tmp_path / "state.json"),
+                            confirm=True,
+                        )
+
+        assert mock_info.call_args.args[0] == constants.MAINNET_API_URL
+        # Starting balance and the exchange sync share one account state request
+        mock_info.return_value.user_state.assert_called_once()
+        assert trader.starting_balance == 5000.0
+        mock_fetcher.assert_called_once_with(network="mainnet", timeout=10.0)
+        assert trader.state_manager.backup_count == 10
+        assert trader.state_manager.flush_interval is None
+        assert trader.simulation_mode is False
+        assert trader.max_daily_drawdown == 0.10
+        assert trader.max_daily_trades == 20
+
     def test_mainnet_trader_circuit_breaker(self, mainnet_config, mock_strategy):
         """Test mainnet trader circuit breaker stops trading on drawdown."""
-        with patch("eth_account.Account"):
-            with patch("hyperliquid.info.Info"):
-                with patch("hyperliquid.exchange.Exchange"):
-                    with patch("data.hyperliquid_fetcher.HyperliquidFetcher"):
+        with patch("live.hl_integration.testnet.Account"):
+            with patch("live.hl_integration.testnet.Info"):
+                with patch("live.hl_integration.testnet.Exchange"):
+                    with patch("live.hl_integration.testnet.HyperliquidFetcher"):
                         trader = HyperliquidTrader(mainnet_config, mock_strategy, confirm=True)
                         trader.wallet = Mock()
                         trader.wallet.address = "0xtest"
@@ -1,12 +1,16 @@
 """Tests for state persistence module."""
 
+import json
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 
-from live.state_manager import StateManager, TradingState
+from live.state_manager import StateManager, TradingState, trades_file_for
 
 
 class TestTradingState:
@@ -67,6 +71,7 @@ class TestStateManager:
         # Also cleanup backup files
         for backup in Path(temp_path).parent.glob(f"{Path(temp_path).stem}*.bak*"):
             backup.unlink(missing_ok=True)
+        trades_file_for(temp_path).unlink(missing_ok=True)
 
     @pytest.fixture
     def manager(self, temp_state_file):
@@ -146,6 +151,15 @@ class TestStateManager:
         assert history[1]["pnl"] == 100
         assert history[2]["pnl"] == 200
 
+    def test_load_trade_history_limit(self, manager):
+        """Test limit returns only the most recent trades."""
+        for i in range(5):
+            manager.save_trade({"symbol": "BTC", "pnl": i})
+
+        assert [t["pnl"] for t in manager.load_trade_history(limit=2)] == [3, 4]
+        assert manager.load_trade_history(limit=0) == []
+        assert len(manager.load_trade_history(limit=10)) == 5
+
     def test_set_starting_balance(self, manager):
         """Test setting starting balance."""
         manager.set_starting_balance(100000.0)
@@ -207,6 +221,43 @@ class TestStateManager:
         manager2 = StateManager(state_file=temp_state_file)
         assert "BTC" in manager2.load_positions()
 
+    def test_background_flush(self, temp_state_file):
+        """Test flush_interval defers saves to a background thread and close() flushes."""
+        manager = StateManager(state_file=temp_state_file, flush_interval=60)
+
+        manager.save_position("BTC", {"size": 1.0})
+        deadline = time.monotonic() + 5
+        while "BTC" not in StateManager(state_file=temp_state_file).load_positions():
+            assert time.monotonic() < deadline, "first update was never flushed"
+            time.sleep(0.01)
+
+        # Flusher now waits out its interval: the next update stays pending
+        manager.save_position("ETH", {"size": 2.0})
+        assert "ETH" not in StateManager(state_file=temp_state_file).load_positions()
+
+        manager.close()
+        assert manager._flusher is None
+        assert "ETH" in StateManager(state_file=temp_state_file).load_positions()
+
+    def test_batch_saves_once(self, temp_state_file):
+        """Test updates inside (nested) batch blocks are written with one save."""
+        manager = StateManager(state_file=temp_state_file)
+        saves = []
+        save_state = manager._save_state
+        manager._save_state = lambda: saves.append(1) or save_state()
+
+        with manager.batch():
+            manager.save_position("BTC", {"size": 1.0})
+            with manager.batch():
+                manager.save_trade({"symbol": "BTC", "status": "OPEN"})
+            manager.remove_position("ETH")
+            assert saves == []
+
+        assert saves == [1]
+        reloaded = StateManager(state_file=temp_state_file)
+        assert "BTC" in reloaded.load_positions()
+        assert len(reloaded.load_trade_history()) == 1
+
     def test_reset_state(self, manager):
         """Test resetting state."""
         # Add data
@@ -265,6 +316,20 @@ class TestStateManager:
         backups = list(backup_dir.glob("*.bak*"))
         assert len(backups) > 0  # At least some backups should exist
 
+    def test_auto_save_rotates_backups_once_per_interval(self, temp_state_file):
+        """Test auto-saves skip backup rotation until the interval passes."""
+        manager = StateManager(state_file=temp_state_file, backup_count=3)
+        manager.save_position("BTC", {"size": 1.0})
+        manager.save_position("ETH", {"size": 2.0})  # First backup
+        backup = Path(temp_state_file).with_suffix(".json.bak1")
+        first_backup = backup.read_bytes()
+
+        manager.save_position("SOL", {"size": 3.0})
+        assert backup.read_bytes() == first_backup
+
+        manager.force_save()
+        assert b"SOL" not in first_backup and b"SOL" in backup.read_bytes()
+
     def test_datetime_serialization(self, manager):
         """Test datetime objects are properly serialized."""
         now = datetime.now()
@@ -281,6 +346,30 @@ class TestStateManager:
         # Timestamp should be string after serialization
         assert isinstance(history[0]["timestamp"], str)
 
+    def test_state_file_is_standard_json(self, manager):
+        """Test the state file stays readable by the stdlib json parser."""
+        manager.save_position("BTC", {"size": np.float64(1.5), "levels": {1: "tp"}})
+
+        with open(manager.state_file) as f:
+            data = json.load(f)
+
+        assert data["open_positions"]["BTC"] == {"size": 1.5, "levels": {"1": "tp"}}
+
+    def test_state_file_replaced_atomically(self, temp_state_file):
+        """Test saves write a temporary file and rename it over the state file."""
+        manager = StateManager(state_file=temp_state_file)
+        manager.save_position("BTC", {"size": 1.0})
+        inode = Path(temp_state_file).stat().st_ino
+
+        manager.save_position("ETH", {"size": 2.0})
+
+        assert Path(temp_state_file).stat().st_ino != inode
+        assert not Path(temp_state_file + ".tmp").exists()
+        assert set(json.loads(Path(temp_state_file).read_text())["open_positions"]) == {
+            "BTC",
+            "ETH",
+        }
+
     def test_concurrent_positions(self, manager):
         """Test managing multiple positions concurrently."""
         positions = {
@@ -440,6 +529,7 @@ class TestTradeStatusUpdate:
         # Also cleanup backup files
         for backup in Path(temp_path).parent.glob(f"{Path(temp_path).stem}*.bak*"):
             backup.unlink(missing_ok=True)
+        trades_file_for(temp_path).unlink(missing_ok=True)
 
     @pytest.fixture
     def manager_with_trades(self, temp_state_file):
@@ -542,6 +632,19 @@ class TestTradeStatusUpdate:
         assert len(open_btc) == 1
         assert open_btc[0]["entry_price"] == 90000
 
+    def test_update_trade_status_after_reload(self, temp_state_file):
+        """Test OPEN trades loaded from disk can still be closed, and reset forgets them."""
+        manager = StateManager(state_file=temp_state_file)
+        manager.save_trade({"symbol": "BTC", "status": "OPEN", "entry_price": 90000})
+        manager.save_trade({"symbol": "ETH", "status": "OPEN", "entry_price": 3000})
+
+        reloaded = StateManager(state_file=temp_state_file)
+        assert reloaded.update_trade_status("BTC", status="CLOSED", pnl=10) is True
+        assert reloaded.update_trade_status("BTC", status="CLOSED", pnl=10) is False
+
+        reloaded.reset_state(confirm=True)
+        assert reloaded.update_trade_status("ETH", status="CLOSED") is False
+
     def test_update_trade_status_datetime_serialization(self, manager_with_trades):
         """Test that datetime objects are properly serialized."""
         close_time = datetime.now()
@@ -583,3 +686,168 @@ class TestTradeStatusUpdate:
         assert len(trades) == 1
         assert trades[0]["status"] == "CLOSED"
         assert trades[0]["exit_price"] == 91000
+
+
+class TestTradeLog:
+    """Tests for the append-only trade log."""
+
+    @pytest.fixture
+    def state_path(self, tmp_path):
+        """State file path in a temporary directory."""
+        return tmp_path / "state.json"
+
+    def read_log(self, state_path):
+        """Parse every line of the trade log."""
+        return [json.loads(line) for line in trades_file_for(state_path).read_text().splitlines()]
+
+    def test_trades_file_path(self):
+        """Test the trade log sits next to the state file."""
+        assert trades_file_for(".testnet_state.json") == Path(".testnet_state.trades.ndjson")
+
+    def test_trades_stored_outside_state_file(self, state_path):
+        """Test trades go to the log and the state file keeps the summary."""
+        manager = StateManager(state_file=state_path)
+        manager.set_starting_balance(1000)
+        manager.save_trade({"symbol": "BTC", "pnl": 10})
+        manager.save_trade({"symbol": "ETH", "pnl": -5})
+
+        assert "trade_history" not in json.loads(state_path.read_text())
+        assert self.read_log(state_path) == [
+            {"symbol": "BTC", "pnl": 10},
+            {"symbol": "ETH", "pnl": -5},
+        ]
+
+    def test_new_trades_are_appended(self, state_path):
+        """Test saving a trade appends without replacing the log file."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "pnl": 10})
+        inode = trades_file_for(state_path).stat().st_ino
+
+        manager.save_trade({"symbol": "ETH", "pnl": 20})
+
+        assert trades_file_for(state_path).stat().st_ino == inode
+        assert len(self.read_log(state_path)) == 2
+
+    def test_append_descriptor_reused(self, state_path):
+        """Test appends and in-place updates share one descriptor, reopened after a reset."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "status": "OPEN"})
+        fd = manager._trades_fd
+
+        manager.save_trade({"symbol": "ETH", "status": "OPEN"})
+        assert manager._trades_fd == fd
+
+        manager.update_trade_status("BTC", status="CLOSED")
+        assert manager._trades_fd == fd
+
+        manager.reset_state(confirm=True)
+        assert manager._trades_fd is None
+
+        manager.save_trade({"symbol": "SOL", "status": "OPEN"})
+        assert [t["symbol"] for t in self.read_log(state_path)] == ["SOL"]
+
+    def test_status_update_rewrites_log(self, state_path):
+        """Test updating a trade rewrites the matching log line."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "status": "OPEN"})
+        manager.save_trade({"symbol": "ETH", "status": "OPEN"})
+
+        manager.update_trade_status("BTC", status="CLOSED", pnl=50)
+
+        assert self.read_log(state_path) == [
+            {"symbol": "BTC", "status": "CLOSED", "pnl": 50},
+            {"symbol": "ETH", "status": "OPEN"},
+        ]
+        assert StateManager(state_file=state_path).load_trade_history()[0]["pnl"] == 50
+
+    def test_status_update_keeps_earlier_lines(self, state_path):
+        """Test an update rewrites the log from the changed line only, in place."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "status": "CLOSED", "pnl": 5})
+        manager.save_trade({"symbol": "ETH", "status": "OPEN"})
+        manager.save_trade({"symbol": "SOL", "status": "OPEN"})
+        log = trades_file_for(state_path)
+        first_line = log.read_bytes().splitlines(keepends=True)[0]
+        inode = log.stat().st_ino
+
+        manager.update_trade_status("ETH", status="CLOSED", pnl=-20)
+        manager.update_trade_status("SOL", status="CLOSED", pnl=7)
+
+        assert log.stat().st_ino == inode
+        assert log.read_bytes().startswith(first_line)
+        assert [t.get("pnl") for t in self.read_log(state_path)] == [5, -20, 7]
+
+        reloaded = StateManager(state_file=state_path)
+        reloaded.save_trade({"symbol": "BTC", "status": "OPEN"})
+        reloaded.update_trade_status("BTC", status="CLOSED", pnl=1)
+        assert [t.get("pnl") for t in self.read_log(state_path)] == [5, -20, 7, 1]
+
+    def test_failed_append_keeps_log_readable(self, state_path):
+        """Test a failed trade log write doesn't corrupt the log or lose trades."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "status": "OPEN"})
+
+        with patch("live.state_manager.os.write", side_effect=OSError(28, "No space left")):
+            manager.save_trade({"symbol": "ETH", "status": "OPEN"})
+        assert manager._trades_dirty
+
+        manager.save_trade({"symbol": "SOL", "status": "OPEN"})
+        manager.save_trade({"symbol": "XRP", "status": "OPEN"})
+        manager.update_trade_status("ETH", status="CLOSED", pnl=3)
+
+        assert [t["symbol"] for t in self.read_log(state_path)] == ["BTC", "ETH", "SOL", "XRP"]
+        reloaded = StateManager(state_file=state_path).load_trade_history()
+        assert [t["symbol"] for t in reloaded] == ["BTC", "ETH", "SOL", "XRP"]
+        assert reloaded[1]["pnl"] == 3
+
+    def test_failed_status_update_rewrites_log(self, state_path):
+        """Test a write failing after the log was truncated is repaired on the next save."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "status": "OPEN"})
+        manager.save_trade({"symbol": "ETH", "status": "OPEN"})
+
+        with patch("live.state_manager.os.write", side_effect=OSError(28, "No space left")):
+            manager.update_trade_status("BTC", status="CLOSED", pnl=4)
+        assert manager._trades_dirty
+        assert len(self.read_log(state_path)) == 0
+
+        manager.save_trade({"symbol": "SOL", "status": "OPEN"})
+
+        reloaded = StateManager(state_file=state_path).load_trade_history()
+        assert [t["symbol"] for t in reloaded] == ["BTC", "ETH", "SOL"]
+        assert reloaded[0]["pnl"] == 4
+
+    def test_reset_clears_log(self, state_path):
+        """Test resetting state empties the trade log."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "pnl": 10})
+
+        manager.reset_state(confirm=True)
+
+        assert trades_file_for(state_path).read_bytes() == b""
+
+    def test_legacy_state_file_is_migrated(self, state_path):
+        """Test a state file with embedded trade history still loads and migrates."""
+        state_path.write_text(
+            json.dumps({"starting_balance": 500.0, "trade_history": [{"symbol": "BTC"}]})
+        )
+
+        manager = StateManager(state_file=state_path)
+        assert manager.load_trade_history() == [{"symbol": "BTC"}]
+
+        manager.force_save()
+        assert "trade_history" not in json.loads(state_path.read_text())
+        assert self.read_log(state_path) == [{"symbol": "BTC"}]
+
+    def test_torn_last_line_is_dropped(self, state_path):
+        """Test a partially written final trade does not break loading."""
+        manager = StateManager(state_file=state_path)
+        manager.save_trade({"symbol": "BTC", "pnl": 10})
+        with open(trades_file_for(state_path), "ab") as f:
+            f.write(b'{"symbol": "E')
+
+        manager2 = StateManager(state_file=state_path)
+        assert manager2.load_trade_history() == [{"symbol": "BTC", "pnl": 10}]
+
+        manager2.save_trade({"symbol": "SOL", "pnl": 1})
+        assert [t["symbol"] for t in self.read_log(state_path)] == ["BTC", "SOL"]
@@ -1454,6 +1454,23 @@ class TestLiquiditySweepStrategy:
         assert len(atr) == 3
         assert atr.isna().all()
 
+    def test_atr_matches_rolling_true_range_mean(self, sample_ohlcv):
+        """Test ATR equals the rolling mean of the true range."""
+        strategy = LiquiditySweepStrategy()
+        prev_close = sample_ohlcv["close"].shift(1)
+        true_range = pd.concat(
+            [
+                sample_ohlcv["high"] - sample_ohlcv["low"],
+                (sample_ohlcv["high"] - prev_close).abs(),
+                (sample_ohlcv["low"] - prev_close).abs(),
+            ],
+            axis=1,
+        ).max(axis=1)
+
+        atr = strategy._calculate_atr(sample_ohlcv, period=14)
+
+        pd.testing.assert_series_equal(atr, true_range.rolling(window=14).mean())
+
     def test_confidence_with_insufficient_data(self, sample_ohlcv):
         """Test confidence calculation with very early signal (< 10 bars)."""
         strategy = LiquiditySweepStrategy()